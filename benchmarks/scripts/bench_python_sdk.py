@@ -0,0 +1,250 @@
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "pyarrow>=10",
+# ]
+# ///
+"""Micro-benchmarks for the Python SDK's in-process conversion paths.
+
+Run from the repository root so the local `ingestr` package is imported:
+
+    python benchmarks/scripts/bench_python_sdk.py rows --rows 500000
+    python benchmarks/scripts/bench_python_sdk.py encode --workers 1 4 16
+    python benchmarks/scripts/bench_python_sdk.py compression --temp-dir /mnt/scratch
+    python benchmarks/scripts/bench_python_sdk.py normalize --values 1000000
+"""
+
+import argparse
+import dataclasses
+import os
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import pyarrow as pa
+
+from ingestr import _data
+
+
+@dataclasses.dataclass
+class DataclassRow:
+    id: int
+    name: str
+    score: float
+    active: bool
+    created_at: datetime
+
+
+TupleRow = namedtuple("TupleRow", ["id", "name", "score", "active", "created_at"])
+
+
+def make_rows(kind, count):
+    created_at = datetime(2026, 1, 1)
+    if kind == "dict":
+        return [
+            {"id": i, "name": "user-%d" % i, "score": i * 0.5, "active": bool(i & 1), "created_at": created_at}
+            for i in range(count)
+        ]
+    if kind == "dataclass":
+        return [DataclassRow(i, "user-%d" % i, i * 0.5, bool(i & 1), created_at) for i in range(count)]
+    if kind == "namedtuple":
+        return [TupleRow(i, "user-%d" % i, i * 0.5, bool(i & 1), created_at) for i in range(count)]
+    raise ValueError("unknown row kind: %s" % kind)
+
+
+def bench_rows(args):
+    print("%-12s %12s %14s" % ("row kind", "seconds", "rows/sec"))
+    for kind in args.kinds:
+        rows = make_rows(kind, args.rows)
+        best = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            converted = 0
+            for batch in _data._iterable_batches(rows, pa=pa, batch_size=args.batch_size):
+                converted += batch.num_rows
+            elapsed = time.perf_counter() - started
+            assert converted == args.rows
+            best = elapsed if best is None else min(best, elapsed)
+        print("%-12s %12.3f %14.0f" % (kind, best, args.rows / best))
+
+
+def bench_encode(args):
+    rows = make_rows(args.kind, args.rows)
+    # Workers only speed things up with spare cores; on one or two they are slower.
+    print("cores: %d" % os.cpu_count())
+    print("%-12s %12s %14s" % ("workers", "seconds", "rows/sec"))
+    for workers in [0] + args.workers:
+        best = None
+        for _ in range(args.repeat):
+            pool = _data._EncodePool(workers, ordered=not args.unordered, messages=True) if workers else None
+            try:
+                started = time.perf_counter()
+                batches, _ = _data._batches_from_input(
+                    iter(rows),
+                    pa=pa,
+                    batch_size=args.batch_size,
+                    encode_pool=pool,
+                )
+                converted = sum(batch.num_rows for batch in batches)
+                elapsed = time.perf_counter() - started
+            finally:
+                if pool is not None:
+                    pool.close()
+            assert converted == args.rows
+            best = elapsed if best is None else min(best, elapsed)
+        print("%-12s %12.3f %14.0f" % (workers or "in-process", best, args.rows / best))
+
+
+def make_table(rows):
+    return pa.Table.from_pylist(
+        [
+            {"id": i, "status": ("new", "paid", "shipped")[i % 3], "email": "user-%d@example.com" % i, "score": i * 0.5}
+            for i in range(rows)
+        ]
+    )
+
+
+def write_ipc(sink, table, *, file_format, codec, batch_size):
+    options = pa.ipc.IpcWriteOptions(compression=codec)
+    new_writer = pa.ipc.new_file if file_format else pa.ipc.new_stream
+    with new_writer(sink, table.schema, options=options) as writer:
+        for batch in table.to_batches(max_chunksize=batch_size):
+            writer.write_batch(batch)
+
+
+def best_time(repeat, func):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_codec(table, *, transport, codec, args):
+    """Returns (payload bytes, seconds to encode and decode in memory, seconds through temp_dir)."""
+
+    file_format = transport == "mmap"
+    payload = pa.BufferOutputStream()
+    write_ipc(payload, table, file_format=file_format, codec=codec, batch_size=args.batch_size)
+    size = payload.getvalue().size
+
+    def in_memory():
+        sink = pa.BufferOutputStream()
+        write_ipc(sink, table, file_format=file_format, codec=codec, batch_size=args.batch_size)
+        source = pa.BufferReader(sink.getvalue())
+        reader = pa.ipc.open_file(source) if file_format else pa.ipc.open_stream(source)
+        reader.read_all()
+
+    disk_seconds = None
+    if file_format:
+
+        def through_disk():
+            with tempfile.NamedTemporaryFile(suffix=".arrow", dir=args.temp_dir) as handle:
+                write_ipc(handle.name, table, file_format=True, codec=codec, batch_size=args.batch_size)
+                with pa.memory_map(handle.name) as source:
+                    pa.ipc.open_file(source).read_all()
+
+        disk_seconds = best_time(args.repeat, through_disk)
+
+    return size, best_time(args.repeat, in_memory), disk_seconds
+
+
+def bench_compression(args):
+    """Compares IPC codecs per transport.
+
+    Compression costs CPU and saves bytes, so it wins on links slower than
+    (bytes saved) / (extra seconds spent). That bandwidth is printed as the
+    crossover: below it, send the data compressed.
+    """
+
+    table = make_table(args.rows)
+    print(
+        "%-8s %-6s %12s %10s %12s %18s"
+        % ("transport", "codec", "bytes", "cpu sec", "temp_dir sec", "crossover MB/s")
+    )
+    for transport in ("stream", "mmap"):
+        baseline = None
+        for codec in (None,) + tuple(args.codecs):
+            size, cpu_seconds, disk_seconds = measure_codec(table, transport=transport, codec=codec, args=args)
+            if codec is None:
+                baseline = (size, cpu_seconds)
+                crossover = "-"
+            elif cpu_seconds <= baseline[1]:
+                crossover = "always"
+            else:
+                crossover = "%.0f" % ((baseline[0] - size) / (cpu_seconds - baseline[1]) / 1e6)
+            print(
+                "%-8s %-6s %12d %10.3f %12s %18s"
+                % (
+                    transport,
+                    codec or "none",
+                    size,
+                    cpu_seconds,
+                    "-" if disk_seconds is None else "%.3f" % disk_seconds,
+                    crossover,
+                )
+            )
+
+
+def bench_normalize(args):
+    # Plain values should cost about a bare function call each; reaching the
+    # pandas/`.item()` fallbacks costs well over 10x that.
+    plain = ["text", 1, True, b"bytes", datetime(2026, 1, 1), date(2026, 1, 1), 2.5]
+    values = (plain * (args.values // len(plain) + 1))[: args.values]
+
+    def identity(value):
+        return value
+
+    baseline = best_time(args.repeat, lambda: [identity(value) for value in values])
+    normalized = best_time(args.repeat, lambda: [_data._normalize_value(value) for value in values])
+    print("%-16s %12s %14s" % ("function", "seconds", "values/sec"))
+    print("%-16s %12.3f %14.0f" % ("identity", baseline, args.values / baseline))
+    print("%-16s %12.3f %14.0f" % ("_normalize_value", normalized, args.values / normalized))
+    print("ratio %.1fx" % (normalized / baseline))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rows = subparsers.add_parser("rows", help="Python row objects to Arrow record batches")
+    rows.add_argument("--rows", type=int, default=500_000)
+    rows.add_argument("--batch-size", type=int, default=10_000)
+    rows.add_argument("--repeat", type=int, default=3)
+    rows.add_argument("--kinds", nargs="+", default=["dict", "dataclass", "namedtuple"])
+    rows.set_defaults(func=bench_rows)
+
+    encode = subparsers.add_parser("encode", help="row conversion on the encode_workers process pool")
+    encode.add_argument("--rows", type=int, default=1_000_000)
+    encode.add_argument("--batch-size", type=int, default=10_000)
+    encode.add_argument("--repeat", type=int, default=3)
+    encode.add_argument("--kind", default="dict", choices=["dict", "dataclass", "namedtuple"])
+    encode.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8, 16])
+    encode.add_argument("--unordered", action="store_true")
+    encode.set_defaults(func=bench_encode)
+
+    compression = subparsers.add_parser("compression", help="IPC compression codecs per transport")
+    compression.add_argument("--rows", type=int, default=1_000_000)
+    compression.add_argument("--batch-size", type=int, default=10_000)
+    compression.add_argument("--repeat", type=int, default=3)
+    compression.add_argument("--codecs", nargs="+", default=["lz4", "zstd"], choices=["lz4", "zstd"])
+    compression.add_argument("--temp-dir", default=None, help="directory to time mmap files in, e.g. a network disk")
+    compression.set_defaults(func=bench_compression)
+
+    normalize = subparsers.add_parser("normalize", help="per-value normalization of plain Python values")
+    normalize.add_argument("--values", type=int, default=1_000_000)
+    normalize.add_argument("--repeat", type=int, default=5)
+    normalize.set_defaults(func=bench_normalize)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -374,6 +374,11 @@ func runIngest(ctx context.Context, c *cli.Command) (err error) {
 	}
 
 	p := pipeline.New(cfg)
+	if setup, ok := ctx.Value(pipelineSetupKey{}).(pipelineSetup); ok {
+		if err := setup(cfg, p); err != nil {
+			return err
+		}
+	}
 	if err := p.Run(ctx); err != nil {
 		return err
 	}
@@ -396,6 +401,18 @@ func runIngest(ctx context.Context, c *cli.Command) (err error) {
 	return nil
 }
 
+type pipelineSetupKey struct{}
+
+// pipelineSetup configures the pipeline built by runIngest before it runs.
+type pipelineSetup func(cfg *config.IngestConfig, p *pipeline.Pipeline) error
+
+// withPipelineSetup makes runIngest call setup on its pipeline. The worker
+// command uses it to supply the Arrow payload and reuse destination
+// connections.
+func withPipelineSetup(ctx context.Context, setup pipelineSetup) context.Context {
+	return context.WithValue(ctx, pipelineSetupKey{}, setup)
+}
+
 func ingestTelemetryProperties(cfg *config.IngestConfig) map[string]any {
 	properties := map[string]any{}
 	if cfg == nil {
@@ -21,6 +21,7 @@ func NewApp() *cli.Command {
 			IngestCommand(),
 			ServerCommand(),
 			DeleteCommand(),
+			WorkerCommand(),
 		},
 	}
 }
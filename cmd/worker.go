@@ -0,0 +1,266 @@
+package cmd
+
+import (
+	"bufio"
+	"context"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"net/url"
+	"os"
+	"strings"
+	"time"
+
+	"github.com/bruin-data/ingestr/internal/config"
+	"github.com/bruin-data/ingestr/internal/output"
+	"github.com/bruin-data/ingestr/internal/uri"
+	"github.com/bruin-data/ingestr/pkg/destination"
+	"github.com/bruin-data/ingestr/pkg/pipeline"
+	"github.com/bruin-data/ingestr/pkg/source/arrowstream"
+	"github.com/fatih/color"
+	"github.com/urfave/cli/v3"
+)
+
+// The worker command keeps one ingestr process alive across many ingest
+// requests so callers such as the Python SDK's WorkerPool skip process start-up
+// and destination connection setup on every call. Requests are read from stdin
+// as:
+//
+//	request  uint32 little-endian length, followed by that many bytes of JSON
+//	         {"args": ["ingest", "--source-uri", "arrow-stream://-", ...]}
+//	payload  frames of uint32 length plus bytes carrying the Arrow IPC stream
+//	         for the arrow-stream source; a zero-length frame ends the payload
+//
+// After each request the worker writes workerStderrEndMarker to stderr, then
+// workerResultMarker followed by a JSON workerResult and a newline to stdout.
+// Everything the ingest run prints comes before the markers on the same
+// streams as a regular ingest command, so callers that read the two streams
+// separately can tell which request each stderr line belongs to.
+const (
+	workerResultMarker    = "\x1eingestr-worker-result "
+	workerStderrEndMarker = "\x1eingestr-worker-end\n"
+)
+
+// maxWorkerRequestSize bounds the request allocation for corrupt input.
+const maxWorkerRequestSize = 16 << 20
+
+type workerRequest struct {
+	Args []string `json:"args"`
+}
+
+type workerResult struct {
+	OK         bool   `json:"ok"`
+	Error      string `json:"error,omitempty"`
+	DurationMS int64  `json:"duration_ms"`
+}
+
+func WorkerCommand() *cli.Command {
+	return &cli.Command{
+		Name:   "worker",
+		Usage:  "Serve ingest requests with Arrow payloads framed over stdin (used by the Python SDK)",
+		Hidden: true,
+		Action: runWorker,
+	}
+}
+
+func runWorker(ctx context.Context, c *cli.Command) error {
+	input := bufio.NewReaderSize(os.Stdin, 1<<20)
+	dests := newWorkerDestinations()
+	defer dests.closeAll(context.WithoutCancel(ctx))
+
+	for {
+		req, err := readWorkerRequest(input)
+		if errors.Is(err, io.EOF) {
+			return nil
+		}
+		if err != nil {
+			return err
+		}
+
+		payload := &framedPayload{input: input}
+		started := time.Now()
+		runErr := runWorkerRequest(ctx, req, payload, dests)
+
+		// Skip whatever the run did not read so the next request starts on a
+		// frame boundary.
+		if _, err := io.Copy(io.Discard, payload); err != nil {
+			return fmt.Errorf("failed to read worker payload: %w", err)
+		}
+
+		result := workerResult{OK: runErr == nil, DurationMS: time.Since(started).Milliseconds()}
+		if runErr != nil {
+			result.Error = runErr.Error()
+			if !output.IsJSON() {
+				color.Red("Error: %v", runErr)
+			}
+			config.PrintFailedQuery()
+		}
+		if _, err := io.WriteString(os.Stderr, workerStderrEndMarker); err != nil {
+			return fmt.Errorf("failed to write worker stderr marker: %w", err)
+		}
+		if err := writeWorkerResult(os.Stdout, result); err != nil {
+			return err
+		}
+		if ctx.Err() != nil {
+			return ctx.Err()
+		}
+	}
+}
+
+func runWorkerRequest(ctx context.Context, req workerRequest, payload io.Reader, dests *workerDestinations) error {
+	if len(req.Args) == 0 || req.Args[0] != "ingest" {
+		return fmt.Errorf("worker requests must run the ingest command")
+	}
+
+	destURI := ""
+	setup := func(cfg *config.IngestConfig, p *pipeline.Pipeline) error {
+		if !isArrowStreamStdin(cfg.SourceURI) {
+			return fmt.Errorf("worker requests must use an arrow-stream://- source, got %q", cfg.SourceURI)
+		}
+		if cfg.Stream {
+			return fmt.Errorf("--stream is not supported in worker requests")
+		}
+		p.SetSource(arrowstream.NewArrowStreamSourceWithReader(payload))
+
+		dest, err := dests.get(ctx, cfg.DestURI)
+		if err != nil {
+			return err
+		}
+		destURI = cfg.DestURI
+		p.SetDestination(dest)
+		return nil
+	}
+
+	err := IngestCommand().Run(withPipelineSetup(ctx, setup), req.Args)
+	if err != nil && destURI != "" {
+		// The connection may be what failed; reconnect on the next request.
+		dests.evict(context.WithoutCancel(ctx), destURI)
+	}
+	return err
+}
+
+func isArrowStreamStdin(sourceURI string) bool {
+	parsed, err := url.Parse(sourceURI)
+	if err != nil {
+		return false
+	}
+	switch strings.ToLower(parsed.Scheme) {
+	case "arrow-stream", "arrowstream":
+		return parsed.Host == "-" || parsed.Host == "stdin"
+	}
+	return false
+}
+
+func readWorkerRequest(input io.Reader) (workerRequest, error) {
+	var req workerRequest
+	var size uint32
+	if err := binary.Read(input, binary.LittleEndian, &size); err != nil {
+		if errors.Is(err, io.EOF) {
+			return req, io.EOF
+		}
+		return req, fmt.Errorf("failed to read worker request: %w", err)
+	}
+	if size == 0 || size > maxWorkerRequestSize {
+		return req, fmt.Errorf("invalid worker request size: %d bytes", size)
+	}
+
+	body := make([]byte, size)
+	if _, err := io.ReadFull(input, body); err != nil {
+		return req, fmt.Errorf("failed to read worker request: %w", err)
+	}
+	if err := json.Unmarshal(body, &req); err != nil {
+		return req, fmt.Errorf("invalid worker request: %w", err)
+	}
+	return req, nil
+}
+
+func writeWorkerResult(w io.Writer, result workerResult) error {
+	body, err := json.Marshal(result)
+	if err != nil {
+		return err
+	}
+	if _, err := fmt.Fprintf(w, "%s%s\n", workerResultMarker, body); err != nil {
+		return fmt.Errorf("failed to write worker result: %w", err)
+	}
+	return nil
+}
+
+// framedPayload reads one request's payload frames as a single stream and
+// returns io.EOF at its zero-length end frame.
+type framedPayload struct {
+	input     io.Reader
+	remaining uint32
+	done      bool
+}
+
+func (p *framedPayload) Read(buf []byte) (int, error) {
+	for p.remaining == 0 {
+		if p.done {
+			return 0, io.EOF
+		}
+		if err := binary.Read(p.input, binary.LittleEndian, &p.remaining); err != nil {
+			if errors.Is(err, io.EOF) {
+				err = io.ErrUnexpectedEOF
+			}
+			return 0, err
+		}
+		if p.remaining == 0 {
+			p.done = true
+		}
+	}
+
+	if uint32(len(buf)) > p.remaining {
+		buf = buf[:p.remaining]
+	}
+	n, err := p.input.Read(buf)
+	p.remaining -= uint32(n)
+	if errors.Is(err, io.EOF) {
+		err = io.ErrUnexpectedEOF
+	}
+	return n, err
+}
+
+// workerDestinations keeps one connected destination per URI across requests.
+type workerDestinations struct {
+	byURI map[string]destination.Destination
+}
+
+func newWorkerDestinations() *workerDestinations {
+	return &workerDestinations{byURI: make(map[string]destination.Destination)}
+}
+
+func (d *workerDestinations) get(ctx context.Context, destURI string) (destination.Destination, error) {
+	if dest, ok := d.byURI[destURI]; ok {
+		config.Debug("[WORKER] Reusing destination connection for %s", dest.GetScheme())
+		return dest, nil
+	}
+
+	dest, err := uri.DefaultRegistry.GetDestination(destURI)
+	if err != nil {
+		return nil, fmt.Errorf("failed to get destination: %w", err)
+	}
+	if err := dest.Connect(ctx, destURI); err != nil {
+		return nil, fmt.Errorf("failed to connect to destination: %w", err)
+	}
+	d.byURI[destURI] = dest
+	return dest, nil
+}
+
+func (d *workerDestinations) evict(ctx context.Context, destURI string) {
+	dest, ok := d.byURI[destURI]
+	if !ok {
+		return
+	}
+	delete(d.byURI, destURI)
+	if err := dest.Close(ctx); err != nil {
+		config.Debug("[WORKER] Failed to close destination: %v", err)
+	}
+}
+
+func (d *workerDestinations) closeAll(ctx context.Context) {
+	for destURI := range d.byURI {
+		d.evict(ctx, destURI)
+	}
+}
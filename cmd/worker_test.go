@@ -0,0 +1,97 @@
+package cmd
+
+import (
+	"bytes"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"io"
+	"strings"
+	"testing"
+)
+
+func appendWorkerFrame(buf *bytes.Buffer, payload []byte) {
+	var size [4]byte
+	binary.LittleEndian.PutUint32(size[:], uint32(len(payload)))
+	buf.Write(size[:])
+	buf.Write(payload)
+}
+
+func TestWorkerReadsRequestsAndPayloadFrames(t *testing.T) {
+	var input bytes.Buffer
+	for _, args := range [][]string{{"ingest", "--dest-table", "a"}, {"ingest", "--dest-table", "b"}} {
+		body, err := json.Marshal(workerRequest{Args: args})
+		if err != nil {
+			t.Fatal(err)
+		}
+		appendWorkerFrame(&input, body)
+		appendWorkerFrame(&input, []byte("hello "))
+		appendWorkerFrame(&input, []byte(args[2]))
+		appendWorkerFrame(&input, nil)
+	}
+
+	for _, want := range []string{"a", "b"} {
+		req, err := readWorkerRequest(&input)
+		if err != nil {
+			t.Fatalf("readWorkerRequest() error = %v", err)
+		}
+		if got := req.Args[2]; got != want {
+			t.Fatalf("dest table = %q, want %q", got, want)
+		}
+
+		payload, err := io.ReadAll(&framedPayload{input: &input})
+		if err != nil {
+			t.Fatalf("reading payload: %v", err)
+		}
+		if got := string(payload); got != "hello "+want {
+			t.Fatalf("payload = %q, want %q", got, "hello "+want)
+		}
+	}
+
+	if _, err := readWorkerRequest(&input); !errors.Is(err, io.EOF) {
+		t.Fatalf("readWorkerRequest() at end of input error = %v, want io.EOF", err)
+	}
+}
+
+func TestWorkerPayloadReportsTruncatedInput(t *testing.T) {
+	var input bytes.Buffer
+	appendWorkerFrame(&input, []byte("partial"))
+
+	_, err := io.ReadAll(&framedPayload{input: &input})
+	if !errors.Is(err, io.ErrUnexpectedEOF) {
+		t.Fatalf("error = %v, want io.ErrUnexpectedEOF", err)
+	}
+}
+
+func TestWorkerWritesMarkedResultLine(t *testing.T) {
+	var out bytes.Buffer
+	if err := writeWorkerResult(&out, workerResult{OK: false, Error: "boom", DurationMS: 12}); err != nil {
+		t.Fatal(err)
+	}
+
+	line := out.String()
+	if !strings.HasPrefix(line, workerResultMarker) || !strings.HasSuffix(line, "\n") {
+		t.Fatalf("result line = %q", line)
+	}
+	var result workerResult
+	if err := json.Unmarshal([]byte(strings.TrimPrefix(line, workerResultMarker)), &result); err != nil {
+		t.Fatal(err)
+	}
+	if result.OK || result.Error != "boom" || result.DurationMS != 12 {
+		t.Fatalf("result = %+v", result)
+	}
+}
+
+func TestWorkerAcceptsOnlyArrowStreamStdinSources(t *testing.T) {
+	for sourceURI, want := range map[string]bool{
+		"arrow-stream://-":                  true,
+		"arrowstream://stdin":               true,
+		"arrow-stream://-?multi_table=true": true,
+		"mmap:///tmp/data.arrow":            false,
+		"postgres://localhost/db":           false,
+	} {
+		if got := isArrowStreamStdin(sourceURI); got != want {
+			t.Errorf("isArrowStreamStdin(%q) = %v, want %v", sourceURI, got, want)
+		}
+	}
+}
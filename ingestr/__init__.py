@@ -1,27 +1,75 @@
-from ._data import IngestSession, ingest
+from typing import TYPE_CHECKING, Any
+
 from ._runner import IngestrNotFoundError, binary_path, build_ingest_args, ingest as run_cli, main, run
 
 cli = run_cli
 
-try:
-    from importlib.metadata import PackageNotFoundError, version
-except ModuleNotFoundError:
-    from importlib_metadata import PackageNotFoundError, version  # type: ignore
+# The data SDK pulls in asyncio, concurrent.futures and logging, which would
+# triple the cost of `import ingestr` for callers that only run the CLI, so
+# those names are imported on first access.
+_LAZY_ATTRIBUTES = {
+    "AsyncIngestSession": "._async",
+    "aingest": "._async",
+    "DataSourceError": "._data",
+    "IngestManyResult": "._data",
+    "IngestResult": "._data",
+    "IngestSession": "._data",
+    "ingest": "._data",
+    "ingest_many": "._data",
+    "JobResult": "._jobs",
+    "run_many": "._jobs",
+    "OutputCapture": "._output",
+    "WorkerPool": "._pool",
+}
+
+if TYPE_CHECKING:
+    from ._async import AsyncIngestSession, aingest
+    from ._data import DataSourceError, IngestManyResult, IngestResult, IngestSession, ingest, ingest_many
+    from ._jobs import JobResult, run_many
+    from ._output import OutputCapture
+    from ._pool import WorkerPool
+
+    __version__: str
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        from ._runner import _package_version
+
+        value = _package_version()
+    elif name in _LAZY_ATTRIBUTES:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
 
-try:
-    __version__ = version("ingestr")
-except PackageNotFoundError:
-    __version__ = "0+unknown"
 
 __all__ = [
+    "AsyncIngestSession",
+    "DataSourceError",
+    "IngestManyResult",
+    "IngestResult",
     "IngestrNotFoundError",
     "IngestSession",
+    "JobResult",
+    "OutputCapture",
+    "WorkerPool",
     "__version__",
+    "aingest",
     "binary_path",
     "build_ingest_args",
     "cli",
     "ingest",
+    "ingest_many",
     "main",
     "run",
     "run_cli",
+    "run_many",
 ]
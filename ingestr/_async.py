@@ -0,0 +1,447 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import io
+import subprocess
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Optional
+
+from ._data import (
+    _MISSING,
+    Transport,
+    _arrow_stream_command,
+    _batch_sizer,
+    _batches_from_input,
+    _BatchSizer,
+    _ColumnAccumulator,
+    _dictionary_encoder,
+    _extract_process_options,
+    _ingest_result,
+    _ipc_write_options,
+    _is_row_like,
+    _iterable_batches,
+    _output_capture,
+    _prepare_stream_process_options,
+    _progress_events,
+    _require_pyarrow,
+    _validate_chunk_rows,
+    _validate_compression,
+)
+from ._output import _OutputTail
+
+_PIPE_ERRORS = (BrokenPipeError, ConnectionResetError)
+
+
+def aingest(
+    data: Any = _MISSING,
+    *,
+    dest_uri: str,
+    dest_table: str,
+    source_table: str = "python_data",
+    transport: Transport = "stream",
+    batch_size: int = 10000,
+    schema: Any = None,
+    chunk_rows: Optional[int] = None,
+    batch_bytes: Optional[int] = None,
+    dictionary_encode: Optional[str] = None,
+    compression: Optional[str] = None,
+    **options: Any,
+) -> Any:
+    """Ingest Python data from asyncio code over an Arrow IPC stream.
+
+    Accepts everything `ingest` does plus async iterables, async generator
+    functions, and coroutine functions. Await the result to run the ingestion.
+    When data is omitted, returns an `AsyncIngestSession` to use with
+    `async with`.
+    """
+
+    session = AsyncIngestSession(
+        dest_uri=dest_uri,
+        dest_table=dest_table,
+        source_table=source_table,
+        transport=transport,
+        batch_size=batch_size,
+        schema=schema,
+        chunk_rows=chunk_rows,
+        batch_bytes=batch_bytes,
+        dictionary_encode=dictionary_encode,
+        compression=compression,
+        **options,
+    )
+    if data is _MISSING:
+        return session
+    return _ingest_with_session(session, data)
+
+
+async def _ingest_with_session(session: "AsyncIngestSession", data: Any) -> subprocess.CompletedProcess:
+    async with session:
+        await session.ingest(data)
+    return session.result
+
+
+class AsyncIngestSession:
+    """Async context manager for push-style Python data ingestion.
+
+    The ingestr process is started with `asyncio.create_subprocess_exec`. Arrow
+    IPC bytes are written to its stdin with `drain()` backpressure, and its
+    stdout/stderr are read by tasks, so no threads are involved.
+    """
+
+    def __init__(
+        self,
+        *,
+        dest_uri: str,
+        dest_table: str,
+        source_table: str = "python_data",
+        transport: Transport = "stream",
+        batch_size: int = 10000,
+        schema: Any = None,
+        chunk_rows: Optional[int] = None,
+        batch_bytes: Optional[int] = None,
+        dictionary_encode: Optional[str] = None,
+        compression: Optional[str] = None,
+        **options: Any,
+    ) -> None:
+        self.dest_uri = dest_uri
+        self.dest_table = dest_table
+        self.source_table = source_table
+        self.batch_size = batch_size
+        self.chunk_rows = chunk_rows
+        self.result: Optional[subprocess.CompletedProcess] = None
+
+        if transport.lower() != "stream":
+            raise ValueError("async ingestion only supports transport='stream'")
+        _validate_chunk_rows(chunk_rows)
+        _validate_compression(compression)
+
+        self._pa = None
+        self._schema = schema
+        self._closed = False
+        self._saw_rows = False
+        self._writer = None
+        self._sink: Optional[_IpcChunkSink] = None
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._command: Optional[list[str]] = None
+        self._stdout: Optional[_AsyncPipeCapture] = None
+        self._stderr: Optional[_AsyncPipeCapture] = None
+        self._writer_error: Optional[BaseException] = None
+        self._sizer = _batch_sizer(batch_bytes, batch_size, options)
+        self._dictionary_encoder = _dictionary_encoder(dictionary_encode, transport=transport)
+        self._compression = compression
+
+        self._cli_options = dict(options)
+        self._process_options = _extract_process_options(self._cli_options)
+        self._process_options.pop("temp_dir", None)
+        self._process_options.pop("keep_temp_file", None)
+        self._capture = _output_capture(self._process_options)
+        self._progress = _progress_events(self._cli_options, self._process_options)
+        self._check, self._executable = _prepare_stream_process_options(self._process_options)
+
+    async def __aenter__(self) -> "AsyncIngestSession":
+        self._ensure_pyarrow()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        if exc_type is not None:
+            await self._abort()
+            return False
+
+        await self.close()
+        return False
+
+    async def __call__(self, data: Any) -> "AsyncIngestSession":
+        return await self.ingest(data)
+
+    async def ingest(self, data: Any) -> "AsyncIngestSession":
+        if self._closed:
+            raise ValueError("ingestion session is already closed")
+
+        pa = self._ensure_pyarrow()
+        data = await _resolve_async_input(data)
+        try:
+            async for batch in self._batches(data, pa=pa):
+                if batch.num_rows == 0:
+                    continue
+                await self._write_batch(batch)
+        except _PIPE_ERRORS as exc:
+            self._writer_error = exc
+            await self.close()
+        except BaseException:
+            await self._abort()
+            raise
+        return self
+
+    async def close(self) -> subprocess.CompletedProcess:
+        if self._closed:
+            if self.result is None:
+                raise ValueError("ingestion session closed before producing a result")
+            return self.result
+
+        self._closed = True
+        if not self._saw_rows:
+            raise ValueError("input produced no rows")
+
+        assert self._proc is not None
+        assert self._command is not None
+
+        if self._writer is not None:
+            try:
+                self._writer.close()
+                await self._send_pending()
+            except _PIPE_ERRORS as exc:
+                self._writer_error = self._writer_error or exc
+            except BaseException:
+                await self._abort()
+                raise
+            self._writer = None
+
+        if self._proc.stdin is not None:
+            try:
+                self._proc.stdin.close()
+                await self._proc.stdin.wait_closed()
+            except _PIPE_ERRORS as exc:
+                self._writer_error = self._writer_error or exc
+
+        returncode = await self._proc.wait()
+        stdout, stderr = await self._collect_output()
+        completed = _ingest_result(self._command, returncode, stdout, stderr, self._progress)
+        self.result = completed
+
+        if self._check and completed.returncode:
+            raise subprocess.CalledProcessError(completed.returncode, self._command, output=stdout, stderr=stderr)
+        if self._writer_error is not None and completed.returncode == 0:
+            raise self._writer_error
+
+        return completed
+
+    def _ensure_pyarrow(self) -> Any:
+        if self._pa is None:
+            self._pa = _require_pyarrow()
+        return self._pa
+
+    async def _batches(self, data: Any, *, pa: Any) -> AsyncIterator[Any]:
+        if hasattr(data, "__aiter__"):
+            async for batch in _async_iterable_batches(
+                data,
+                pa=pa,
+                batch_size=self.batch_size,
+                schema=self._schema,
+                chunk_rows=self.chunk_rows,
+                sizer=self._sizer,
+            ):
+                if self._sizer is None:
+                    yield batch
+                    continue
+                for ready in self._sizer.push(batch, pa=pa):
+                    yield ready
+            if self._sizer is not None:
+                for ready in self._sizer.finish(pa=pa):
+                    yield ready
+            return
+
+        batches, arrow_schema = _batches_from_input(
+            data,
+            pa=pa,
+            batch_size=self.batch_size,
+            schema=self._schema,
+            chunk_rows=self.chunk_rows,
+            sizer=self._sizer,
+        )
+        if self._schema is None and arrow_schema is not None:
+            self._schema = arrow_schema
+        for batch in batches:
+            yield batch
+
+    async def _write_batch(self, batch: Any) -> None:
+        if self._schema is None:
+            self._schema = batch.schema
+        if self._writer is None:
+            await self._start(batch)
+
+        self._saw_rows = True
+        if self._dictionary_encoder is not None:
+            batch = self._dictionary_encoder.encode(batch)
+        self._writer.write_batch(batch)
+        await self._send_pending()
+
+    async def _start(self, first_batch: Any) -> None:
+        self._command = _arrow_stream_command(
+            self._executable,
+            source_table=self.source_table,
+            dest_uri=self.dest_uri,
+            dest_table=self.dest_table,
+            options=self._cli_options,
+        )
+        self._proc = await asyncio.create_subprocess_exec(
+            *self._command,
+            stdin=asyncio.subprocess.PIPE,
+            **self._process_options,
+        )
+        sink = self._capture.open() if self._capture is not None else None
+        self._stdout = _AsyncPipeCapture(
+            self._proc.stdout,
+            on_chunk=self._progress.feed if self._progress is not None else None,
+            keep=self._progress is None or self._progress.keep_stdout,
+            tail=sink.stream("stdout") if sink is not None else None,
+        )
+        self._stderr = _AsyncPipeCapture(
+            self._proc.stderr,
+            tail=sink.stream("stderr") if sink is not None else None,
+        )
+        schema = self._schema
+        if self._dictionary_encoder is not None:
+            schema = self._dictionary_encoder.plan(self._schema, first_batch, pa=self._pa)
+        ipc_options = _ipc_write_options(
+            self._pa,
+            compression=self._compression,
+            dictionary_encoder=self._dictionary_encoder,
+        )
+        self._sink = _IpcChunkSink()
+        self._writer = self._pa.ipc.new_stream(self._sink, schema, options=ipc_options)
+
+    async def _send_pending(self) -> None:
+        assert self._proc is not None and self._proc.stdin is not None
+        assert self._sink is not None
+        data = self._sink.take()
+        if data:
+            self._proc.stdin.write(data)
+            await self._proc.stdin.drain()
+
+    async def _collect_output(self) -> tuple[Any, Any]:
+        stdout = await self._stdout.collect() if self._stdout is not None else None
+        stderr = await self._stderr.collect() if self._stderr is not None else None
+        if self._progress is not None:
+            self._progress.finish()
+        return stdout, stderr
+
+    async def _abort(self) -> None:
+        self._writer = None
+        if self._proc is not None:
+            if self._proc.returncode is None:
+                try:
+                    self._proc.kill()
+                except ProcessLookupError:
+                    pass
+            await self._proc.wait()
+            await self._collect_output()
+        self._closed = True
+
+
+async def _resolve_async_input(data: Any) -> Any:
+    if callable(data) and not hasattr(data, "__aiter__"):
+        data = data()
+    if inspect.isawaitable(data):
+        data = await data
+    return data
+
+
+async def _async_iterable_batches(
+    data: Any,
+    *,
+    pa: Any,
+    batch_size: int,
+    schema: Any = None,
+    chunk_rows: Optional[int] = None,
+    sizer: Optional[_BatchSizer] = None,
+) -> AsyncIterator[Any]:
+    columns = _ColumnAccumulator(pa=pa, schema=schema)
+
+    def row_limit() -> int:
+        return sizer.rows if sizer is not None else batch_size
+
+    async for item in data:
+        if item is None:
+            continue
+
+        if _is_row_like(item):
+            columns.append(item)
+            if columns.num_rows >= row_limit():
+                yield columns.flush()
+            continue
+
+        if isinstance(item, (list, tuple)):
+            # Pages of rows, as paginated APIs return them, fill the same
+            # batches as single rows instead of becoming a batch each.
+            for row in item:
+                columns.append(row)
+                if columns.num_rows >= row_limit():
+                    yield columns.flush()
+            continue
+
+        batch = columns.flush()
+        if batch is not None:
+            yield batch
+
+        page_batches = _iterable_batches(
+            [item],
+            pa=pa,
+            batch_size=batch_size,
+            schema=columns.schema,
+            chunk_rows=chunk_rows,
+        )
+        for batch in page_batches:
+            if columns.schema is None:
+                columns.use_schema(batch.schema)
+            yield batch
+
+    batch = columns.flush()
+    if batch is not None:
+        yield batch
+
+
+class _IpcChunkSink(io.BytesIO):
+    """In-memory IPC sink whose pending bytes are taken after each write."""
+
+    def take(self) -> bytes:
+        data = self.getvalue()
+        if data:
+            self.seek(0)
+            self.truncate()
+        return data
+
+
+class _AsyncPipeCapture:
+    def __init__(
+        self,
+        stream: Optional[asyncio.StreamReader],
+        *,
+        on_chunk: Optional[Callable[[bytes], None]] = None,
+        keep: bool = True,
+        tail: Optional[_OutputTail] = None,
+    ) -> None:
+        self._stream = stream
+        self._chunks: list[bytes] = []
+        self._task: Optional[asyncio.Future] = None
+        self._on_chunk = on_chunk
+        self._keep = keep
+        self._tail = tail
+
+        if stream is not None:
+            self._task = asyncio.ensure_future(self._read())
+
+    async def collect(self) -> Optional[bytes]:
+        if self._task is None:
+            return None
+        await self._task
+        if not self._keep:
+            return None
+        if self._tail is not None:
+            return self._tail.value()
+        return b"".join(self._chunks)
+
+    async def _read(self) -> None:
+        try:
+            while True:
+                chunk = await self._stream.read(8192)
+                if not chunk:
+                    break
+                if self._on_chunk is not None:
+                    self._on_chunk(chunk)
+                if self._tail is not None:
+                    self._tail.write(chunk)
+                elif self._keep:
+                    self._chunks.append(chunk)
+        finally:
+            if self._tail is not None:
+                self._tail.close()
@@ -1,21 +1,57 @@
 from __future__ import annotations
 
+import base64
+import codecs
+import collections
+import concurrent.futures
 import dataclasses
+import functools
 import inspect
+import io
+import json
 import math
+import multiprocessing
 import os
+import queue
+import shutil
+import struct
 import subprocess
+import sys
 import tempfile
 import threading
-from collections.abc import Iterable, Iterator, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
 from pathlib import Path
 from typing import Any, Optional
 
+from ._output import OutputCapture, _OutputTail
 from ._runner import PathLike, binary_path, build_ingest_args, ingest as _cli_ingest
 
 Transport = str
 _MISSING = object()
+_ROW_PLAN_CACHE_SIZE = 256
+_PLAIN_VALUE_TYPES = frozenset({type(None), str, int, bool, bytes, date, datetime})
+_PANDAS_NULL_TYPES: Optional[frozenset] = None
+_MANIFEST_SUFFIX = ".manifest"
+_MANIFEST_END = "#end"
+_MANIFEST_ABORT = "#abort"
+# How often a segment writer touches its manifest, so the mmap source can tell
+# a slow producer from one that exited without marking the manifest.
+_MANIFEST_HEARTBEAT_SECONDS = 5.0
+_MULTI_TABLE_MAGIC = b"ARROWMT1"
+_MULTI_TABLE_SOURCE_URI = "arrow-stream://-?multi_table=true"
+_FRAME_HEADER = struct.Struct("<II")
+# Rows in the first batch of row input when batch_bytes is set, before a row
+# width has been measured.
+_BATCH_BYTES_PROBE_ROWS = 1024
+# dictionary_encode="auto" encodes string columns whose first batch has at most
+# this many distinct values per row, and replaces a stream dictionary that grows
+# past _DICTIONARY_MAX_VALUES.
+_DICTIONARY_MAX_DISTINCT_RATIO = 0.5
+_DICTIONARY_MAX_VALUES = 1 << 20
+_IPC_COMPRESSION_CODECS = ("lz4", "zstd")
 
 
 def ingest(
@@ -27,38 +63,275 @@ def ingest(
     transport: Transport = "stream",
     batch_size: int = 10000,
     schema: Any = None,
+    chunk_rows: Optional[int] = None,
+    fetch_concurrency: Optional[int] = None,
+    write_queue_size: int = 0,
+    write_queue_bytes: Optional[int] = None,
+    encode_workers: Optional[int] = None,
+    encode_ordered: bool = True,
+    segment_bytes: Optional[int] = None,
+    batch_bytes: Optional[int] = None,
+    dictionary_encode: Optional[str] = None,
+    compression: Optional[str] = None,
     **options: Any,
 ) -> Any:
     """Ingest Python data using Arrow IPC stream by default.
 
     When data is omitted, returns a context manager that accepts rows, pages,
     generators, DataFrames, PyArrow tables, and record batches inside the block.
+
+    `chunk_rows` converts pandas and Polars DataFrames that many rows at a time,
+    sending each chunk before converting the next instead of converting the
+    whole frame up front.
+
+    A list of generator factories (zero-argument callables) is fetched
+    concurrently on up to `fetch_concurrency` threads and merged into one stream.
+    Passing `fetch_concurrency` with any other data raises ValueError; on a
+    session it only applies to factory lists given to `ingest()`.
+
+    `write_queue_size` enables a background writer thread with a queue of up to
+    that many record batches (optionally also capped at `write_queue_bytes`), so
+    converting data overlaps with writing it to the ingestr process.
+
+    `encode_workers` converts Python rows to Arrow on a pool of that many
+    processes. Batches keep their input order unless `encode_ordered` is False.
+    It only helps with spare cores; on one or two cores it is slower.
+
+    With `transport="mmap"`, `segment_bytes` writes the data as a series of
+    Arrow files of about that size and starts ingestr right away, so segments
+    are loaded while later ones are still being written.
+
+    `batch_bytes` sizes record batches by bytes instead of rows: the row width
+    is measured from the data as it is converted, and batches are split or
+    combined to about that many bytes, in multiples of `page_size` when set.
+
+    `dictionary_encode="auto"` sends string columns with few distinct values
+    as Arrow dictionaries, adding new values to later batches as dictionary
+    deltas instead of repeating every string.
+
+    `compression="lz4"` or `"zstd"` compresses the Arrow buffers sent to
+    ingestr, which decompresses record batches in parallel. It pays off when
+    the pipe or the mmap temp directory is slower than compressing the data.
     """
 
-    if data is _MISSING:
-        return IngestSession(
+    if fetch_concurrency is not None and data is not _MISSING and not _is_source_factory_list(data):
+        raise ValueError("fetch_concurrency requires a list of generator factories")
+
+    if data is _MISSING or write_queue_size:
+        session = IngestSession(
             dest_uri=dest_uri,
             dest_table=dest_table,
             source_table=source_table,
             transport=transport,
             batch_size=batch_size,
             schema=schema,
+            chunk_rows=chunk_rows,
+            fetch_concurrency=fetch_concurrency,
+            write_queue_size=write_queue_size,
+            write_queue_bytes=write_queue_bytes,
+            encode_workers=encode_workers,
+            encode_ordered=encode_ordered,
+            segment_bytes=segment_bytes,
+            batch_bytes=batch_bytes,
+            dictionary_encode=dictionary_encode,
+            compression=compression,
             **options,
         )
+        if data is _MISSING:
+            return session
+        with session:
+            session.ingest(data)
+        return session.result
 
     pa = _require_pyarrow()
-    batches, arrow_schema = _batches_from_input(data, pa=pa, batch_size=batch_size, schema=schema)
-    return _ingest_batches(
-        batches,
-        pa=pa,
-        schema=arrow_schema,
-        dest_uri=dest_uri,
-        dest_table=dest_table,
-        source_table=source_table,
+    _validate_encode_workers(encode_workers)
+    _validate_segment_bytes(segment_bytes, transport)
+    sizer = _batch_sizer(batch_bytes, batch_size, options)
+    dictionary_encoder = _dictionary_encoder(dictionary_encode, transport=transport)
+    _validate_compression(compression)
+    encode_pool = _encode_pool(
+        encode_workers,
+        ordered=encode_ordered,
         transport=transport,
-        **options,
+        compression=compression,
+        dictionary_encoder=dictionary_encoder,
+        sizer=sizer,
+    )
+    try:
+        batches, arrow_schema = _batches_from_input(
+            data,
+            pa=pa,
+            batch_size=batch_size,
+            schema=schema,
+            chunk_rows=chunk_rows,
+            fetch_concurrency=fetch_concurrency,
+            encode_pool=encode_pool,
+            sizer=sizer,
+        )
+        return _ingest_batches(
+            batches,
+            pa=pa,
+            schema=arrow_schema,
+            dest_uri=dest_uri,
+            dest_table=dest_table,
+            source_table=source_table,
+            transport=transport,
+            segment_bytes=segment_bytes,
+            dictionary_encoder=dictionary_encoder,
+            compression=compression,
+            encode_pool=encode_pool,
+            **options,
+        )
+    finally:
+        if encode_pool is not None:
+            encode_pool.close()
+
+
+@dataclasses.dataclass
+class IngestManyResult:
+    """Result of `ingest_many`: the ingestr process and rows sent per table."""
+
+    process: "IngestResult"
+    rows: dict[str, int]
+
+
+def ingest_many(
+    tables: Mapping[str, Any],
+    *,
+    dest_uri: str,
+    batch_size: int = 10000,
+    batch_bytes: Optional[int] = None,
+    primary_keys: Optional[Mapping[str, Sequence[str]]] = None,
+    **options: Any,
+) -> IngestManyResult:
+    """Ingest several tables through one ingestr process and destination connection.
+
+    `tables` maps destination table names to anything `ingest` accepts. Every
+    input is converted up to its first batch before ingestr starts, because
+    all tables and their schemas are declared to the destination up front.
+    The tables are then streamed one after another over a single framed
+    Arrow IPC stream.
+    """
+
+    for key in ("source_table", "dest_table", "primary_key", "transport"):
+        if key in options:
+            raise ValueError(f"ingest_many does not accept {key}; tables are named by the keys of the tables mapping")
+    if not tables:
+        raise ValueError("ingest_many requires at least one table")
+    primary_keys = dict(primary_keys or {})
+    unknown = set(primary_keys) - set(tables)
+    if unknown:
+        raise ValueError(f"primary_keys names tables that are not being ingested: {', '.join(sorted(unknown))}")
+
+    pa = _require_pyarrow()
+    prepared = []
+    for dest_table, data in tables.items():
+        sizer = _batch_sizer(batch_bytes, batch_size, options)
+        batches, arrow_schema = _batches_from_input(data, pa=pa, batch_size=batch_size, sizer=sizer)
+        first_batch, remaining = _peek_first_batch(batches)
+        if first_batch is None:
+            raise ValueError(f"input for table {dest_table!r} produced no rows")
+        prepared.append((dest_table, arrow_schema or first_batch.schema, _prepend(first_batch, remaining)))
+
+    process_options = _extract_process_options(options)
+    process_options.pop("temp_dir", None)
+    process_options.pop("keep_temp_file", None)
+    capture = _output_capture(process_options)
+    progress = _progress_events(options, process_options)
+    check, executable = _prepare_stream_process_options(process_options)
+    command = _arrow_stream_command(
+        executable,
+        source_uri=_MULTI_TABLE_SOURCE_URI,
+        source_table=None,
+        dest_uri=dest_uri,
+        dest_table=None,
+        options=options,
     )
 
+    proc = subprocess.Popen(command, stdin=subprocess.PIPE, **process_options)
+    drainer = _ProcessOutputDrainer(proc, progress=progress, capture=capture)
+    assert proc.stdin is not None
+
+    rows = {dest_table: 0 for dest_table, _, _ in prepared}
+    writer_error: Optional[BaseException] = None
+    try:
+        _write_multi_table_header(proc.stdin, prepared, primary_keys)
+        for index, (dest_table, arrow_schema, batches) in enumerate(prepared):
+            sink = _FramedTableSink(proc.stdin, index)
+            with pa.ipc.new_stream(sink, arrow_schema) as writer:
+                for batch in batches:
+                    if batch.num_rows == 0:
+                        continue
+                    writer.write_batch(batch)
+                    sink.send()
+                    rows[dest_table] += batch.num_rows
+            sink.end()
+    except BrokenPipeError as exc:
+        writer_error = exc
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        drainer.collect()
+        raise
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError as exc:
+            writer_error = writer_error or exc
+        proc.stdin = None
+
+    returncode = proc.wait()
+    stdout, stderr = drainer.collect()
+    completed = _ingest_result(command, returncode, stdout, stderr, progress)
+
+    if check and completed.returncode:
+        raise subprocess.CalledProcessError(completed.returncode, command, output=stdout, stderr=stderr)
+    if writer_error is not None and completed.returncode == 0:
+        raise writer_error
+
+    return IngestManyResult(process=completed, rows=rows)
+
+
+def _write_multi_table_header(out: Any, prepared: Sequence[tuple], primary_keys: Mapping[str, Sequence[str]]) -> None:
+    tables = []
+    for dest_table, arrow_schema, _ in prepared:
+        table = {
+            "name": dest_table,
+            "schema": base64.b64encode(arrow_schema.serialize().to_pybytes()).decode("ascii"),
+        }
+        keys = primary_keys.get(dest_table)
+        if keys:
+            table["primary_keys"] = [keys] if isinstance(keys, str) else list(keys)
+        tables.append(table)
+
+    header = json.dumps({"tables": tables}).encode("utf-8")
+    out.write(_MULTI_TABLE_MAGIC)
+    out.write(struct.pack("<I", len(header)))
+    out.write(header)
+
+
+class _FramedTableSink(io.BytesIO):
+    """Buffers one table's Arrow IPC stream and writes it to a multi-table
+    stream as frames tagged with the table's index."""
+
+    def __init__(self, out: Any, index: int) -> None:
+        super().__init__()
+        self._out = out
+        self._index = index
+
+    def send(self) -> None:
+        data = self.getvalue()
+        if not data:
+            return
+        self._out.write(_FRAME_HEADER.pack(self._index, len(data)))
+        self._out.write(data)
+        self.seek(0)
+        self.truncate()
+
+    def end(self) -> None:
+        self.send()
+        self._out.write(_FRAME_HEADER.pack(self._index, 0))
+
 
 class IngestSession:
     """Context manager for push-style Python data ingestion."""
@@ -72,6 +345,16 @@ class IngestSession:
         transport: Transport = "stream",
         batch_size: int = 10000,
         schema: Any = None,
+        chunk_rows: Optional[int] = None,
+        fetch_concurrency: Optional[int] = None,
+        write_queue_size: int = 0,
+        write_queue_bytes: Optional[int] = None,
+        encode_workers: Optional[int] = None,
+        encode_ordered: bool = True,
+        segment_bytes: Optional[int] = None,
+        batch_bytes: Optional[int] = None,
+        dictionary_encode: Optional[str] = None,
+        compression: Optional[str] = None,
         **options: Any,
     ) -> None:
         self.dest_uri = dest_uri
@@ -79,16 +362,44 @@ class IngestSession:
         self.source_table = source_table
         self.transport = transport.lower()
         self.batch_size = batch_size
+        self.chunk_rows = chunk_rows
+        self.fetch_concurrency = fetch_concurrency
         self.result: Optional[subprocess.CompletedProcess] = None
 
         if self.transport not in {"stream", "mmap"}:
             raise ValueError("transport must be 'stream' or 'mmap'")
+        _validate_chunk_rows(chunk_rows)
+        _validate_fetch_concurrency(fetch_concurrency)
+        if write_queue_size < 0:
+            raise ValueError("write_queue_size must not be negative")
+        if write_queue_bytes is not None and write_queue_bytes <= 0:
+            raise ValueError("write_queue_bytes must be a positive integer")
+        _validate_encode_workers(encode_workers)
+        _validate_segment_bytes(segment_bytes, self.transport)
+        _validate_compression(compression)
 
         self._pa = None
         self._schema = schema
         self._closed = False
         self._saw_rows = False
         self._writer = None
+        self._write_queue_size = write_queue_size
+        self._write_queue_bytes = write_queue_bytes
+        self._segment_bytes = segment_bytes
+        # One sizer for the whole session, so the measured row width carries
+        # over from one ingest() call to the next.
+        self._sizer = _batch_sizer(batch_bytes, batch_size, options)
+        self._dictionary_encoder = _dictionary_encoder(dictionary_encode, transport=self.transport)
+        self._compression = compression
+        self._background_writer: Optional[_BackgroundBatchWriter] = None
+        self._encode_pool = _encode_pool(
+            encode_workers,
+            ordered=encode_ordered,
+            transport=self.transport,
+            compression=compression,
+            dictionary_encoder=self._dictionary_encoder,
+            sizer=self._sizer,
+        )
         self._proc = None
         self._command = None
         self._drainer = None
@@ -99,11 +410,15 @@ class IngestSession:
         self._process_options = _extract_process_options(self._cli_options)
         self._temp_dir = self._process_options.pop("temp_dir", None)
         self._keep_temp_file = bool(self._process_options.pop("keep_temp_file", False))
+        self._capture = _output_capture(self._process_options)
+        self._progress = _progress_events(self._cli_options, self._process_options)
 
-        self._stream_check = True
-        self._stream_executable = None
+        self._check = True
+        self._executable = None
         if self.transport == "stream":
-            self._prepare_stream_process_options()
+            self._check, self._executable = _prepare_stream_process_options(self._process_options)
+        elif segment_bytes:
+            self._check, self._executable = _prepare_stream_process_options(self._process_options, uses_stdin=False)
         else:
             _reject_managed_process_input(self._process_options)
 
@@ -125,15 +440,33 @@ class IngestSession:
     def ingest(self, data: Any) -> "IngestSession":
         if self._closed:
             raise ValueError("ingestion session is already closed")
+        if self._background_writer is not None:
+            # Surfaces an error from the background writer before more data is converted.
+            self._write_batches(())
+            if self._closed:
+                # The child exited early and close() recorded its result, which
+                # only happens with check=False. Do not start another child.
+                return self
 
         pa = self._ensure_pyarrow()
-        batches, arrow_schema = _batches_from_input(data, pa=pa, batch_size=self.batch_size, schema=self._schema)
+        batches, arrow_schema = _batches_from_input(
+            data,
+            pa=pa,
+            batch_size=self.batch_size,
+            schema=self._schema,
+            chunk_rows=self.chunk_rows,
+            fetch_concurrency=self.fetch_concurrency,
+            encode_pool=self._encode_pool,
+            sizer=self._sizer,
+        )
         first_batch, remaining = _peek_first_batch(batches)
         if first_batch is None:
             return self
 
         if self._schema is None:
             self._schema = arrow_schema or first_batch.schema
+        if self._dictionary_encoder is not None and self._dictionary_encoder.schema is None:
+            self._dictionary_encoder.plan(self._schema, first_batch, pa=pa)
 
         self._saw_rows = True
         self._write_batches(_prepend(first_batch, remaining))
@@ -146,12 +479,15 @@ class IngestSession:
             return self.result
 
         self._closed = True
+        self._close_encode_pool()
         if not self._saw_rows:
             self._cleanup_temp_file()
             raise ValueError("input produced no rows")
 
         if self.transport == "stream":
             self.result = self._close_stream()
+        elif self._segment_bytes:
+            self.result = self._close_segments()
         else:
             self.result = self._close_mmap()
         return self.result
@@ -161,22 +497,6 @@ class IngestSession:
             self._pa = _require_pyarrow()
         return self._pa
 
-    def _prepare_stream_process_options(self) -> None:
-        self._stream_check = self._process_options.pop("check", True)
-        self._stream_executable = self._process_options.pop("executable", None)
-        capture_output = self._process_options.pop("capture_output", False)
-
-        if capture_output:
-            if "stdout" in self._process_options or "stderr" in self._process_options:
-                raise ValueError("stdout and stderr may not be used with capture_output")
-            self._process_options["stdout"] = subprocess.PIPE
-            self._process_options["stderr"] = subprocess.PIPE
-
-        if self._process_options.get("text") or self._process_options.get("universal_newlines"):
-            raise ValueError("Arrow stream ingestion requires binary stdin; text mode is not supported")
-        if "stdin" in self._process_options or "input" in self._process_options:
-            raise ValueError("stdin/input are managed by ingestr's Arrow stream transport")
-
     def _write_batches(self, batches: Iterable[Any]) -> None:
         if self.transport == "stream":
             self._start_stream()
@@ -184,8 +504,20 @@ class IngestSession:
             self._start_mmap()
 
         assert self._writer is not None
+        if self._dictionary_encoder is not None:
+            batches = map(self._dictionary_encoder.encode, batches)
+        if self._write_queue_size and self._background_writer is None:
+            self._background_writer = _BackgroundBatchWriter(
+                self._writer,
+                max_batches=self._write_queue_size,
+                max_bytes=self._write_queue_bytes,
+            )
+
         try:
-            _write_non_empty_batches(self._writer, batches)
+            if self._background_writer is not None:
+                self._background_writer.write(batches)
+            else:
+                _write_non_empty_batches(self._writer, batches)
         except BrokenPipeError as exc:
             self._writer_error = exc
             self.close()
@@ -198,27 +530,35 @@ class IngestSession:
             return
 
         assert self._schema is not None
-        command = [
-            os.fspath(self._stream_executable) if self._stream_executable is not None else binary_path(),
-            *build_ingest_args(
-                source_uri="arrow-stream://-",
-                source_table=self.source_table,
-                dest_uri=self.dest_uri,
-                dest_table=self.dest_table,
-                **self._cli_options,
-            ),
-        ]
+        command = _arrow_stream_command(
+            self._executable,
+            source_table=self.source_table,
+            dest_uri=self.dest_uri,
+            dest_table=self.dest_table,
+            options=self._cli_options,
+        )
         self._command = command
         self._proc = subprocess.Popen(command, stdin=subprocess.PIPE, **self._process_options)
-        self._drainer = _ProcessOutputDrainer(self._proc)
+        self._drainer = _ProcessOutputDrainer(self._proc, progress=self._progress, capture=self._capture)
         assert self._proc.stdin is not None
-        self._writer = self._pa.ipc.new_stream(self._proc.stdin, self._schema)
+        schema, ipc_options = self._ipc_schema()
+        self._writer = _new_stream_writer(
+            self._pa,
+            self._proc.stdin,
+            schema,
+            ipc_options=ipc_options,
+            encode_pool=self._encode_pool,
+        )
 
     def _start_mmap(self) -> None:
         if self._writer is not None:
             return
 
         assert self._schema is not None
+        if self._segment_bytes:
+            self._start_segments()
+            return
+
         fd, path = tempfile.mkstemp(
             prefix="ingestr-python-",
             suffix=".arrow",
@@ -226,12 +566,64 @@ class IngestSession:
         )
         os.close(fd)
         self._temp_path = path
-        self._writer = self._pa.ipc.new_file(path, self._schema)
+        schema, ipc_options = self._ipc_schema()
+        self._writer = self._pa.ipc.new_file(path, schema, options=ipc_options)
+
+    def _ipc_schema(self) -> tuple[Any, Any]:
+        """The schema and IPC write options of the Arrow data sent to ingestr."""
+
+        options = _ipc_write_options(
+            self._pa,
+            compression=self._compression,
+            dictionary_encoder=self._dictionary_encoder,
+        )
+        if self._dictionary_encoder is None:
+            return self._schema, options
+        return self._dictionary_encoder.schema, options
+
+    def _start_segments(self) -> None:
+        directory = tempfile.mkdtemp(prefix="ingestr-python-", dir=_optional_fspath(self._temp_dir))
+        self._temp_path = directory
+        schema, ipc_options = self._ipc_schema()
+        self._writer = _SegmentedArrowWriter(
+            directory,
+            schema,
+            pa=self._pa,
+            segment_bytes=self._segment_bytes,
+            ipc_options=ipc_options,
+        )
+        command = _arrow_stream_command(
+            self._executable,
+            source_uri=f"mmap://{self._writer.manifest_path}",
+            source_table=self.source_table,
+            dest_uri=self.dest_uri,
+            dest_table=self.dest_table,
+            options=self._cli_options,
+        )
+        self._command = command
+        self._proc = subprocess.Popen(command, **self._process_options)
+        self._drainer = _ProcessOutputDrainer(self._proc, progress=self._progress, capture=self._capture)
+        self._writer.process = self._proc
+
+    def _finish_background_writer(self) -> None:
+        if self._background_writer is None:
+            return
+
+        background_writer = self._background_writer
+        try:
+            background_writer.close()
+        except BrokenPipeError as exc:
+            self._writer_error = self._writer_error or exc
+        except BaseException:
+            self._abort()
+            raise
+        self._background_writer = None
 
     def _close_stream(self) -> subprocess.CompletedProcess:
         assert self._proc is not None
         assert self._command is not None
 
+        self._finish_background_writer()
         if self._writer is not None:
             try:
                 self._writer.close()
@@ -249,12 +641,32 @@ class IngestSession:
                 self._writer_error = self._writer_error or exc
             self._proc.stdin = None
 
+        return self._completed_process()
+
+    def _close_segments(self) -> subprocess.CompletedProcess:
+        assert self._proc is not None
+        assert self._writer is not None
+
+        self._finish_background_writer()
+        try:
+            self._writer.close()
+        except BaseException:
+            self._abort()
+            raise
+        self._writer = None
+
+        try:
+            return self._completed_process()
+        finally:
+            self._cleanup_temp_file()
+
+    def _completed_process(self) -> subprocess.CompletedProcess:
         returncode = self._proc.wait()
         stdout, stderr = self._drainer.collect() if self._drainer is not None else (None, None)
-        completed = subprocess.CompletedProcess(self._command, returncode, stdout, stderr)
+        completed = _ingest_result(self._command, returncode, stdout, stderr, self._progress)
         self.result = completed
 
-        if self._stream_check and completed.returncode:
+        if self._check and completed.returncode:
             raise subprocess.CalledProcessError(completed.returncode, self._command, output=stdout, stderr=stderr)
         if self._writer_error is not None and completed.returncode == 0:
             raise self._writer_error
@@ -265,23 +677,38 @@ class IngestSession:
         assert self._temp_path is not None
         assert self._writer is not None
 
+        self._finish_background_writer()
         try:
             self._writer.close()
             self._writer = None
-            return _cli_ingest(
-                source_uri=f"mmap://{self._temp_path}",
+            return _run_mmap_file(
+                self._temp_path,
                 source_table=self.source_table,
                 dest_uri=self.dest_uri,
                 dest_table=self.dest_table,
-                **self._cli_options,
-                **self._process_options,
+                options=self._cli_options,
+                process_options=self._process_options,
+                progress=self._progress,
+                capture=self._capture,
             )
         finally:
             self._cleanup_temp_file()
 
     def _abort(self) -> None:
+        if self._background_writer is not None:
+            # The writer thread may be blocked on a full pipe; killing the child
+            # unblocks it before the thread is joined and the IPC writer closed.
+            self._background_writer.cancel()
+            poll = getattr(self._proc, "poll", None)
+            if self._proc is not None and (poll is None or poll() is None):
+                self._proc.kill()
+            self._background_writer.join()
+            self._background_writer = None
+
         try:
-            if self._writer is not None:
+            if isinstance(self._writer, _SegmentedArrowWriter):
+                self._writer.abort()
+            elif self._writer is not None:
                 self._writer.close()
         except Exception:
             pass
@@ -296,20 +723,118 @@ class IngestSession:
             if self._drainer is not None:
                 self._drainer.collect()
 
+        self._close_encode_pool()
         self._cleanup_temp_file()
         self._closed = True
 
+    def _close_encode_pool(self) -> None:
+        if self._encode_pool is not None:
+            self._encode_pool.close()
+            self._encode_pool = None
+
     def _cleanup_temp_file(self) -> None:
         if self._temp_path is None or self._keep_temp_file:
             return
         try:
-            os.remove(self._temp_path)
+            if os.path.isdir(self._temp_path):
+                shutil.rmtree(self._temp_path, ignore_errors=True)
+            else:
+                os.remove(self._temp_path)
         except FileNotFoundError:
             pass
         finally:
             self._temp_path = None
 
 
+class _BackgroundBatchWriter:
+    """Writes record batches to an Arrow IPC writer on a dedicated thread.
+
+    `write` only queues batches, blocking while the queue is full. The first
+    error raised by the IPC writer is stored and re-raised by the next `write`
+    or by `close`.
+    """
+
+    def __init__(self, writer: Any, *, max_batches: int, max_bytes: Optional[int] = None) -> None:
+        self._writer = writer
+        self._max_batches = max_batches
+        self._max_bytes = max_bytes
+        self._queue: collections.deque = collections.deque()
+        self._queued_bytes = 0
+        self._closing = False
+        self._cancelled = False
+        self._error: Optional[BaseException] = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="ingestr-batch-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, batches: Iterable[Any]) -> None:
+        self._raise_error()
+        for batch in batches:
+            if batch is None or batch.num_rows == 0:
+                continue
+            size = batch.nbytes
+            with self._condition:
+                while self._error is None and self._is_full(size):
+                    self._condition.wait()
+                self._raise_error()
+                self._queue.append((batch, size))
+                self._queued_bytes += size
+                self._condition.notify_all()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        self.join()
+        self._raise_error()
+
+    def cancel(self) -> None:
+        with self._condition:
+            self._cancelled = True
+            self._queue.clear()
+            self._queued_bytes = 0
+            self._condition.notify_all()
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def _is_full(self, size: int) -> bool:
+        if not self._queue:
+            return False
+        if len(self._queue) >= self._max_batches:
+            return True
+        return self._max_bytes is not None and self._queued_bytes + size > self._max_bytes
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closing and not self._cancelled:
+                    self._condition.wait()
+                if self._cancelled or not self._queue:
+                    return
+                batch, size = self._queue[0]
+
+            try:
+                self._writer.write_batch(batch)
+            except BaseException as exc:
+                with self._condition:
+                    self._error = exc
+                    self._queue.clear()
+                    self._queued_bytes = 0
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                if self._queue:
+                    self._queue.popleft()
+                    self._queued_bytes -= size
+                self._condition.notify_all()
+
+
 def _ingest_batches(
     batches: Iterable[Any],
     *,
@@ -319,6 +844,10 @@ def _ingest_batches(
     source_table: str,
     transport: Transport,
     schema: Any = None,
+    segment_bytes: Optional[int] = None,
+    dictionary_encoder: Optional["_DictionaryEncoder"] = None,
+    compression: Optional[str] = None,
+    encode_pool: Optional["_EncodePool"] = None,
     **options: Any,
 ) -> subprocess.CompletedProcess:
     first_batch, remaining = _peek_first_batch(batches)
@@ -327,6 +856,10 @@ def _ingest_batches(
 
     arrow_schema = schema or first_batch.schema
     all_batches = _prepend(first_batch, remaining)
+    if dictionary_encoder is not None:
+        arrow_schema = dictionary_encoder.plan(arrow_schema, first_batch, pa=pa)
+        all_batches = map(dictionary_encoder.encode, all_batches)
+    ipc_options = _ipc_write_options(pa, compression=compression, dictionary_encoder=dictionary_encoder)
 
     normalized_transport = transport.lower()
     if normalized_transport == "stream":
@@ -334,6 +867,20 @@ def _ingest_batches(
             all_batches,
             pa=pa,
             schema=arrow_schema,
+            ipc_options=ipc_options,
+            encode_pool=encode_pool,
+            dest_uri=dest_uri,
+            dest_table=dest_table,
+            source_table=source_table,
+            **options,
+        )
+    if normalized_transport == "mmap" and segment_bytes:
+        return _ingest_mmap_segments(
+            all_batches,
+            pa=pa,
+            schema=arrow_schema,
+            ipc_options=ipc_options,
+            segment_bytes=segment_bytes,
             dest_uri=dest_uri,
             dest_table=dest_table,
             source_table=source_table,
@@ -344,6 +891,7 @@ def _ingest_batches(
             all_batches,
             pa=pa,
             schema=arrow_schema,
+            ipc_options=ipc_options,
             dest_uri=dest_uri,
             dest_table=dest_table,
             source_table=source_table,
@@ -360,44 +908,31 @@ def _ingest_stream(
     dest_uri: str,
     dest_table: str,
     source_table: str,
+    ipc_options: Any = None,
+    encode_pool: Optional["_EncodePool"] = None,
     **options: Any,
 ) -> subprocess.CompletedProcess:
     process_options = _extract_process_options(options)
-    check = process_options.pop("check", True)
-    executable = process_options.pop("executable", None)
-    capture_output = process_options.pop("capture_output", False)
     process_options.pop("temp_dir", None)
     process_options.pop("keep_temp_file", None)
-
-    if capture_output:
-        if "stdout" in process_options or "stderr" in process_options:
-            raise ValueError("stdout and stderr may not be used with capture_output")
-        process_options["stdout"] = subprocess.PIPE
-        process_options["stderr"] = subprocess.PIPE
-
-    if process_options.get("text") or process_options.get("universal_newlines"):
-        raise ValueError("Arrow stream ingestion requires binary stdin; text mode is not supported")
-    if "stdin" in process_options or "input" in process_options:
-        raise ValueError("stdin/input are managed by ingestr's Arrow stream transport")
-
-    command = [
-        os.fspath(executable) if executable is not None else binary_path(),
-        *build_ingest_args(
-            source_uri="arrow-stream://-",
-            source_table=source_table,
-            dest_uri=dest_uri,
-            dest_table=dest_table,
-            **options,
-        ),
-    ]
+    capture = _output_capture(process_options)
+    progress = _progress_events(options, process_options)
+    check, executable = _prepare_stream_process_options(process_options)
+    command = _arrow_stream_command(
+        executable,
+        source_table=source_table,
+        dest_uri=dest_uri,
+        dest_table=dest_table,
+        options=options,
+    )
 
     proc = subprocess.Popen(command, stdin=subprocess.PIPE, **process_options)
-    drainer = _ProcessOutputDrainer(proc)
+    drainer = _ProcessOutputDrainer(proc, progress=progress, capture=capture)
     assert proc.stdin is not None
 
     writer_error: Optional[BaseException] = None
     try:
-        with pa.ipc.new_stream(proc.stdin, schema) as writer:
+        with _new_stream_writer(pa, proc.stdin, schema, ipc_options=ipc_options, encode_pool=encode_pool) as writer:
             _write_non_empty_batches(writer, batches)
     except BrokenPipeError as exc:
         writer_error = exc
@@ -415,7 +950,7 @@ def _ingest_stream(
 
     returncode = proc.wait()
     stdout, stderr = drainer.collect()
-    completed = subprocess.CompletedProcess(command, returncode, stdout, stderr)
+    completed = _ingest_result(command, returncode, stdout, stderr, progress)
 
     if check and completed.returncode:
         raise subprocess.CalledProcessError(completed.returncode, command, output=stdout, stderr=stderr)
@@ -433,18 +968,45 @@ def _ingest_mmap(
     dest_uri: str,
     dest_table: str,
     source_table: str,
+    ipc_options: Any = None,
     **options: Any,
 ) -> subprocess.CompletedProcess:
     process_options = _extract_process_options(options)
     temp_dir = process_options.pop("temp_dir", None)
     keep_temp_file = bool(process_options.pop("keep_temp_file", False))
+    capture = _output_capture(process_options)
+    progress = _progress_events(options, process_options)
     _reject_managed_process_input(process_options)
 
     with _temporary_arrow_file(temp_dir=temp_dir, keep=keep_temp_file) as path:
-        with pa.ipc.new_file(path, schema) as writer:
+        with pa.ipc.new_file(path, schema, options=ipc_options) as writer:
             _write_non_empty_batches(writer, batches)
 
-        return _cli_ingest(
+        return _run_mmap_file(
+            path,
+            source_table=source_table,
+            dest_uri=dest_uri,
+            dest_table=dest_table,
+            options=options,
+            process_options=process_options,
+            progress=progress,
+            capture=capture,
+        )
+
+
+def _run_mmap_file(
+    path: str,
+    *,
+    source_table: str,
+    dest_uri: str,
+    dest_table: str,
+    options: Mapping[str, Any],
+    process_options: dict[str, Any],
+    progress: Optional[_ProgressEvents],
+    capture: Optional[OutputCapture],
+) -> IngestResult:
+    if progress is None and capture is None:
+        completed = _cli_ingest(
             source_uri=f"mmap://{path}",
             source_table=source_table,
             dest_uri=dest_uri,
@@ -452,87 +1014,1106 @@ def _ingest_mmap(
             **options,
             **process_options,
         )
+        return IngestResult(completed.args, completed.returncode, completed.stdout, completed.stderr)
+
+    check, executable = _prepare_stream_process_options(process_options, uses_stdin=False)
+    command = _arrow_stream_command(
+        executable,
+        source_uri=f"mmap://{path}",
+        source_table=source_table,
+        dest_uri=dest_uri,
+        dest_table=dest_table,
+        options=options,
+    )
+    return _run_ingest_process(
+        command,
+        check=check,
+        process_options=process_options,
+        progress=progress,
+        capture=capture,
+    )
 
 
-def _batches_from_input(data: Any, *, pa: Any, batch_size: int, schema: Any = None) -> tuple[Iterator[Any], Any]:
-    data = _resolve_callable_input(data)
+def _ingest_mmap_segments(
+    batches: Iterable[Any],
+    *,
+    pa: Any,
+    schema: Any,
+    segment_bytes: int,
+    dest_uri: str,
+    dest_table: str,
+    source_table: str,
+    ipc_options: Any = None,
+    **options: Any,
+) -> subprocess.CompletedProcess:
+    process_options = _extract_process_options(options)
+    temp_dir = process_options.pop("temp_dir", None)
+    keep_temp_file = bool(process_options.pop("keep_temp_file", False))
+    capture = _output_capture(process_options)
+    progress = _progress_events(options, process_options)
+    check, executable = _prepare_stream_process_options(process_options, uses_stdin=False)
+
+    with _temporary_segment_directory(temp_dir=temp_dir, keep=keep_temp_file) as directory:
+        writer = _SegmentedArrowWriter(
+            directory,
+            schema,
+            pa=pa,
+            segment_bytes=segment_bytes,
+            ipc_options=ipc_options,
+        )
+        command = _arrow_stream_command(
+            executable,
+            source_uri=f"mmap://{writer.manifest_path}",
+            source_table=source_table,
+            dest_uri=dest_uri,
+            dest_table=dest_table,
+            options=options,
+        )
 
-    if _is_row_like(data):
-        return _iterable_batches([data], pa=pa, batch_size=batch_size, schema=schema), schema
+        proc = subprocess.Popen(command, **process_options)
+        drainer = _ProcessOutputDrainer(proc, progress=progress, capture=capture)
+        writer.process = proc
 
-    try:
-        table = _to_arrow_table(data, pa=pa, schema=schema)
-    except TypeError:
-        return _iterable_batches(data, pa=pa, batch_size=batch_size, schema=schema), schema
+        writer_error: Optional[BaseException] = None
+        try:
+            try:
+                _write_non_empty_batches(writer, batches)
+            except BrokenPipeError as exc:
+                writer_error = exc
+            writer.close()
+        except BaseException:
+            writer.abort()
+            proc.kill()
+            proc.wait()
+            drainer.collect()
+            raise
 
-    return iter(table.to_batches(max_chunksize=batch_size)), table.schema
+        returncode = proc.wait()
+        stdout, stderr = drainer.collect()
+        completed = _ingest_result(command, returncode, stdout, stderr, progress)
 
+    if check and completed.returncode:
+        raise subprocess.CalledProcessError(completed.returncode, command, output=stdout, stderr=stderr)
+    if writer_error is not None and completed.returncode == 0:
+        raise writer_error
 
-def _resolve_callable_input(data: Any) -> Any:
-    if not callable(data):
-        return data
+    return completed
 
-    if inspect.iscoroutinefunction(data) or inspect.isasyncgenfunction(data):
-        raise TypeError("async data functions are not supported; pass a synchronous iterable instead")
 
-    resolved = data()
-    if inspect.isawaitable(resolved):
-        close = getattr(resolved, "close", None)
-        if close is not None:
-            close()
-        raise TypeError("async data functions are not supported; pass a synchronous iterable instead")
-    if hasattr(resolved, "__aiter__"):
-        raise TypeError("async data iterables are not supported; pass a synchronous iterable instead")
+class _SegmentedArrowWriter:
+    """Arrow IPC file writer that rolls over to a new segment file.
 
-    return resolved
+    Each segment is closed once it holds about `segment_bytes` of record
+    batches and its file name is appended to a manifest, which the mmap source
+    tails while later segments are written. `close` marks the manifest
+    complete; `abort` marks it failed. Until then a heartbeat thread keeps
+    the manifest's modification time fresh.
+    """
 
+    def __init__(
+        self,
+        directory: str,
+        schema: Any,
+        *,
+        pa: Any,
+        segment_bytes: int,
+        ipc_options: Any = None,
+    ) -> None:
+        self.manifest_path = os.path.join(directory, "segments" + _MANIFEST_SUFFIX)
+        self.process: Optional[subprocess.Popen] = None
+        self._directory = directory
+        self._schema = schema
+        self._pa = pa
+        self._segment_bytes = segment_bytes
+        self._ipc_options = ipc_options
+        self._segment_count = 0
+        self._segment_name: Optional[str] = None
+        self._written = 0
+        self._writer = None
+        self._manifest = open(self.manifest_path, "w", encoding="utf-8")
+        self._stop_heartbeat = threading.Event()
+        self._heartbeat = threading.Thread(target=self._touch_manifest, name="ingestr-manifest-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def write_batch(self, batch: Any) -> None:
+        if self._writer is None:
+            self._open_segment()
+        self._writer.write_batch(batch)
+        self._written += batch.nbytes
+        if self._written >= self._segment_bytes:
+            self._publish_segment()
+            poll = getattr(self.process, "poll", None)
+            if poll is not None and poll() is not None:
+                raise BrokenPipeError("ingestr exited before all mmap segments were written")
+
+    def close(self) -> None:
+        self._publish_segment()
+        self._finish(_MANIFEST_END)
+
+    def abort(self) -> None:
+        try:
+            if self._writer is not None:
+                self._writer.close()
+        finally:
+            self._writer = None
+            self._finish(_MANIFEST_ABORT)
 
-def _iterable_batches(data: Iterable[Any], *, pa: Any, batch_size: int, schema: Any = None) -> Iterator[Any]:
-    rows = []
+    def _open_segment(self) -> None:
+        self._segment_name = "segment-%06d.arrow" % self._segment_count
+        self._segment_count += 1
+        self._written = 0
+        path = os.path.join(self._directory, self._segment_name)
+        self._writer = self._pa.ipc.new_file(path, self._schema, options=self._ipc_options)
 
-    def flush_rows() -> Iterator[Any]:
-        nonlocal rows, schema
-        if not rows:
+    def _publish_segment(self) -> None:
+        if self._writer is None:
             return
-        if schema is None:
-            batch = pa.RecordBatch.from_pylist(rows)
-            schema = batch.schema
-        else:
-            batch = pa.RecordBatch.from_pylist(rows, schema=schema)
-        rows = []
-        yield batch
+        self._writer.close()
+        self._writer = None
+        self._manifest.write(self._segment_name + "\n")
+        self._manifest.flush()
 
-    for item in data:
+    def _finish(self, marker: str) -> None:
+        if self._manifest.closed:
+            return
+        self._stop_heartbeat.set()
+        self._heartbeat.join()
+        self._manifest.write(marker + "\n")
+        self._manifest.close()
+
+    def _touch_manifest(self) -> None:
+        while not self._stop_heartbeat.wait(_MANIFEST_HEARTBEAT_SECONDS):
+            try:
+                os.utime(self.manifest_path)
+            except OSError:
+                return
+
+
+def _batches_from_input(
+    data: Any,
+    *,
+    pa: Any,
+    batch_size: int,
+    schema: Any = None,
+    chunk_rows: Optional[int] = None,
+    fetch_concurrency: Optional[int] = None,
+    encode_pool: Optional[_EncodePool] = None,
+    sizer: Optional["_BatchSizer"] = None,
+) -> tuple[Iterator[Any], Any]:
+    _validate_chunk_rows(chunk_rows)
+    _validate_fetch_concurrency(fetch_concurrency)
+    data = _resolve_callable_input(data)
+
+    batches, arrow_schema = _input_batches(
+        data,
+        pa=pa,
+        batch_size=batch_size,
+        schema=schema,
+        chunk_rows=chunk_rows,
+        fetch_concurrency=fetch_concurrency,
+        encode_pool=encode_pool,
+        sizer=sizer,
+    )
+    if sizer is not None:
+        batches = sizer.resize(batches, pa=pa)
+    return batches, arrow_schema
+
+
+def _input_batches(
+    data: Any,
+    *,
+    pa: Any,
+    batch_size: int,
+    schema: Any,
+    chunk_rows: Optional[int],
+    fetch_concurrency: Optional[int],
+    encode_pool: Optional[_EncodePool],
+    sizer: Optional["_BatchSizer"],
+) -> tuple[Iterator[Any], Any]:
+    if _is_row_like(data):
+        return _iterable_batches([data], pa=pa, batch_size=batch_size, schema=schema, sizer=sizer), schema
+
+    if _is_source_factory_list(data):
+        batches = _fan_in_batches(
+            data,
+            pa=pa,
+            batch_size=batch_size,
+            schema=schema,
+            chunk_rows=chunk_rows,
+            fetch_concurrency=fetch_concurrency or len(data),
+        )
+        return batches, schema
+
+    reader = _arrow_stream_reader(data, pa=pa)
+    if reader is not None:
+        return _reader_batches(reader, pa=pa, batch_size=batch_size, schema=schema), schema or reader.schema
+
+    if chunk_rows is not None:
+        chunked = _dataframe_chunk_batches(data, pa=pa, chunk_rows=chunk_rows, batch_size=batch_size, schema=schema)
+        if chunked is not None:
+            return chunked
+
+    try:
+        table = _to_arrow_table(data, pa=pa, schema=schema)
+    except TypeError:
+        if encode_pool is not None:
+            batches = encode_pool.batches(data, pa=pa, batch_size=batch_size, schema=schema, chunk_rows=chunk_rows)
+            return batches, schema
+        return (
+            _iterable_batches(data, pa=pa, batch_size=batch_size, schema=schema, chunk_rows=chunk_rows, sizer=sizer),
+            schema,
+        )
+
+    if sizer is not None:
+        sizer.observe(table)
+        batch_size = sizer.rows
+    return iter(table.to_batches(max_chunksize=batch_size)), table.schema
+
+
+def _resolve_callable_input(data: Any) -> Any:
+    if not callable(data):
+        return data
+
+    if inspect.iscoroutinefunction(data) or inspect.isasyncgenfunction(data):
+        raise TypeError("async data functions are not supported by ingest(); use ingestr.aingest instead")
+
+    resolved = data()
+    if inspect.isawaitable(resolved):
+        close = getattr(resolved, "close", None)
+        if close is not None:
+            close()
+        raise TypeError("async data functions are not supported by ingest(); use ingestr.aingest instead")
+    if hasattr(resolved, "__aiter__"):
+        raise TypeError("async data iterables are not supported by ingest(); use ingestr.aingest instead")
+
+    return resolved
+
+
+def _iterable_batches(
+    data: Iterable[Any],
+    *,
+    pa: Any,
+    batch_size: int,
+    schema: Any = None,
+    chunk_rows: Optional[int] = None,
+    sizer: Optional["_BatchSizer"] = None,
+) -> Iterator[Any]:
+    columns = _ColumnAccumulator(pa=pa, schema=schema)
+
+    def row_limit() -> int:
+        # A sizer's row target follows the row width measured so far.
+        return sizer.rows if sizer is not None else batch_size
+
+    def flush_rows() -> Iterator[Any]:
+        batch = columns.flush()
+        if batch is not None:
+            yield batch
+
+    for item in data:
         if item is None:
             continue
 
         if _is_row_like(item):
-            rows.append(_normalize_row(item))
-            if len(rows) >= batch_size:
+            columns.append(item)
+            if columns.num_rows >= row_limit():
                 yield from flush_rows()
             continue
 
         yield from flush_rows()
 
+        reader = _arrow_stream_reader(item, pa=pa)
+        if reader is not None:
+            if columns.schema is None:
+                columns.use_schema(reader.schema)
+            yield from _reader_batches(reader, pa=pa, batch_size=batch_size, schema=columns.schema)
+            continue
+
+        if chunk_rows is not None:
+            chunked = _dataframe_chunk_batches(
+                item,
+                pa=pa,
+                chunk_rows=chunk_rows,
+                batch_size=batch_size,
+                schema=columns.schema,
+            )
+            if chunked is not None:
+                chunk_batches, chunk_schema = chunked
+                if columns.schema is None:
+                    columns.use_schema(chunk_schema)
+                yield from chunk_batches
+                continue
+
         try:
-            table = _to_arrow_table(item, pa=pa, schema=schema)
+            table = _to_arrow_table(item, pa=pa, schema=columns.schema)
         except TypeError:
             for row in item:
-                rows.append(_normalize_row(row))
-                if len(rows) >= batch_size:
+                columns.append(row)
+                if columns.num_rows >= row_limit():
                     yield from flush_rows()
             continue
 
         if table.num_rows == 0:
             continue
-        if schema is None:
-            schema = table.schema
+        if columns.schema is None:
+            columns.use_schema(table.schema)
         for batch in table.to_batches(max_chunksize=batch_size):
             yield batch
 
     yield from flush_rows()
 
 
+def _batch_sizer(batch_bytes: Optional[int], batch_size: int, options: Mapping[str, Any]) -> Optional["_BatchSizer"]:
+    if batch_bytes is None:
+        return None
+    if isinstance(batch_bytes, bool) or not isinstance(batch_bytes, int) or batch_bytes <= 0:
+        raise ValueError("batch_bytes must be a positive integer")
+    page_size = options.get("page_size")
+    return _BatchSizer(batch_bytes, probe_rows=min(batch_size, _BATCH_BYTES_PROBE_ROWS), page_size=page_size)
+
+
+class _BatchSizer:
+    """Resizes record batches to about `batch_bytes` each.
+
+    The bytes per row are a moving average over the batches seen so far, so
+    the row target follows data whose width drifts. Batches within 25% of the
+    target pass through untouched; larger ones are sliced, which copies
+    nothing, and smaller ones are held back and combined with the next. With a
+    `page_size`, every batch but the last is a whole number of pages, so the
+    ingestr source never has to cut a short page out of a batch: targets are
+    rounded down to a multiple of it, but not below one page, and rows past
+    the last whole page wait for the next batch.
+    """
+
+    def __init__(self, batch_bytes: int, *, probe_rows: int, page_size: Optional[int] = None) -> None:
+        self.batch_bytes = batch_bytes
+        self.rows = max(1, probe_rows)
+        self._page_size = page_size if page_size and page_size > 0 else None
+        self._row_bytes: Optional[float] = None
+        self._pending: list[Any] = []
+        self._pending_rows = 0
+
+    def observe(self, batch: Any) -> None:
+        if batch.num_rows == 0:
+            return
+        row_bytes = max(batch.nbytes / batch.num_rows, 1.0)
+        if self._row_bytes is None:
+            self._row_bytes = row_bytes
+        else:
+            self._row_bytes = 0.75 * self._row_bytes + 0.25 * row_bytes
+
+        rows = max(1, int(self.batch_bytes / self._row_bytes))
+        if self._page_size is not None:
+            rows = max(self._page_size, rows - rows % self._page_size)
+        self.rows = rows
+
+    def resize(self, batches: Iterable[Any], *, pa: Any) -> Iterator[Any]:
+        for batch in batches:
+            yield from self.push(batch, pa=pa)
+        yield from self.finish(pa=pa)
+
+    def push(self, batch: Any, *, pa: Any) -> list[Any]:
+        """Adds a batch and returns the batches that are ready to send."""
+
+        if batch.num_rows == 0:
+            return []
+        self.observe(batch)
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows < self.rows * 0.75:
+            return []
+
+        combined = _combine_batches(self._pending, pa=pa)
+        self._pending, self._pending_rows = [], 0
+        # Page-aligned targets are exact, so anything over is sliced.
+        upper = self.rows if self._page_size is not None else int(self.rows * 1.25)
+        ready = []
+        offset = 0
+        while combined.num_rows - offset > upper:
+            ready.append(combined.slice(offset, self.rows))
+            offset += self.rows
+        rest = combined.slice(offset) if offset else combined
+        if rest.num_rows >= self.rows * 0.75:
+            send = rest.num_rows
+            if self._page_size is not None:
+                # Only finish() sends a batch that is not a whole number of pages.
+                send -= send % self._page_size
+            if send:
+                ready.append(rest.slice(0, send) if send < rest.num_rows else rest)
+                rest = rest.slice(send)
+        if rest.num_rows:
+            self._pending, self._pending_rows = [rest], rest.num_rows
+        return ready
+
+    def finish(self, *, pa: Any) -> list[Any]:
+        """Returns the batch held back for combining, if any."""
+
+        if not self._pending:
+            return []
+        combined = _combine_batches(self._pending, pa=pa)
+        self._pending, self._pending_rows = [], 0
+        return [combined]
+
+
+def _combine_batches(batches: list[Any], *, pa: Any) -> Any:
+    if len(batches) == 1:
+        return batches[0]
+    return pa.Table.from_batches(batches).combine_chunks().to_batches()[0]
+
+
+def _validate_compression(compression: Optional[str]) -> None:
+    if compression is not None and compression not in _IPC_COMPRESSION_CODECS:
+        raise ValueError("compression must be 'lz4', 'zstd' or None")
+
+
+def _ipc_write_options(
+    pa: Any,
+    *,
+    compression: Optional[str] = None,
+    dictionary_encoder: Optional["_DictionaryEncoder"] = None,
+) -> Any:
+    """IPC write options for the Arrow data sent to ingestr, or None for the defaults."""
+
+    dictionary_deltas = dictionary_encoder is not None and dictionary_encoder.encodes_columns
+    if compression is None and not dictionary_deltas:
+        return None
+    if compression is not None and not pa.Codec.is_available(compression):
+        raise ValueError(f"pyarrow was built without {compression} compression")
+    return pa.ipc.IpcWriteOptions(compression=compression, emit_dictionary_deltas=dictionary_deltas)
+
+
+def _dictionary_encoder(dictionary_encode: Optional[str], *, transport: str) -> Optional["_DictionaryEncoder"]:
+    if dictionary_encode is None or dictionary_encode is False:
+        return None
+    if dictionary_encode != "auto":
+        raise ValueError("dictionary_encode must be 'auto' or None")
+    # Arrow files cannot replace a dictionary, only extend it.
+    return _DictionaryEncoder(allow_replacement=transport.lower() == "stream")
+
+
+class _DictionaryEncoder:
+    """Dictionary-encodes low-cardinality string columns as batches are written.
+
+    `plan` picks the string columns of the first batch with few distinct values
+    per row and returns the schema to write. Each chosen column keeps one
+    dictionary for the whole write, so a later batch only appends the values it
+    adds and the IPC writer sends them as a dictionary delta. On a stream, a
+    dictionary that outgrows `_DICTIONARY_MAX_VALUES` is replaced by the values
+    of the current batch.
+    """
+
+    def __init__(self, *, allow_replacement: bool) -> None:
+        self.schema = None
+        self._allow_replacement = allow_replacement
+        self._pa = None
+        self._dictionaries: dict[int, Any] = {}
+
+    @property
+    def encodes_columns(self) -> bool:
+        return bool(self._dictionaries)
+
+    def plan(self, schema: Any, batch: Any, *, pa: Any) -> Any:
+        import pyarrow.compute as pc
+
+        self._pa = pa
+        fields = []
+        for index, field in enumerate(schema):
+            if (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)) and batch.num_rows:
+                distinct = pc.count_distinct(batch.column(index), mode="all").as_py()
+                if distinct <= batch.num_rows * _DICTIONARY_MAX_DISTINCT_RATIO:
+                    self._dictionaries[index] = pa.array([], type=field.type)
+                    field = field.with_type(pa.dictionary(pa.int32(), field.type))
+            fields.append(field)
+        self.schema = pa.schema(fields, metadata=schema.metadata)
+        return self.schema
+
+    def encode(self, batch: Any) -> Any:
+        if not self._dictionaries or batch is None:
+            return batch
+        columns = list(batch.columns)
+        for index in self._dictionaries:
+            columns[index] = self._encode_column(index, columns[index])
+        return self._pa.RecordBatch.from_arrays(columns, schema=self.schema)
+
+    def _encode_column(self, index: int, column: Any) -> Any:
+        import pyarrow.compute as pc
+
+        pa = self._pa
+        dictionary = self._dictionaries[index]
+        values = pc.unique(column).drop_null()
+        added = values.filter(pc.invert(pc.is_in(values, value_set=dictionary))) if len(dictionary) else values
+        if len(added):
+            if self._allow_replacement and len(dictionary) + len(added) > _DICTIONARY_MAX_VALUES:
+                dictionary = values
+            else:
+                dictionary = pa.concat_arrays([dictionary, added])
+            self._dictionaries[index] = dictionary
+        indices = pc.index_in(column, value_set=dictionary)
+        return pa.DictionaryArray.from_arrays(indices, dictionary)
+
+
+class _ColumnAccumulator:
+    """Collects rows straight into per-column value lists.
+
+    Column names come from the schema when one is known, otherwise from the
+    first row. Values are appended in column order, so no per-row dict is built
+    and a flush hands the lists to Arrow without another pass over the rows.
+    """
+
+    def __init__(self, *, pa: Any, schema: Any = None) -> None:
+        self._pa = pa
+        self.schema = None
+        self.num_rows = 0
+        self._names: Optional[list[str]] = None
+        self._columns: list[list[Any]] = []
+        self._stringify_keys = False
+        self._positional_plan: Optional[_RowPlan] = None
+        if schema is not None:
+            self.use_schema(schema)
+
+    def use_schema(self, schema: Any) -> None:
+        if self.num_rows:
+            raise RuntimeError("cannot change the schema of a column accumulator that holds rows")
+        self.schema = schema
+        self._names = list(schema.names)
+        self._columns = [[] for _ in self._names]
+
+    def append(self, row: Any) -> None:
+        plan = _row_plan_for(row)
+        if self._names is None:
+            self._names = list(plan.fields) if plan.fields is not None else None
+        if plan is not self._positional_plan and plan.fields is not None and self._names is not None:
+            if list(plan.fields) == self._names:
+                self._positional_plan = plan
+
+        if plan is self._positional_plan:
+            self._append_values(plan.values(row), nested=plan.kind == "dataclass")
+            return
+
+        raw = plan.mapping(row)
+        if self._names is None:
+            self._names = [str(key) for key in raw]
+            self._stringify_keys = any(not isinstance(key, str) for key in raw)
+        if self._stringify_keys:
+            raw = {str(key): value for key, value in raw.items()}
+
+        get = raw.get
+        self._append_values([get(name) for name in self._names], nested=False)
+
+    def _append_values(self, values: Iterable[Any], *, nested: bool) -> None:
+        if not self._columns:
+            self._columns = [[] for _ in self._names]
+        for column, value in zip(self._columns, values):
+            value_type = type(value)
+            if value_type is float:
+                if value != value:
+                    value = None
+            elif value_type not in _PLAIN_VALUE_TYPES:
+                if nested:
+                    value = _dataclass_field_value(value)
+                value = _normalize_value(value)
+            column.append(value)
+        self.num_rows += 1
+
+    def flush(self) -> Optional[Any]:
+        if self.num_rows == 0:
+            return None
+
+        if self.schema is None:
+            batch = self._pa.RecordBatch.from_arrays(self._columns, names=self._names)
+            self.schema = batch.schema
+        else:
+            batch = self._pa.RecordBatch.from_arrays(self._columns, schema=self.schema)
+        self._columns = [[] for _ in self._names]
+        self.num_rows = 0
+        return batch
+
+
+def _arrow_stream_reader(data: Any, *, pa: Any) -> Optional[Any]:
+    """Return a RecordBatchReader for lazily streamed Arrow input, if `data` is one.
+
+    Readers and Arrow PyCapsule stream producers (`__arrow_c_stream__`) are read
+    one batch at a time so that only a single batch is held in Python memory.
+    Tables, record batches, pandas DataFrames, and objects with `to_arrow`
+    (Polars, whose C stream exports view types) keep their existing paths.
+    """
+
+    reader_type = getattr(pa, "RecordBatchReader", None)
+    if reader_type is None:
+        return None
+    if isinstance(data, reader_type):
+        return data
+    if isinstance(data, (pa.Table, pa.RecordBatch)) or _looks_like_pandas_dataframe(data):
+        return None
+    if hasattr(data, "to_arrow"):
+        return None
+    if hasattr(data, "__arrow_c_stream__") and hasattr(reader_type, "from_stream"):
+        return reader_type.from_stream(data)
+    return None
+
+
+def _reader_batches(reader: Any, *, pa: Any, batch_size: int, schema: Any = None) -> Iterator[Any]:
+    try:
+        for batch in reader:
+            if batch.num_rows == 0:
+                continue
+            if schema is not None and not batch.schema.equals(schema):
+                batch = pa.Table.from_batches([batch]).cast(schema).combine_chunks().to_batches()[0]
+            if batch.num_rows <= batch_size:
+                yield batch
+                continue
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+    finally:
+        close = getattr(reader, "close", None)
+        if close is not None:
+            close()
+
+
+def _dataframe_chunk_batches(
+    data: Any,
+    *,
+    pa: Any,
+    chunk_rows: int,
+    batch_size: int,
+    schema: Any = None,
+) -> Optional[tuple[Iterator[Any], Any]]:
+    """Convert a pandas or Polars DataFrame one `chunk_rows` window at a time.
+
+    The schema comes from the first window. For pandas, object columns that are
+    entirely null in that window are inferred from the full column instead, so
+    a late first value does not pin the column to the null type. Polars frames
+    with dictionary (categorical) columns are left to the whole-frame path,
+    since each slice would carry its own dictionary.
+    """
+
+    if _looks_like_pandas_dataframe(data) and hasattr(data, "iloc") and hasattr(data, "columns"):
+        return _pandas_chunk_batches(data, pa=pa, chunk_rows=chunk_rows, batch_size=batch_size, schema=schema)
+    if type(data).__module__.startswith("polars") and hasattr(data, "slice") and hasattr(data, "to_arrow"):
+        return _polars_chunk_batches(data, pa=pa, chunk_rows=chunk_rows, batch_size=batch_size, schema=schema)
+    return None
+
+
+def _pandas_chunk_batches(
+    frame: Any,
+    *,
+    pa: Any,
+    chunk_rows: int,
+    batch_size: int,
+    schema: Any = None,
+) -> tuple[Iterator[Any], Any]:
+    def convert(start: int) -> Any:
+        return pa.Table.from_pandas(frame.iloc[start : start + chunk_rows], schema=schema, preserve_index=False)
+
+    first = convert(0)
+    if schema is None:
+        schema = first.schema
+        for index, field in enumerate(first.schema):
+            if pa.types.is_null(field.type) and frame.dtypes.iloc[index] == object:
+                inferred = pa.infer_type(frame.iloc[:, index], from_pandas=True)
+                schema = schema.set(index, field.with_type(inferred))
+        if not schema.equals(first.schema):
+            first = convert(0)
+
+    def batches() -> Iterator[Any]:
+        yield from first.to_batches(max_chunksize=batch_size)
+        for start in range(chunk_rows, len(frame), chunk_rows):
+            yield from convert(start).to_batches(max_chunksize=batch_size)
+
+    return batches(), schema
+
+
+def _polars_chunk_batches(
+    frame: Any,
+    *,
+    pa: Any,
+    chunk_rows: int,
+    batch_size: int,
+    schema: Any = None,
+) -> Optional[tuple[Iterator[Any], Any]]:
+    def convert(start: int) -> Any:
+        table = frame.slice(start, chunk_rows).to_arrow()
+        if not table.schema.equals(schema):
+            table = table.cast(schema)
+        return table
+
+    first = frame.slice(0, chunk_rows).to_arrow()
+    if any(pa.types.is_dictionary(field.type) for field in first.schema):
+        return None
+    if schema is None:
+        schema = first.schema
+    elif not first.schema.equals(schema):
+        first = first.cast(schema)
+
+    def batches() -> Iterator[Any]:
+        yield from first.to_batches(max_chunksize=batch_size)
+        for start in range(chunk_rows, len(frame), chunk_rows):
+            yield from convert(start).to_batches(max_chunksize=batch_size)
+
+    return batches(), schema
+
+
+class DataSourceError(RuntimeError):
+    """Raised when one of several concurrently fetched data sources fails."""
+
+    def __init__(self, source_name: str, error: BaseException) -> None:
+        super().__init__("data source %s failed: %s" % (source_name, error))
+        self.source_name = source_name
+
+
+def _is_source_factory_list(data: Any) -> bool:
+    # Functions have a __dict__ and would otherwise pass for attribute rows.
+    return (
+        isinstance(data, (list, tuple))
+        and len(data) > 0
+        and all(callable(item) and not isinstance(item, (type, Mapping)) for item in data)
+    )
+
+
+def _source_name(index: int, factory: Any) -> str:
+    name = getattr(factory, "__qualname__", None) or getattr(factory, "__name__", None)
+    if name is None:
+        func = getattr(factory, "func", None)
+        name = getattr(func, "__qualname__", None) or repr(factory)
+    return "#%d (%s)" % (index, name)
+
+
+def _fan_in_batches(
+    factories: Sequence[Any],
+    *,
+    pa: Any,
+    batch_size: int,
+    schema: Any,
+    chunk_rows: Optional[int],
+    fetch_concurrency: int,
+) -> Iterator[Any]:
+    """Run generator factories on a thread pool and merge their record batches.
+
+    Each worker converts its own source to Arrow, and a bounded queue applies
+    backpressure to the workers. Batches are conformed to the schema of the
+    first batch (or the explicit schema) before they are yielded; a batch that
+    cannot be conformed fails with a DataSourceError naming its factory.
+    """
+
+    results: queue.Queue = queue.Queue(maxsize=max(2, fetch_concurrency * 2))
+    stop = threading.Event()
+    done = object()
+    # Workers convert against the explicit schema only; the schema taken from
+    # the first batch is applied here, after the fact.
+    source_schema = schema
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch(index: int, factory: Any) -> None:
+        try:
+            batches, _ = _batches_from_input(
+                factory,
+                pa=pa,
+                batch_size=batch_size,
+                schema=source_schema,
+                chunk_rows=chunk_rows,
+            )
+            for batch in batches:
+                if batch is not None and batch.num_rows > 0 and not put((index, batch)):
+                    return
+        except BaseException as exc:
+            error = DataSourceError(_source_name(index, factory), exc)
+            error.__cause__ = exc
+            put(error)
+            return
+        put(done)
+
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(fetch_concurrency, len(factories)),
+        thread_name_prefix="ingestr-fetch",
+    )
+    try:
+        for index, factory in enumerate(factories):
+            executor.submit(fetch, index, factory)
+
+        remaining = len(factories)
+        while remaining:
+            item = results.get()
+            if item is done:
+                remaining -= 1
+                continue
+            if isinstance(item, DataSourceError):
+                raise item
+            index, batch = item
+            if schema is None:
+                schema = batch.schema
+            try:
+                batch = _conform_batch(batch, schema, pa=pa)
+            except ValueError as exc:
+                raise DataSourceError(_source_name(index, factories[index]), exc) from exc
+            yield batch
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _conform_batch(batch: Any, schema: Any, *, pa: Any) -> Any:
+    if batch.schema.equals(schema):
+        return batch
+
+    names = batch.schema.names
+    extra = [name for name in names if schema.get_field_index(name) < 0]
+    if extra:
+        raise ValueError("columns %s are not in the schema of the first batch" % ", ".join(map(repr, extra)))
+
+    arrays = []
+    for field in schema:
+        if field.name in names:
+            column = batch.column(names.index(field.name))
+            if not column.type.equals(field.type):
+                try:
+                    column = column.cast(field.type)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as exc:
+                    raise ValueError(
+                        "cannot cast column %r from %s to %s: %s" % (field.name, column.type, field.type, exc)
+                    ) from exc
+            arrays.append(column)
+        else:
+            arrays.append(pa.nulls(batch.num_rows, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _EncodePool:
+    """Converts chunks of Python rows to Arrow on a process pool.
+
+    Each chunk is pickled to a worker, which returns its record batches as
+    serialized IPC messages. With `messages=True` those are yielded as
+    `_EncodedBatch` objects that `_MessageStreamWriter` copies to the pipe
+    as they are, so the parent only pickles rows. Otherwise the messages
+    are mapped back to record batches without copying.
+
+    The process pool is started on the first chunk, from a fresh
+    interpreter rather than a fork of this one.
+    """
+
+    def __init__(self, workers: int, *, ordered: bool = True, messages: bool = False) -> None:
+        self.messages = messages
+        self._workers = workers
+        self._ordered = ordered
+        self._max_pending = workers * 2
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+    def batches(
+        self,
+        data: Iterable[Any],
+        *,
+        pa: Any,
+        batch_size: int,
+        schema: Any = None,
+        chunk_rows: Optional[int] = None,
+    ) -> Iterator[Any]:
+        pending: collections.deque = collections.deque()
+        rows: list[Any] = []
+
+        def submit() -> Iterator[Any]:
+            nonlocal rows
+            chunk, rows = rows, []
+            pending.append(self._submit(chunk, schema, batch_size))
+            if schema is None:
+                # Later chunks are encoded against the schema of the first one.
+                yield from completed(0)
+
+        def completed(limit: int) -> Iterator[Any]:
+            nonlocal schema
+            while len(pending) > limit:
+                future = pending.popleft() if self._ordered else _pop_done_future(pending)
+                schema_payload, encoded = future.result()
+                if schema is None:
+                    schema = pa.ipc.read_schema(pa.py_buffer(schema_payload))
+                for num_rows, payload in encoded:
+                    if self.messages:
+                        yield _EncodedBatch(payload, schema, num_rows)
+                    else:
+                        yield pa.ipc.read_record_batch(pa.py_buffer(payload), schema)
+
+        try:
+            for item in data:
+                if item is None:
+                    continue
+
+                if _is_row_like(item):
+                    rows.append(item)
+                elif isinstance(item, (list, tuple)):
+                    rows.extend(row for row in item if row is not None)
+                else:
+                    if rows:
+                        yield from submit()
+                    yield from completed(0)
+                    item_batches = _iterable_batches(
+                        [item],
+                        pa=pa,
+                        batch_size=batch_size,
+                        schema=schema,
+                        chunk_rows=chunk_rows,
+                    )
+                    for batch in item_batches:
+                        if schema is None:
+                            schema = batch.schema
+                        yield batch
+                    continue
+
+                if len(rows) >= batch_size:
+                    yield from submit()
+                    yield from completed(self._max_pending)
+
+            if rows:
+                yield from submit()
+            yield from completed(0)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _submit(self, rows: list[Any], schema: Any, batch_size: int) -> concurrent.futures.Future:
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=_encode_pool_context(),
+            )
+        return self._executor.submit(_encode_row_chunk, rows, schema, batch_size)
+
+
+def _encode_pool(
+    encode_workers: Optional[int],
+    *,
+    ordered: bool,
+    transport: str,
+    compression: Optional[str],
+    dictionary_encoder: Optional["_DictionaryEncoder"],
+    sizer: Optional["_BatchSizer"],
+) -> Optional[_EncodePool]:
+    if not encode_workers:
+        return None
+    # Worker messages can only go to the pipe unchanged when nothing else
+    # needs to see or rewrite the batches on the way.
+    messages = transport.lower() == "stream" and compression is None and dictionary_encoder is None and sizer is None
+    return _EncodePool(encode_workers, ordered=ordered, messages=messages)
+
+
+def _encode_pool_context() -> Any:
+    # Forking would copy the locks held by the background writer and output
+    # drainer threads into the workers.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _encode_row_chunk(rows: list[Any], schema: Any, batch_size: int) -> tuple[Optional[bytes], list[tuple[int, bytes]]]:
+    """Converts rows to record batches and returns them as IPC messages.
+
+    The schema message is returned too when no schema was given, so the
+    parent can encode later chunks against it.
+    """
+
+    pa = _require_pyarrow()
+    batches = list(_iterable_batches(rows, pa=pa, batch_size=batch_size, schema=schema))
+    schema_payload = None
+    if schema is None and batches:
+        schema_payload = batches[0].schema.serialize().to_pybytes()
+    return schema_payload, [(batch.num_rows, batch.serialize().to_pybytes()) for batch in batches]
+
+
+class _EncodedBatch:
+    """A record batch that an encode worker already serialized as an IPC message."""
+
+    __slots__ = ("payload", "schema", "num_rows")
+
+    def __init__(self, payload: bytes, schema: Any, num_rows: int) -> None:
+        self.payload = payload
+        self.schema = schema
+        self.num_rows = num_rows
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.payload)
+
+
+class _MessageStreamWriter:
+    """Writes an Arrow IPC stream message by message.
+
+    Stands in for `pa.ipc.new_stream` with default options when batches may
+    arrive already serialized by an encode worker. Those are written as they
+    are; other record batches are serialized here.
+    """
+
+    _END_OF_STREAM = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+    def __init__(self, sink: Any, schema: Any) -> None:
+        self._sink = sink
+        self._sink.write(schema.serialize())
+        self._closed = False
+
+    def __enter__(self) -> "_MessageStreamWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        self.close()
+
+    def write_batch(self, batch: Any) -> None:
+        if isinstance(batch, _EncodedBatch):
+            self._sink.write(batch.payload)
+        else:
+            self._sink.write(batch.serialize())
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._sink.write(self._END_OF_STREAM)
+
+
+def _new_stream_writer(pa: Any, sink: Any, schema: Any, *, ipc_options: Any, encode_pool: Optional[_EncodePool]) -> Any:
+    if encode_pool is not None and encode_pool.messages:
+        return _MessageStreamWriter(sink, schema)
+    return pa.ipc.new_stream(sink, schema, options=ipc_options)
+
+
+def _pop_done_future(pending: collections.deque) -> concurrent.futures.Future:
+    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+    future = next(iter(done))
+    pending.remove(future)
+    return future
+
+
+def _validate_encode_workers(encode_workers: Optional[int]) -> None:
+    if encode_workers is not None and encode_workers <= 0:
+        raise ValueError("encode_workers must be a positive integer")
+
+
+def _validate_segment_bytes(segment_bytes: Optional[int], transport: Transport) -> None:
+    if segment_bytes is None:
+        return
+    if segment_bytes <= 0:
+        raise ValueError("segment_bytes must be a positive integer")
+    if transport.lower() != "mmap":
+        raise ValueError("segment_bytes requires transport='mmap'")
+
+
+def _validate_fetch_concurrency(fetch_concurrency: Optional[int]) -> None:
+    if fetch_concurrency is not None and fetch_concurrency <= 0:
+        raise ValueError("fetch_concurrency must be a positive integer")
+
+
+def _validate_chunk_rows(chunk_rows: Optional[int]) -> None:
+    if chunk_rows is not None and chunk_rows <= 0:
+        raise ValueError("chunk_rows must be a positive integer")
+
+
 def _to_arrow_table(data: Any, *, pa: Any, schema: Any = None) -> Any:
     if isinstance(data, pa.Table):
         if schema is not None and not data.schema.equals(schema):
@@ -545,9 +2126,6 @@ def _to_arrow_table(data: Any, *, pa: Any, schema: Any = None) -> Any:
             return table.cast(schema)
         return table
 
-    if hasattr(pa, "RecordBatchReader") and isinstance(data, pa.RecordBatchReader):
-        return data.read_all()
-
     if hasattr(data, "to_arrow"):
         table = data.to_arrow()
         if isinstance(table, pa.Table):
@@ -575,33 +2153,92 @@ def _to_arrow_table(data: Any, *, pa: Any, schema: Any = None) -> Any:
 
 
 def _normalize_row(row: Any) -> Mapping[str, Any]:
-    if isinstance(row, Mapping):
-        raw = row
-    elif dataclasses.is_dataclass(row):
-        raw = dataclasses.asdict(row)
-    elif hasattr(row, "model_dump"):
-        raw = row.model_dump()
-    elif hasattr(row, "_asdict"):
-        raw = row._asdict()
-    elif hasattr(row, "__dict__"):
-        raw = vars(row)
-    else:
-        raise TypeError(f"row must be mapping-like, got {type(row).__name__}")
+    return {str(key): _normalize_value(value) for key, value in _row_mapping(row).items()}
 
-    if not isinstance(raw, Mapping):
-        raise TypeError(f"row conversion must produce a mapping, got {type(raw).__name__}")
 
-    return {str(key): _normalize_value(value) for key, value in raw.items()}
+def _row_mapping(row: Any) -> Mapping[Any, Any]:
+    return _row_plan_for(row).mapping(row)
 
 
 def _is_row_like(value: Any) -> bool:
-    return (
-        isinstance(value, Mapping)
-        or dataclasses.is_dataclass(value)
-        or hasattr(value, "model_dump")
-        or hasattr(value, "_asdict")
-        or (hasattr(value, "__dict__") and not _looks_like_dataframe_or_arrow(value))
-    )
+    return _row_plan(type(value)) is not None
+
+
+class _RowPlan:
+    """How to turn rows of one Python type into column values.
+
+    `fields` is set when every row of the type has the same columns in the same
+    order (dataclasses and named tuples), which lets rows skip the mapping step.
+    """
+
+    __slots__ = ("kind", "fields")
+
+    def __init__(self, kind: str, fields: Optional[tuple[str, ...]] = None) -> None:
+        self.kind = kind
+        self.fields = fields
+
+    def values(self, row: Any) -> Sequence[Any]:
+        if self.kind == "namedtuple":
+            return row
+        return [getattr(row, name) for name in self.fields]
+
+    def mapping(self, row: Any) -> Mapping[Any, Any]:
+        if self.kind == "mapping":
+            return row
+        if self.kind == "dataclass":
+            raw = dataclasses.asdict(row)
+        elif self.kind == "model":
+            raw = row.model_dump()
+        elif self.kind in {"namedtuple", "asdict"}:
+            raw = row._asdict()
+        else:
+            try:
+                raw = vars(row)
+            except TypeError:
+                raise TypeError(f"row must be mapping-like, got {type(row).__name__}") from None
+
+        if not isinstance(raw, Mapping):
+            raise TypeError(f"row conversion must produce a mapping, got {type(raw).__name__}")
+        return raw
+
+
+def _row_plan_for(row: Any) -> _RowPlan:
+    plan = _row_plan(type(row))
+    if plan is None:
+        raise TypeError(f"row must be mapping-like, got {type(row).__name__}")
+    return plan
+
+
+@functools.lru_cache(maxsize=_ROW_PLAN_CACHE_SIZE)
+def _row_plan(row_type: type) -> Optional[_RowPlan]:
+    if issubclass(row_type, Mapping):
+        return _RowPlan("mapping")
+    if dataclasses.is_dataclass(row_type):
+        return _RowPlan("dataclass", tuple(field.name for field in dataclasses.fields(row_type)))
+    if hasattr(row_type, "model_dump"):
+        return _RowPlan("model")
+    if hasattr(row_type, "_asdict"):
+        fields = getattr(row_type, "_fields", None)
+        if issubclass(row_type, tuple) and isinstance(fields, tuple):
+            return _RowPlan("namedtuple", tuple(str(name) for name in fields))
+        return _RowPlan("asdict")
+    if getattr(row_type, "__dictoffset__", 0) and not _looks_like_dataframe_or_arrow(row_type):
+        return _RowPlan("object")
+    return None
+
+
+def _dataclass_field_value(value: Any) -> Any:
+    # Mirrors the recursion in dataclasses.asdict for values read straight off
+    # the instance; leaves are not copied because Arrow copies them anyway.
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)(*[_dataclass_field_value(item) for item in value])
+    if isinstance(value, (list, tuple)):
+        return type(value)(_dataclass_field_value(item) for item in value)
+    if isinstance(value, dict):
+        return type(value)((_dataclass_field_value(k), _dataclass_field_value(v)) for k, v in value.items())
+    return value
 
 
 def _normalize_value(value: Any) -> Any:
@@ -610,27 +2247,41 @@ def _normalize_value(value: Any) -> Any:
     item = getattr(value, "item", None)
     if item is not None:
         try:
-            return item()
+            value = item()
         except Exception:
             return value
+        if isinstance(value, float) and math.isnan(value):
+            return None
     return value
 
 
 def _is_null(value: Any) -> bool:
     if value is None:
         return True
+    value_type = type(value)
+    if value_type in _PLAIN_VALUE_TYPES:
+        return False
     if isinstance(value, float):
         return math.isnan(value)
-    try:
-        import pandas
-    except Exception:
-        return False
-
-    try:
-        result = pandas.isna(value)
-    except Exception:
-        return False
-    return isinstance(result, bool) and result
+    if isinstance(value, Decimal):
+        return value.is_nan()
+    return value_type in _pandas_null_types()
+
+
+def _pandas_null_types() -> frozenset:
+    # pd.NA and pd.NaT can only show up once pandas has been imported, so the
+    # sentinel types are looked up in sys.modules instead of importing pandas,
+    # and cached the first time they are found. NumPy NaN/NaT scalars are
+    # handled by _normalize_value after unwrapping them with `.item()`.
+    global _PANDAS_NULL_TYPES
+    if _PANDAS_NULL_TYPES is None:
+        pandas = sys.modules.get("pandas")
+        na = getattr(pandas, "NA", None)
+        nat = getattr(pandas, "NaT", None)
+        if na is None or nat is None:
+            return frozenset()
+        _PANDAS_NULL_TYPES = frozenset({type(na), type(nat)})
+    return _PANDAS_NULL_TYPES
 
 
 def _peek_first_batch(batches: Iterable[Any]) -> tuple[Optional[Any], Iterator[Any]]:
@@ -653,14 +2304,25 @@ def _write_non_empty_batches(writer: Any, batches: Iterable[Any]) -> None:
 
 
 def _looks_like_pandas_dataframe(value: Any) -> bool:
-    return type(value).__module__.startswith("pandas.") or type(value).__module__ == "pandas.core.frame"
+    return _is_pandas_type(type(value))
+
 
+def _is_pandas_type(value_type: type) -> bool:
+    # pandas 3 reports the public "pandas" module for DataFrame and Series.
+    module = value_type.__module__
+    return module == "pandas" or module.startswith("pandas.")
 
-def _looks_like_dataframe_or_arrow(value: Any) -> bool:
-    if _looks_like_pandas_dataframe(value):
+
+def _looks_like_dataframe_or_arrow(value_type: type) -> bool:
+    if _is_pandas_type(value_type):
         return True
-    module = type(value).__module__
-    return module.startswith("pyarrow") or hasattr(value, "to_arrow") or hasattr(value, "to_dicts")
+    module = value_type.__module__
+    return (
+        module.startswith("pyarrow")
+        or hasattr(value_type, "to_arrow")
+        or hasattr(value_type, "to_dicts")
+        or hasattr(value_type, "__arrow_c_stream__")
+    )
 
 
 def _require_pyarrow() -> Any:
@@ -689,6 +2351,7 @@ def _extract_process_options(options: dict[str, Any]) -> dict[str, Any]:
         "keep_temp_file",
         "stdin",
         "input",
+        "on_progress",
     }
     out = {}
     for key in list(options):
@@ -697,6 +2360,54 @@ def _extract_process_options(options: dict[str, Any]) -> dict[str, Any]:
     return out
 
 
+def _prepare_stream_process_options(
+    process_options: dict[str, Any],
+    *,
+    uses_stdin: bool = True,
+) -> tuple[bool, Optional[PathLike]]:
+    check = process_options.pop("check", True)
+    executable = process_options.pop("executable", None)
+    capture_output = process_options.pop("capture_output", False)
+
+    if capture_output:
+        if "stdout" in process_options or "stderr" in process_options:
+            raise ValueError("stdout and stderr may not be used with capture_output")
+        process_options["stdout"] = subprocess.PIPE
+        process_options["stderr"] = subprocess.PIPE
+
+    if not uses_stdin:
+        _reject_managed_process_input(process_options)
+        return check, executable
+
+    if process_options.get("text") or process_options.get("universal_newlines"):
+        raise ValueError("Arrow stream ingestion requires binary stdin; text mode is not supported")
+    if "stdin" in process_options or "input" in process_options:
+        raise ValueError("stdin/input are managed by ingestr's Arrow stream transport")
+
+    return check, executable
+
+
+def _arrow_stream_command(
+    executable: Optional[PathLike],
+    *,
+    source_table: Optional[str],
+    dest_uri: str,
+    dest_table: Optional[str],
+    options: Mapping[str, Any],
+    source_uri: str = "arrow-stream://-",
+) -> list[str]:
+    return [
+        os.fspath(executable) if executable is not None else binary_path(),
+        *build_ingest_args(
+            source_uri=source_uri,
+            source_table=source_table,
+            dest_uri=dest_uri,
+            dest_table=dest_table,
+            **options,
+        ),
+    ]
+
+
 def _reject_managed_process_input(process_options: Mapping[str, Any]) -> None:
     if "stdin" in process_options or "input" in process_options:
         raise ValueError("stdin/input are managed by ingestr's Python data transport")
@@ -717,26 +2428,247 @@ def _temporary_arrow_file(*, temp_dir: Optional[PathLike], keep: bool) -> Iterat
                 pass
 
 
+@contextmanager
+def _temporary_segment_directory(*, temp_dir: Optional[PathLike], keep: bool) -> Iterator[str]:
+    directory = tempfile.mkdtemp(prefix="ingestr-python-", dir=_optional_fspath(temp_dir))
+
+    try:
+        yield directory
+    finally:
+        if not keep:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
 def _optional_fspath(path: Optional[PathLike]) -> Optional[str]:
     if path is None:
         return None
     return os.fspath(Path(path))
 
 
+class IngestResult(subprocess.CompletedProcess):
+    """CompletedProcess of an SDK ingestion plus the metrics ingestr reported.
+
+    The metrics come from `--progress json` events and are None when none were
+    read: pass `on_progress`, or `progress="json"` with captured stdout.
+    """
+
+    def __init__(
+        self,
+        args: Any,
+        returncode: int,
+        stdout: Any = None,
+        stderr: Any = None,
+        *,
+        rows: Optional[int] = None,
+        batches: Optional[int] = None,
+        duration: Optional[float] = None,
+        rows_per_sec: Optional[float] = None,
+        peak_memory_mb: Optional[float] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        super().__init__(args, returncode, stdout, stderr)
+        self.rows = rows
+        self.batches = batches
+        self.duration = duration
+        self.rows_per_sec = rows_per_sec
+        self.peak_memory_mb = peak_memory_mb
+        self.error = error
+
+
+class _ProgressEvents:
+    """Parses ingestr's `--progress json` events from stdout as it arrives.
+
+    `on_progress` is called with each event dict on the thread that drains
+    stdout. The first exception it raises stops further calls and is raised
+    once the process has exited.
+    """
+
+    def __init__(self, on_progress: Optional[Callable[[dict], None]] = None, *, keep_stdout: bool = True) -> None:
+        self.keep_stdout = keep_stdout
+        self.rows: Optional[int] = None
+        self.batches: Optional[int] = None
+        self.duration: Optional[float] = None
+        self.rows_per_sec: Optional[float] = None
+        self.peak_memory_mb: Optional[float] = None
+        self.error: Optional[str] = None
+        self.callback_error: Optional[BaseException] = None
+        self._on_progress = on_progress
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._pending = ""
+
+    def feed(self, chunk: Any) -> None:
+        text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        *lines, self._pending = (self._pending + text).split("\n")
+        for line in lines:
+            self._handle(line)
+
+    def finish(self) -> None:
+        pending, self._pending = self._pending + self._decoder.decode(b"", final=True), ""
+        if pending:
+            self._handle(pending)
+
+    def result(self, args: Any, returncode: int, stdout: Any, stderr: Any) -> IngestResult:
+        if self.callback_error is not None:
+            raise self.callback_error
+        return IngestResult(
+            args,
+            returncode,
+            stdout,
+            stderr,
+            rows=self.rows,
+            batches=self.batches,
+            duration=self.duration,
+            rows_per_sec=self.rows_per_sec,
+            peak_memory_mb=self.peak_memory_mb,
+            error=self.error,
+        )
+
+    def _handle(self, line: str) -> None:
+        line = line.strip()
+        if not line.startswith("{"):
+            return
+        try:
+            event = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(event, dict) or "event" not in event:
+            return
+
+        kind = event["event"]
+        if kind in ("progress", "end"):
+            self.rows = event.get("rows", self.rows)
+            self.batches = event.get("batches", self.batches)
+        if kind == "progress":
+            self.rows_per_sec = event.get("rows_per_sec", self.rows_per_sec)
+            memory = event.get("mem_mb")
+            if isinstance(memory, (int, float)):
+                self.peak_memory_mb = memory if self.peak_memory_mb is None else max(self.peak_memory_mb, memory)
+        elif kind == "end":
+            self.duration = event.get("duration_sec", self.duration)
+            if self.rows is not None and self.duration:
+                self.rows_per_sec = self.rows / self.duration
+            if event.get("error"):
+                self.error = str(event["error"])
+
+        if self._on_progress is not None and self.callback_error is None:
+            try:
+                self._on_progress(event)
+            except BaseException as exc:
+                self.callback_error = exc
+
+
+def _output_capture(process_options: dict[str, Any]) -> Optional[OutputCapture]:
+    """Take an `OutputCapture` passed as `capture_output`, leaving a plain flag
+    so the usual pipe setup and validation still apply."""
+
+    capture = process_options.get("capture_output")
+    if not isinstance(capture, OutputCapture):
+        return None
+    process_options["capture_output"] = True
+    return capture
+
+
+def _progress_events(options: dict[str, Any], process_options: dict[str, Any]) -> Optional[_ProgressEvents]:
+    """Set up progress event parsing for one ingestr run.
+
+    Must run before `_prepare_stream_process_options`, while `capture_output`
+    is still in `process_options`.
+    """
+
+    on_progress = process_options.pop("on_progress", None)
+    captured = process_options.get("capture_output") or process_options.get("stdout") == subprocess.PIPE
+    if on_progress is None:
+        if options.get("progress") == "json" and captured:
+            return _ProgressEvents()
+        return None
+
+    if options.setdefault("progress", "json") != "json":
+        raise ValueError("on_progress requires progress='json'")
+    if captured:
+        return _ProgressEvents(on_progress)
+    if process_options.get("stdout") is not None:
+        raise ValueError("on_progress reads ingestr's stdout; it cannot be redirected")
+    process_options["stdout"] = subprocess.PIPE
+    return _ProgressEvents(on_progress, keep_stdout=False)
+
+
+def _ingest_result(
+    command: Any,
+    returncode: int,
+    stdout: Any,
+    stderr: Any,
+    progress: Optional[_ProgressEvents],
+) -> IngestResult:
+    if progress is None:
+        return IngestResult(command, returncode, stdout, stderr)
+    return progress.result(command, returncode, stdout, stderr)
+
+
+def _run_ingest_process(
+    command: list[str],
+    *,
+    check: bool,
+    process_options: Mapping[str, Any],
+    progress: Optional[_ProgressEvents],
+    capture: Optional[OutputCapture],
+) -> IngestResult:
+    proc = subprocess.Popen(command, **process_options)
+    drainer = _ProcessOutputDrainer(proc, progress=progress, capture=capture)
+    returncode = proc.wait()
+    stdout, stderr = drainer.collect()
+    completed = _ingest_result(command, returncode, stdout, stderr, progress)
+    if check and completed.returncode:
+        raise subprocess.CalledProcessError(completed.returncode, command, output=stdout, stderr=stderr)
+    return completed
+
+
 class _ProcessOutputDrainer:
-    def __init__(self, proc: subprocess.Popen) -> None:
-        self._stdout = _PipeCapture(getattr(proc, "stdout", None))
-        self._stderr = _PipeCapture(getattr(proc, "stderr", None))
+    def __init__(
+        self,
+        proc: subprocess.Popen,
+        *,
+        progress: Optional[_ProgressEvents] = None,
+        capture: Optional[OutputCapture] = None,
+    ) -> None:
+        self._progress = progress
+        sink = capture.open() if capture is not None else None
+        stdout = getattr(proc, "stdout", None)
+        stderr = getattr(proc, "stderr", None)
+        self._stdout = _PipeCapture(
+            stdout,
+            on_chunk=progress.feed if progress is not None else None,
+            keep=progress is None or progress.keep_stdout,
+            tail=sink.stream("stdout") if sink is not None and stdout is not None else None,
+        )
+        self._stderr = _PipeCapture(
+            stderr,
+            tail=sink.stream("stderr") if sink is not None and stderr is not None else None,
+        )
 
     def collect(self) -> tuple[Any, Any]:
-        return self._stdout.collect(), self._stderr.collect()
+        stdout, stderr = self._stdout.collect(), self._stderr.collect()
+        if self._progress is not None:
+            self._progress.finish()
+        return stdout, stderr
 
 
 class _PipeCapture:
-    def __init__(self, stream: Any) -> None:
+    def __init__(
+        self,
+        stream: Any,
+        *,
+        on_chunk: Optional[Callable[[Any], None]] = None,
+        keep: bool = True,
+        tail: Optional[_OutputTail] = None,
+    ) -> None:
         self._stream = stream
         self._chunks = []
         self._thread = None
+        self._on_chunk = on_chunk
+        self._keep = keep
+        # With a tail, chunks are forwarded line by line and only a bounded
+        # tail is kept instead of every chunk.
+        self._tail = tail
 
         if stream is not None:
             self._thread = threading.Thread(target=self._read, daemon=True)
@@ -746,6 +2678,10 @@ class _PipeCapture:
         if self._thread is None:
             return None
         self._thread.join()
+        if not self._keep:
+            return None
+        if self._tail is not None:
+            return self._tail.value()
         if not self._chunks:
             return b""
         first = self._chunks[0]
@@ -759,8 +2695,15 @@ class _PipeCapture:
                 chunk = self._stream.read(8192)
                 if not chunk:
                     break
-                self._chunks.append(chunk)
+                if self._on_chunk is not None:
+                    self._on_chunk(chunk)
+                if self._tail is not None:
+                    self._tail.write(chunk)
+                elif self._keep:
+                    self._chunks.append(chunk)
         finally:
+            if self._tail is not None:
+                self._tail.close()
             try:
                 self._stream.close()
             except Exception:
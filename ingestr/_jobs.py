@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import dataclasses
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+import urllib.parse
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any, Optional
+
+from ._data import _ProgressEvents, _run_ingest_process
+from ._output import OutputCapture
+from ._runner import PathLike, binary_path, build_ingest_args
+
+_DEFAULT_JOB_MEMORY_MB = 512.0
+# Jobs whose peak memory is remembered across run_many calls, least recently
+# used first.
+_PEAK_MEMORY_CACHE_SIZE = 1024
+_TRANSIENT_ERROR_PATTERN = re.compile(
+    r"connection (?:refused|reset|closed)|broken pipe|timed? ?out|timeout|temporar(?:y|ily)|"
+    r"too many (?:connections|requests)|deadlock|serialization failure|rate limit|throttl|"
+    r"service unavailable|\b(?:429|502|503|504)\b|\beof\b",
+    re.IGNORECASE,
+)
+
+# Peak memory seen for each job, keyed by _job_key, so later run_many calls in
+# the same process schedule repeated jobs from measured rather than default
+# estimates.
+_PEAK_MEMORY_MB: collections.OrderedDict[tuple, float] = collections.OrderedDict()
+_PEAK_MEMORY_LOCK = threading.Lock()
+
+
+@dataclasses.dataclass
+class JobResult:
+    """Outcome of one `run_many` job after its last attempt."""
+
+    job: Mapping[str, Any]
+    returncode: Optional[int]
+    attempts: int
+    duration: float
+    peak_memory_mb: Optional[float] = None
+    stdout: Optional[str] = None
+    stderr: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0
+
+
+def run_many(
+    jobs: Iterable[Mapping[str, Any]],
+    *,
+    max_parallel: Optional[int] = None,
+    max_per_destination: Optional[int] = None,
+    memory_budget_mb: Optional[float] = None,
+    default_memory_mb: float = _DEFAULT_JOB_MEMORY_MB,
+    retries: int = 2,
+    backoff: float = 1.0,
+    max_backoff: float = 60.0,
+    retry_if: Optional[Callable[[JobResult], bool]] = None,
+    executable: Optional[PathLike] = None,
+    env: Optional[Mapping[str, str]] = None,
+    cwd: Optional[PathLike] = None,
+) -> list[JobResult]:
+    """Run many `ingestr ingest` CLI jobs in parallel and return their results in job order.
+
+    Each job is a mapping of `ingestr.cli` keyword arguments. Jobs start while
+    fewer than `max_parallel` are running (the CPU count by default), fewer than
+    `max_per_destination` target the same destination host, and the estimated
+    memory of running jobs fits `memory_budget_mb`. A job's estimate is the peak
+    memory reported by its previous run in this process, or `default_memory_mb`.
+    Failed jobs whose error looks transient, or that `retry_if` accepts, are
+    retried up to `retries` times with exponential backoff.
+
+    Jobs run with `progress="json"` unless they set `progress`; other progress
+    modes report no peak memory, so those jobs keep the default estimate. Only
+    the last lines of each job's output are kept, as with `OutputCapture`.
+    """
+
+    jobs = [dict(job) for job in jobs]
+    for name, value in (("max_parallel", max_parallel), ("max_per_destination", max_per_destination)):
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool) or value <= 0):
+            raise ValueError(f"{name} must be a positive integer")
+    if memory_budget_mb is not None and memory_budget_mb <= 0:
+        raise ValueError("memory_budget_mb must be positive")
+    if retries < 0:
+        raise ValueError("retries must not be negative")
+    for job in jobs:
+        if "source_uri" not in job or "dest_uri" not in job:
+            raise ValueError("each job requires source_uri and dest_uri")
+        build_ingest_args(**job)
+
+    scheduler = _JobScheduler(
+        jobs,
+        max_parallel=max_parallel or os.cpu_count() or 1,
+        max_per_destination=max_per_destination,
+        memory_budget_mb=memory_budget_mb,
+        default_memory_mb=default_memory_mb,
+        retries=retries,
+        backoff=backoff,
+        max_backoff=max_backoff,
+        retry_if=retry_if,
+        run_options={"executable": executable, "env": env, "cwd": cwd},
+    )
+    return scheduler.run()
+
+
+class _JobScheduler:
+    def __init__(
+        self,
+        jobs: list[dict[str, Any]],
+        *,
+        max_parallel: int,
+        max_per_destination: Optional[int],
+        memory_budget_mb: Optional[float],
+        default_memory_mb: float,
+        retries: int,
+        backoff: float,
+        max_backoff: float,
+        retry_if: Optional[Callable[[JobResult], bool]],
+        run_options: Mapping[str, Any],
+    ) -> None:
+        self._jobs = jobs
+        self._max_parallel = max_parallel
+        self._max_per_destination = max_per_destination
+        self._memory_budget_mb = memory_budget_mb
+        self._default_memory_mb = default_memory_mb
+        self._retries = retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._retry_if = retry_if
+        self._run_options = run_options
+
+        self._results: list[Optional[JobResult]] = [None] * len(jobs)
+        self._attempts = [0] * len(jobs)
+        # (not_before, index) for jobs waiting to start, in submission order.
+        self._pending = collections.deque((0.0, index) for index in range(len(jobs)))
+        # future -> (job index, memory estimate reserved for it)
+        self._running: dict[concurrent.futures.Future, tuple[int, float]] = {}
+        self._per_destination: collections.Counter = collections.Counter()
+        self._memory_in_use = 0.0
+
+    def run(self) -> list[JobResult]:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_parallel) as executor:
+            try:
+                while self._pending or self._running:
+                    wake_at = self._start_ready_jobs(executor)
+                    timeout = None if wake_at is None else max(0.0, wake_at - time.monotonic())
+                    if not self._running:
+                        time.sleep(timeout or 0)
+                        continue
+                    done, _ = concurrent.futures.wait(
+                        self._running,
+                        timeout=timeout,
+                        return_when=concurrent.futures.FIRST_COMPLETED,
+                    )
+                    for future in done:
+                        self._finish(future)
+            except BaseException:
+                for future in self._running:
+                    future.cancel()
+                raise
+
+        return [result for result in self._results if result is not None]
+
+    def _start_ready_jobs(self, executor: concurrent.futures.Executor) -> Optional[float]:
+        now = time.monotonic()
+        wake_at = None
+        waiting = collections.deque()
+        while self._pending:
+            not_before, index = self._pending.popleft()
+            if not_before > now:
+                wake_at = not_before if wake_at is None else min(wake_at, not_before)
+                waiting.append((not_before, index))
+                continue
+            if not self._can_start(index):
+                waiting.append((not_before, index))
+                continue
+
+            job = self._jobs[index]
+            estimate = self._memory_estimate(index)
+            self._per_destination[_destination_key(job["dest_uri"])] += 1
+            self._memory_in_use += estimate
+            self._attempts[index] += 1
+            future = executor.submit(_run_job, job, self._run_options)
+            self._running[future] = (index, estimate)
+        self._pending = waiting
+        return wake_at
+
+    def _can_start(self, index: int) -> bool:
+        if len(self._running) >= self._max_parallel:
+            return False
+        job = self._jobs[index]
+        if self._max_per_destination is not None:
+            if self._per_destination[_destination_key(job["dest_uri"])] >= self._max_per_destination:
+                return False
+        if self._memory_budget_mb is not None and self._running:
+            # A job larger than the whole budget still runs, but on its own.
+            if self._memory_in_use + self._memory_estimate(index) > self._memory_budget_mb:
+                return False
+        return True
+
+    def _memory_estimate(self, index: int) -> float:
+        with _PEAK_MEMORY_LOCK:
+            return _PEAK_MEMORY_MB.get(_job_key(self._jobs[index]), self._default_memory_mb)
+
+    def _remember_peak_memory(self, job: Mapping[str, Any], peak_memory_mb: float) -> None:
+        key = _job_key(job)
+        with _PEAK_MEMORY_LOCK:
+            _PEAK_MEMORY_MB[key] = peak_memory_mb
+            _PEAK_MEMORY_MB.move_to_end(key)
+            while len(_PEAK_MEMORY_MB) > _PEAK_MEMORY_CACHE_SIZE:
+                _PEAK_MEMORY_MB.popitem(last=False)
+
+    def _finish(self, future: concurrent.futures.Future) -> None:
+        index, estimate = self._running.pop(future)
+        job = self._jobs[index]
+        self._per_destination[_destination_key(job["dest_uri"])] -= 1
+        self._memory_in_use -= estimate
+
+        result = future.result()
+        result.attempts = self._attempts[index]
+        if result.peak_memory_mb is not None:
+            self._remember_peak_memory(job, result.peak_memory_mb)
+
+        if not result.ok and result.attempts <= self._retries and self._should_retry(result):
+            delay = min(self._max_backoff, self._backoff * 2 ** (result.attempts - 1))
+            delay *= 0.5 + random.random() / 2
+            self._pending.append((time.monotonic() + delay, index))
+            return
+        self._results[index] = result
+
+    def _should_retry(self, result: JobResult) -> bool:
+        if self._retry_if is not None:
+            return self._retry_if(result)
+        return _is_transient_failure(result)
+
+
+def _run_job(job: Mapping[str, Any], run_options: Mapping[str, Any]) -> JobResult:
+    started = time.monotonic()
+    args = {"progress": "json", **job}
+    options = {key: value for key, value in run_options.items() if value is not None}
+    executable = options.pop("executable", None)
+    progress = _ProgressEvents() if args["progress"] == "json" else None
+    try:
+        command = [os.fspath(executable) if executable is not None else binary_path(), *build_ingest_args(**args)]
+        completed = _run_ingest_process(
+            command,
+            check=False,
+            process_options={**options, "stdout": subprocess.PIPE, "stderr": subprocess.PIPE, "text": True},
+            progress=progress,
+            capture=OutputCapture(),
+        )
+    except Exception as exc:
+        return JobResult(job=job, returncode=None, attempts=0, duration=time.monotonic() - started, error=str(exc))
+
+    error = completed.error
+    if completed.returncode and error is None:
+        lines = (completed.stderr or "").strip().splitlines()
+        error = lines[-1] if lines else f"ingestr exited with code {completed.returncode}"
+    return JobResult(
+        job=job,
+        returncode=completed.returncode,
+        attempts=0,
+        duration=time.monotonic() - started,
+        peak_memory_mb=completed.peak_memory_mb,
+        stdout=completed.stdout or None,
+        stderr=completed.stderr or None,
+        error=error,
+    )
+
+
+def _is_transient_failure(result: JobResult) -> bool:
+    if result.returncode is None:
+        return False
+    return bool(_TRANSIENT_ERROR_PATTERN.search(result.error or ""))
+
+
+def _destination_key(dest_uri: str) -> str:
+    parts = urllib.parse.urlsplit(dest_uri)
+    scheme = parts.scheme.lower()
+    try:
+        host = parts.hostname
+        port = parts.port
+    except ValueError:
+        host, port = None, None
+    if host:
+        return f"{scheme}://{host}:{port}" if port else f"{scheme}://{host}"
+    return f"{scheme}://{parts.path}"
+
+
+def _job_key(job: Mapping[str, Any]) -> tuple:
+    return (job.get("source_uri"), job.get("source_table"), job.get("dest_uri"), job.get("dest_table"))
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import collections
+import dataclasses
+import logging
+import logging.handlers
+import os
+import threading
+from typing import Any, Optional
+
+from ._runner import PathLike
+
+# Longest run of output without a newline that is buffered before it is
+# forwarded as a line of its own.
+_MAX_LINE_CHARS = 64 * 1024
+
+
+@dataclasses.dataclass
+class OutputCapture:
+    """Streams ingestr's stdout and stderr line by line instead of buffering them.
+
+    Pass as `capture_output=OutputCapture(...)`. Each line is forwarded to
+    `logger` and/or appended to `file`, which rotates at `max_file_bytes`
+    keeping `backup_count` old files. Only the last `tail_lines` lines, up to
+    `tail_bytes`, are kept in memory; they become the result's `stdout` and
+    `stderr` and the output of `CalledProcessError`.
+    """
+
+    logger: Optional[logging.Logger] = None
+    file: Optional[PathLike] = None
+    max_file_bytes: int = 10 * 1024 * 1024
+    backup_count: int = 3
+    tail_lines: Optional[int] = 1000
+    tail_bytes: Optional[int] = 1024 * 1024
+    level: int = logging.INFO
+
+    def __post_init__(self) -> None:
+        for name in ("tail_lines", "tail_bytes"):
+            value = getattr(self, name)
+            if value is not None and value < 0:
+                raise ValueError(f"{name} must not be negative")
+        if self.max_file_bytes < 0 or self.backup_count < 0:
+            raise ValueError("max_file_bytes and backup_count must not be negative")
+
+    def open(self) -> "_OutputSink":
+        return _OutputSink(self)
+
+
+class _OutputSink:
+    """The destinations of one ingestr run's output, shared by both streams."""
+
+    def __init__(self, capture: OutputCapture) -> None:
+        self.capture = capture
+        self._loggers = [capture.logger] if capture.logger is not None else []
+        self._handler: Optional[logging.Handler] = None
+        self._open_streams = 0
+        self._lock = threading.Lock()
+
+        if capture.file is not None:
+            self._handler = logging.handlers.RotatingFileHandler(
+                os.fspath(capture.file),
+                maxBytes=capture.max_file_bytes,
+                backupCount=capture.backup_count,
+                encoding="utf-8",
+            )
+            self._handler.setFormatter(logging.Formatter("%(message)s"))
+            file_logger = logging.Logger("ingestr.output")
+            file_logger.propagate = False
+            file_logger.addHandler(self._handler)
+            self._loggers.append(file_logger)
+
+    def stream(self, name: str) -> "_OutputTail":
+        with self._lock:
+            self._open_streams += 1
+        return _OutputTail(self, name)
+
+    def emit(self, name: str, line: str) -> None:
+        for logger in self._loggers:
+            logger.log(self.capture.level, "%s", line, extra={"ingestr_stream": name})
+
+    def release(self) -> None:
+        with self._lock:
+            self._open_streams -= 1
+            last = self._open_streams == 0
+        if last and self._handler is not None:
+            self._handler.close()
+
+
+class _OutputTail:
+    """Splits one stream into lines, forwards them, and keeps a bounded tail."""
+
+    def __init__(self, sink: _OutputSink, name: str) -> None:
+        self._sink = sink
+        self._name = name
+        self._tail: collections.deque = collections.deque()
+        self._tail_size = 0
+        self._partial: Any = None
+        self._closed = False
+
+    def write(self, chunk: Any) -> None:
+        data = chunk if self._partial is None else self._partial + chunk
+        lines = data.splitlines(keepends=True)
+        self._partial = None
+        if lines and not lines[-1].endswith(b"\n" if isinstance(data, bytes) else "\n"):
+            self._partial = lines.pop()
+            if len(self._partial) > _MAX_LINE_CHARS:
+                lines.append(self._partial)
+                self._partial = None
+        for line in lines:
+            self._add(line)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._partial is not None:
+            self._add(self._partial)
+            self._partial = None
+        self._sink.release()
+
+    def value(self) -> Any:
+        if not self._tail:
+            return b""
+        return self._tail[0][:0].join(self._tail)
+
+    def _add(self, line: Any) -> None:
+        text = line.decode("utf-8", "replace") if isinstance(line, bytes) else line
+        self._sink.emit(self._name, text.rstrip("\r\n"))
+
+        capture = self._sink.capture
+        if capture.tail_bytes is not None and len(line) > capture.tail_bytes:
+            line = line[len(line) - capture.tail_bytes :]
+        self._tail.append(line)
+        self._tail_size += len(line)
+        while self._tail and (
+            (capture.tail_lines is not None and len(self._tail) > capture.tail_lines)
+            or (capture.tail_bytes is not None and self._tail_size > capture.tail_bytes)
+        ):
+            self._tail_size -= len(self._tail.popleft())
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import queue
+import struct
+import subprocess
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional
+
+from ._data import (
+    IngestResult,
+    _arrow_stream_command,
+    _batch_sizer,
+    _batches_from_input,
+    _extract_process_options,
+    _peek_first_batch,
+    _prepend,
+    _ProgressEvents,
+    _require_pyarrow,
+)
+from ._runner import PathLike, binary_path
+
+_RESULT_MARKER = b"\x1eingestr-worker-result "
+_STDERR_END_MARKER = b"\x1eingestr-worker-end\n"
+_FRAME_SIZE = struct.Struct("<I")
+
+
+class WorkerPool:
+    """Pool of long-lived `ingestr worker` processes reused across ingest calls.
+
+    Each worker serves one request at a time and keeps its destination
+    connections open between requests, so repeated small ingestions skip
+    process start-up and connection setup. Workers are started on demand, up
+    to `size` at once, and stopped after `idle_ttl` seconds without work.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        *,
+        idle_ttl: Optional[float] = 300.0,
+        executable: Optional[PathLike] = None,
+        env: Optional[Mapping[str, str]] = None,
+        cwd: Optional[PathLike] = None,
+    ) -> None:
+        if not isinstance(size, int) or isinstance(size, bool) or size <= 0:
+            raise ValueError("size must be a positive integer")
+        if idle_ttl is not None and idle_ttl <= 0:
+            raise ValueError("idle_ttl must be positive")
+
+        self.size = size
+        self.idle_ttl = idle_ttl
+        self._executable = executable
+        self._env = dict(env) if env is not None else None
+        self._cwd = cwd
+        self._idle: list[_Worker] = []
+        self._running = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+
+        if idle_ttl is not None:
+            self._reaper = threading.Thread(target=self._reap_idle_workers, daemon=True)
+            self._reaper.start()
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> bool:
+        self.close()
+        return False
+
+    def ingest(
+        self,
+        data: Any,
+        *,
+        dest_uri: str,
+        dest_table: str,
+        source_table: str = "python_data",
+        batch_size: int = 10000,
+        schema: Any = None,
+        chunk_rows: Optional[int] = None,
+        batch_bytes: Optional[int] = None,
+        check: bool = True,
+        **options: Any,
+    ) -> IngestResult:
+        """Ingest Python data on a pooled worker.
+
+        Accepts the same data and CLI options as `ingest` with the Arrow stream
+        transport. The worker's stdout and stderr for this request are returned
+        on the IngestResult, with metrics filled in when `progress="json"`.
+        """
+
+        process_options = _extract_process_options(options)
+        if process_options:
+            raise ValueError(
+                f"WorkerPool.ingest does not accept {', '.join(sorted(process_options))}; "
+                "configure executable, env and cwd on the WorkerPool"
+            )
+
+        pa = _require_pyarrow()
+        batches, arrow_schema = _batches_from_input(
+            data,
+            pa=pa,
+            batch_size=batch_size,
+            schema=schema,
+            chunk_rows=chunk_rows,
+            sizer=_batch_sizer(batch_bytes, batch_size, options),
+        )
+        first_batch, remaining = _peek_first_batch(batches)
+        if first_batch is None:
+            raise ValueError("input produced no rows")
+
+        command = _arrow_stream_command(
+            self._executable,
+            source_table=source_table,
+            dest_uri=dest_uri,
+            dest_table=dest_table,
+            options=options,
+        )
+
+        worker = self._acquire()
+        healthy = False
+        try:
+            completed = worker.run(
+                command,
+                _prepend(first_batch, remaining),
+                pa=pa,
+                schema=arrow_schema or first_batch.schema,
+            )
+            healthy = True
+        finally:
+            self._release(worker, healthy=healthy)
+
+        if check and completed.returncode:
+            raise subprocess.CalledProcessError(
+                completed.returncode,
+                command,
+                output=completed.stdout,
+                stderr=completed.stderr,
+            )
+        return completed
+
+    def close(self) -> None:
+        """Stop all workers. Calls that are running finish first."""
+
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._running -= len(idle)
+            self._cond.notify_all()
+
+        for worker in idle:
+            worker.close()
+
+    def _acquire(self) -> "_Worker":
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ValueError("worker pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._running < self.size:
+                    self._running += 1
+                    break
+                self._cond.wait()
+
+        try:
+            return _Worker(self._worker_command(), env=self._env, cwd=self._cwd)
+        except BaseException:
+            with self._cond:
+                self._running -= 1
+                self._cond.notify()
+            raise
+
+    def _release(self, worker: "_Worker", *, healthy: bool) -> None:
+        with self._cond:
+            keep = healthy and not self._closed and worker.alive()
+            if keep:
+                worker.last_used = time.monotonic()
+                self._idle.append(worker)
+            else:
+                self._running -= 1
+            self._cond.notify_all()
+
+        if not keep:
+            worker.close(kill=not healthy)
+
+    def _worker_command(self) -> list[str]:
+        executable = os.fspath(self._executable) if self._executable is not None else binary_path()
+        return [executable, "worker"]
+
+    def _reap_idle_workers(self) -> None:
+        assert self.idle_ttl is not None
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                now = time.monotonic()
+                expired = [worker for worker in self._idle if now - worker.last_used >= self.idle_ttl]
+                if expired:
+                    self._idle = [worker for worker in self._idle if worker not in expired]
+                    self._running -= len(expired)
+                    self._cond.notify_all()
+                else:
+                    oldest = min((worker.last_used for worker in self._idle), default=now)
+                    self._cond.wait(timeout=oldest + self.idle_ttl - now)
+                    continue
+
+            for worker in expired:
+                worker.close()
+
+
+class _Worker:
+    """One `ingestr worker` process and the readers for its output pipes."""
+
+    def __init__(self, command: list[str], *, env: Optional[Mapping[str, str]], cwd: Optional[PathLike]) -> None:
+        self.last_used = time.monotonic()
+        self._proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            cwd=cwd,
+        )
+        self._results: queue.Queue = queue.Queue()
+        self._stderr_results: queue.Queue = queue.Queue()
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def run(self, command: list[str], batches: Iterable[Any], *, pa: Any, schema: Any) -> IngestResult:
+        assert self._proc.stdin is not None
+        request = json.dumps({"args": command[1:]}).encode("utf-8")
+        out = self._proc.stdin
+        try:
+            out.write(_FRAME_SIZE.pack(len(request)))
+            out.write(request)
+
+            sink = _PayloadSink(out)
+            with pa.ipc.new_stream(sink, schema) as writer:
+                for batch in batches:
+                    if batch.num_rows == 0:
+                        continue
+                    writer.write_batch(batch)
+                    sink.send()
+            sink.end()
+            out.flush()
+        except BrokenPipeError as exc:
+            raise RuntimeError(f"ingestr worker exited unexpectedly with code {self._proc.wait()}") from exc
+
+        result = self._results.get()
+        if result is None:
+            raise RuntimeError(f"ingestr worker exited unexpectedly with code {self._proc.wait()}")
+
+        stdout, outcome = result
+        # The stderr reader lags behind stdout, so wait for this request's end
+        # marker rather than taking whatever it has read so far.
+        stderr = self._stderr_results.get()
+        if stderr is None:
+            raise RuntimeError(f"ingestr worker exited unexpectedly with code {self._proc.wait()}")
+        progress = _ProgressEvents()
+        progress.feed(stdout)
+        progress.finish()
+        return progress.result(command, 0 if outcome.get("ok") else 1, stdout, stderr)
+
+    def close(self, *, kill: bool = False) -> None:
+        if kill:
+            self._proc.kill()
+        try:
+            if self._proc.stdin is not None:
+                self._proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self._proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+
+    def _read_stdout(self) -> None:
+        stdout = []
+        try:
+            for line in self._proc.stdout:
+                position = line.find(_RESULT_MARKER)
+                if position < 0:
+                    stdout.append(line)
+                    continue
+                stdout.append(line[:position])
+                outcome = json.loads(line[position + len(_RESULT_MARKER) :])
+                self._results.put((b"".join(stdout), outcome))
+                stdout = []
+        finally:
+            self._results.put(None)
+
+    def _read_stderr(self) -> None:
+        stderr = []
+        try:
+            for line in self._proc.stderr:
+                position = line.find(_STDERR_END_MARKER)
+                if position < 0:
+                    stderr.append(line)
+                    continue
+                stderr.append(line[:position])
+                self._stderr_results.put(b"".join(stderr))
+                stderr = []
+        finally:
+            self._stderr_results.put(None)
+
+
+class _PayloadSink(io.BytesIO):
+    """Buffers Arrow IPC bytes and writes them to a worker as payload frames."""
+
+    def __init__(self, out: Any) -> None:
+        super().__init__()
+        self._out = out
+
+    def send(self) -> None:
+        data = self.getvalue()
+        if not data:
+            return
+        self._out.write(_FRAME_SIZE.pack(len(data)))
+        self._out.write(data)
+        self.seek(0)
+        self.truncate()
+
+    def end(self) -> None:
+        self.send()
+        self._out.write(_FRAME_SIZE.pack(0))
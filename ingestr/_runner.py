@@ -1,36 +1,46 @@
 from __future__ import annotations
 
-import hashlib
+import functools
 import json
 import os
-import platform
-import shutil
 import stat
 import subprocess
 import sys
-import tarfile
-import tempfile
-import urllib.parse
-import urllib.request
-import zipfile
-from collections.abc import Mapping, Sequence
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, List, NamedTuple, Optional, Union
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional, Union
 
 from ._checksums import ARCHIVE_SHA256
 
-try:
-    from importlib.metadata import PackageNotFoundError, version
-except ModuleNotFoundError:
-    from importlib_metadata import PackageNotFoundError, version  # type: ignore
+# The download, archive and platform-detection modules are imported where
+# they are used: most processes find a binary without ever needing them, and
+# `import ingestr` should stay cheap for short-lived callers.
+if TYPE_CHECKING:
+    import tarfile
+    import zipfile
 
 PathLike = Union[str, os.PathLike]
 _GITHUB_RELEASE_BASE_URL = "https://github.com/bruin-data/ingestr/releases/download"
 _BINARY_PATH_ENV = "INGESTR_BINARY_PATH"
 _BINARY_CACHE_DIR_ENV = "INGESTR_BINARY_CACHE_DIR"
 _BINARY_TAG_ENV = "INGESTR_BINARY_TAG"
+_BINARY_ENV_VARS = (
+    _BINARY_PATH_ENV,
+    _BINARY_CACHE_DIR_ENV,
+    _BINARY_TAG_ENV,
+    "XDG_CACHE_HOME",
+    "LOCALAPPDATA",
+)
 _DOWNLOAD_TIMEOUT_SECONDS = 60
+# A download lock whose holder has not refreshed it for this long, or whose
+# holder process on this host has exited, is treated as abandoned.
+_DOWNLOAD_LOCK_STALE_SECONDS = 60
+_DOWNLOAD_LOCK_HEARTBEAT_SECONDS = 5
+_DOWNLOAD_LOCK_POLL_SECONDS = 0.2
+_DOWNLOAD_LOCK_WAIT_SECONDS = 900
 
 
 class IngestrNotFoundError(FileNotFoundError):
@@ -46,9 +56,44 @@ class _ReleasePlatform(NamedTuple):
     binary_name: str
 
 
+# (environment key, path, file signature) of the last binary_path() result.
+_resolved_binary: Optional[tuple[tuple, str, Optional[tuple]]] = None
+
+
 def binary_path() -> str:
-    """Return the path to the ingestr executable, downloading it if needed."""
+    """Return the path to the ingestr executable, downloading it if needed.
+
+    The result is remembered for the process and resolved again when one of
+    the INGESTR_BINARY_* or cache-directory environment variables changes, or
+    when the executable is replaced or removed.
+    """
+
+    global _resolved_binary
+
+    key = tuple(os.environ.get(name) for name in _BINARY_ENV_VARS)
+    resolved = _resolved_binary
+    if resolved is not None and resolved[0] == key and _file_signature(resolved[1]) == resolved[2]:
+        return resolved[1]
+
+    path = _resolve_binary_path()
+    _resolved_binary = (key, path, _file_signature(path))
+    return path
 
+
+def _clear_binary_path_cache() -> None:
+    global _resolved_binary
+    _resolved_binary = None
+
+
+def _file_signature(path: str) -> Optional[tuple]:
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return (info.st_mtime_ns, info.st_size, info.st_ino)
+
+
+def _resolve_binary_path() -> str:
     override = _binary_path_override()
     if override is not None:
         return str(override)
@@ -294,7 +339,26 @@ def _download_binary(target: Path) -> Path:
     archive_name = _release_archive_name(release)
     url = _release_asset_url(tag, archive_name)
     target.parent.mkdir(parents=True, exist_ok=True)
-    _report_download_start(tag, release)
+
+    # Processes starting together on a cold cache take turns on this lock: the
+    # first downloads, the rest wait and reuse its result.
+    lock = _DownloadLock(target.with_name(target.name + ".lock"))
+    if not lock.acquire(ready=target.is_file):
+        _ensure_executable(target)
+        return target
+    try:
+        if target.is_file():
+            _ensure_executable(target)
+            return target
+        _report_download_start(tag, release)
+        return _download_release_binary(target, release, tag, archive_name, url)
+    finally:
+        lock.release()
+
+
+def _download_release_binary(target: Path, release: _ReleasePlatform, tag: str, archive_name: str, url: str) -> Path:
+    import shutil
+    import tempfile
 
     temp_dir = Path(tempfile.mkdtemp(prefix="ingestr-download-", dir=str(target.parent)))
     try:
@@ -316,7 +380,113 @@ def _download_binary(target: Path) -> Path:
         shutil.rmtree(str(temp_dir), ignore_errors=True)
 
 
+class _DownloadLock:
+    """Advisory lock file that lets one process download the binary at a time.
+
+    The lock is created with O_EXCL and records its holder. While held, a
+    heartbeat thread refreshes its mtime so waiters can tell a slow download
+    from an abandoned one; the holder's pid is not checked, as it may belong
+    to another PID namespace. The binary is still installed with an atomic
+    `os.replace`, so a lost or broken lock only costs a duplicate download.
+    """
+
+    def __init__(self, path: Path) -> None:
+        import socket
+        import uuid
+
+        self.path = path
+        self._token = "%s:%d:%s" % (socket.gethostname(), os.getpid(), uuid.uuid4().hex)
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    def acquire(self, ready: Optional[Callable[[], bool]] = None) -> bool:
+        """Wait for the lock. Returns False instead if `ready()` becomes true first."""
+
+        deadline = time.monotonic() + _DOWNLOAD_LOCK_WAIT_SECONDS
+        while True:
+            try:
+                fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                pass
+            else:
+                with os.fdopen(fd, "w") as lock_file:
+                    lock_file.write(self._token)
+                self._heartbeat = threading.Thread(target=self._refresh, daemon=True)
+                self._heartbeat.start()
+                return True
+
+            if ready is not None and ready():
+                return False
+            self._break_if_stale()
+            if time.monotonic() >= deadline:
+                raise IngestrNotFoundError(
+                    "timed out waiting for another process to download ingestr; remove %s if no download is running"
+                    % self.path
+                )
+            time.sleep(_DOWNLOAD_LOCK_POLL_SECONDS)
+
+    def release(self) -> None:
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        if self._holder() == self._token:
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def _refresh(self) -> None:
+        while not self._stop.wait(_DOWNLOAD_LOCK_HEARTBEAT_SECONDS):
+            try:
+                os.utime(str(self.path))
+            except OSError:
+                return
+
+    def _holder(self) -> Optional[str]:
+        try:
+            return self.path.read_text(encoding="utf-8")
+        except (OSError, ValueError):
+            return None
+
+    def _break_if_stale(self) -> None:
+        if not self._is_stale(self.path):
+            return
+
+        # Renaming is atomic, so only one waiter takes the lock away. The lock
+        # may have been replaced by a fresh one since it was judged stale, so
+        # check again what was actually taken.
+        import uuid
+
+        claimed = self.path.with_name("%s.stale-%s" % (self.path.name, uuid.uuid4().hex))
+        try:
+            os.rename(str(self.path), str(claimed))
+        except OSError:
+            return
+        try:
+            if not self._is_stale(claimed):
+                try:
+                    # Put a live lock back unless a new one was created meanwhile.
+                    os.link(str(claimed), str(self.path))
+                except OSError:
+                    pass
+        finally:
+            try:
+                claimed.unlink()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _is_stale(path: Path) -> bool:
+        try:
+            return time.time() - path.stat().st_mtime >= _DOWNLOAD_LOCK_STALE_SECONDS
+        except OSError:
+            return False
+
+
 def _download_file(url: str, destination: Path) -> None:
+    import shutil
+    import urllib.request
+
     request = urllib.request.Request(
         url,
         headers={"User-Agent": "ingestr-python/%s" % _package_version()},
@@ -372,6 +542,8 @@ def _archive_checksum(tag: str, archive_name: str) -> Optional[str]:
 
 
 def _sha256_file(path: Path) -> str:
+    import hashlib
+
     digest = hashlib.sha256()
     with path.open("rb") as input_file:
         for chunk in iter(lambda: input_file.read(1024 * 1024), b""):
@@ -387,6 +559,9 @@ def _extract_binary(archive_path: Path, binary_name: str, destination: Path) ->
 
 
 def _extract_binary_from_tar(archive_path: Path, binary_name: str, destination: Path) -> None:
+    import shutil
+    import tarfile
+
     with tarfile.open(str(archive_path), "r:*") as archive:
         member = _find_tar_binary_member(archive, binary_name)
         if member is None:
@@ -400,6 +575,9 @@ def _extract_binary_from_tar(archive_path: Path, binary_name: str, destination:
 
 
 def _extract_binary_from_zip(archive_path: Path, binary_name: str, destination: Path) -> None:
+    import shutil
+    import zipfile
+
     with zipfile.ZipFile(str(archive_path)) as archive:
         member = _find_zip_binary_member(archive, binary_name)
         if member is None:
@@ -424,6 +602,8 @@ def _find_zip_binary_member(archive: zipfile.ZipFile, binary_name: str) -> Optio
 
 
 def _release_asset_url(tag: str, archive_name: str) -> str:
+    import urllib.parse
+
     return "%s/%s/%s" % (
         _GITHUB_RELEASE_BASE_URL,
         urllib.parse.quote(tag, safe=""),
@@ -436,6 +616,8 @@ def _release_archive_name(release: _ReleasePlatform) -> str:
 
 
 def _release_platform() -> _ReleasePlatform:
+    import platform
+
     system = platform.system().lower()
     machine = platform.machine().lower()
 
@@ -472,7 +654,10 @@ def _release_platform() -> _ReleasePlatform:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def _linux_uses_musl() -> bool:
+    import platform
+
     libc_name = platform.libc_ver()[0].lower()
     if "musl" in libc_name:
         return True
@@ -504,6 +689,11 @@ def _release_tag() -> str:
 
 
 def _package_version() -> str:
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ModuleNotFoundError:
+        from importlib_metadata import PackageNotFoundError, version  # type: ignore
+
     try:
         return version("ingestr")
     except PackageNotFoundError:
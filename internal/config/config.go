@@ -151,8 +151,9 @@ func (c *IngestConfig) Validate() error {
 	if c.DestURI == "" {
 		return &ValidationError{Field: "dest-uri", Message: "is required"}
 	}
-	// Source table is required unless this is a CDC source (multi-table mode)
-	if c.SourceTable == "" && !c.IsCDCSource() {
+	// Source table is required unless the source emits multiple tables (CDC or
+	// a multi-table Arrow stream).
+	if c.SourceTable == "" && !c.IsCDCSource() && !c.IsMultiTableArrowStream() {
 		return &ValidationError{Field: "source-table", Message: "is required"}
 	}
 	if c.DestTable == "" {
@@ -284,6 +285,20 @@ func (c *IngestConfig) IsCDCSource() bool {
 	return strings.Contains(strings.ToLower(c.SourceURI[:schemeEnd]), "+cdc")
 }
 
+// IsMultiTableArrowStream reports whether the source is a framed multi-table
+// Arrow stream (arrow-stream://-?multi_table=true), which names its own tables.
+func (c *IngestConfig) IsMultiTableArrowStream() bool {
+	parsed, err := url.Parse(c.SourceURI)
+	if err != nil {
+		return false
+	}
+	switch strings.ToLower(parsed.Scheme) {
+	case "arrow-stream", "arrowstream":
+		return parsed.Query().Get("multi_table") == "true"
+	}
+	return false
+}
+
 // validateCDCMode enforces the deprecation of the ?mode= CDC URI parameter.
 // Continuous ingestion is selected by --stream alone; mode= no longer has any
 // effect. mode=stream on its own used to leave the source reading forever while
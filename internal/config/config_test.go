@@ -82,6 +82,25 @@ func TestIngestConfigValidate_NoInferenceWithColumns(t *testing.T) {
 	}
 }
 
+func TestIngestConfigValidate_MultiTableArrowStreamWithoutSourceTable(t *testing.T) {
+	cfg := DefaultConfig()
+	cfg.SourceURI = "arrow-stream://-?multi_table=true"
+	cfg.DestURI = "duckdb://out.duckdb"
+
+	if err := cfg.Validate(); err != nil {
+		t.Fatalf("Validate() error = %v", err)
+	}
+
+	cfg = DefaultConfig()
+	cfg.SourceURI = "arrow-stream://-"
+	cfg.DestURI = "duckdb://out.duckdb"
+
+	err := cfg.Validate()
+	if err == nil || !strings.Contains(err.Error(), "source-table") {
+		t.Fatalf("expected source-table validation error, got %v", err)
+	}
+}
+
 func TestIngestConfigValidate_RemovedTruncateInsert(t *testing.T) {
 	cfg := DefaultConfig()
 	cfg.SourceURI = "postgres://localhost/db"
@@ -37,4 +37,10 @@ type BufferStats struct {
 	BatchCount int64
 	RowCount   int64
 	BytesUsed  int64
+	// MemoryBytes and SpilledBytes split BytesUsed into the batches kept in
+	// memory and those written to disk.
+	MemoryBytes  int64
+	SpilledBytes int64
+	// SpillFileBytes is the size of the spill file, after compression.
+	SpillFileBytes int64
 }
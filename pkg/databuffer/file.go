@@ -1,13 +1,16 @@
 package databuffer
 
 import (
+	"bufio"
 	"bytes"
 	"context"
 	"encoding/json"
 	"fmt"
+	"io"
 	"math"
 	"os"
 	"path/filepath"
+	"strconv"
 	"strings"
 	"sync"
 
@@ -17,51 +20,130 @@ import (
 	"github.com/apache/arrow-go/v18/arrow/compute"
 	"github.com/apache/arrow-go/v18/arrow/ipc"
 	"github.com/apache/arrow-go/v18/arrow/memory"
+	"github.com/bruin-data/ingestr/internal/config"
 	"github.com/bruin-data/ingestr/pkg/arrowconv"
 	"github.com/bruin-data/ingestr/pkg/schema"
 	"github.com/bruin-data/ingestr/pkg/schemainfer"
 	"github.com/bruin-data/ingestr/pkg/source"
+	xpmmap "golang.org/x/exp/mmap"
 )
 
-// FileBuffer is a file-backed implementation of DataBuffer.
-// It writes each record batch to a separate Arrow IPC file.
-// When replaying via Reader(), batches are cast to the provided target schema.
+const (
+	// DefaultMemoryLimit is how many bytes of record batches a FileBuffer
+	// keeps in memory before later batches spill to disk.
+	DefaultMemoryLimit int64 = 256 << 20
+
+	spillFileName = "spill.arrows"
+)
+
+// FileBufferOptions configures a FileBuffer.
+type FileBufferOptions struct {
+	// MemoryLimit is how many bytes of record batches are kept in memory.
+	// Zero uses DefaultMemoryLimit, and a negative value spills every batch.
+	MemoryLimit int64
+	// CompressSpill LZ4-compresses the batches written to the spill file.
+	CompressSpill bool
+	// ReplayWorkers is how many batches Reader casts at once. Zero uses
+	// source.DecodeWorkers().
+	ReplayWorkers int
+}
+
+// FileBuffer is a tiered implementation of DataBuffer. Record batches are
+// kept in memory up to a byte budget. Once a batch does not fit, it and every
+// later batch are appended to a single Arrow IPC stream file, so replay keeps
+// the append order. A new stream section starts in that file whenever the
+// batch schema changes. Reader memory-maps the file to replay it.
+// When replaying via Reader(), batches are cast to the provided target schema
+// on several goroutines and sent in append order. Each source schema's cast
+// plan is worked out once per replay.
 type FileBuffer struct {
-	baseDir    string
-	batchFiles []string
-	mu         sync.Mutex
-	closed     bool
-	rowCount   int64
-	batchCount int64
-	bytesUsed  int64
+	baseDir       string
+	memoryLimit   int64
+	compressSpill bool
+	replayWorkers int
+
+	mu           sync.Mutex
+	closed       bool
+	memBatches   []arrow.RecordBatch
+	spilling     bool
+	spill        *spillWriter
+	sections     []spillSection
+	rowCount     int64
+	batchCount   int64
+	bytesUsed    int64
+	memoryBytes  int64
+	spilledBytes int64
 }
 
-// NewFileBuffer creates a new file-backed buffer using a temporary directory.
+// NewFileBuffer creates a new tiered buffer that spills to a temporary
+// directory. INGESTR_BUFFER_MEMORY_LIMIT overrides the memory budget in
+// bytes, INGESTR_BUFFER_SPILL_COMPRESSION=lz4 compresses the spill file and
+// INGESTR_BUFFER_REPLAY_WORKERS sets how many batches Reader casts at once.
 func NewFileBuffer() (*FileBuffer, error) {
 	tmpDir, err := os.MkdirTemp("", "ingestr-buffer-*")
 	if err != nil {
 		return nil, fmt.Errorf("failed to create temp directory: %w", err)
 	}
 
-	return &FileBuffer{
-		baseDir:    tmpDir,
-		batchFiles: make([]string, 0),
-	}, nil
+	return newFileBuffer(tmpDir, fileBufferOptionsFromEnv()), nil
 }
 
 // NewFileBufferWithPath creates a file buffer at a specific directory path.
 func NewFileBufferWithPath(path string) (*FileBuffer, error) {
+	return NewFileBufferWithOptions(path, fileBufferOptionsFromEnv())
+}
+
+// NewFileBufferWithOptions creates a file buffer that spills to the directory
+// at path.
+func NewFileBufferWithOptions(path string, opts FileBufferOptions) (*FileBuffer, error) {
 	if err := os.MkdirAll(path, 0o755); err != nil {
 		return nil, fmt.Errorf("failed to create buffer directory: %w", err)
 	}
 
+	return newFileBuffer(path, opts), nil
+}
+
+func newFileBuffer(path string, opts FileBufferOptions) *FileBuffer {
+	memoryLimit := opts.MemoryLimit
+	if memoryLimit == 0 {
+		memoryLimit = DefaultMemoryLimit
+	}
+
+	replayWorkers := opts.ReplayWorkers
+	if replayWorkers <= 0 {
+		replayWorkers = source.DecodeWorkers()
+	}
+
 	return &FileBuffer{
-		baseDir:    path,
-		batchFiles: make([]string, 0),
-	}, nil
+		baseDir:       path,
+		memoryLimit:   memoryLimit,
+		compressSpill: opts.CompressSpill,
+		replayWorkers: replayWorkers,
+	}
+}
+
+func fileBufferOptionsFromEnv() FileBufferOptions {
+	var opts FileBufferOptions
+	if v := os.Getenv("INGESTR_BUFFER_MEMORY_LIMIT"); v != "" {
+		if n, err := strconv.ParseInt(v, 10, 64); err == nil {
+			opts.MemoryLimit = n
+		} else {
+			config.Debug("[BUFFER] Invalid INGESTR_BUFFER_MEMORY_LIMIT=%q, using the default: %v", v, err)
+		}
+	}
+	opts.CompressSpill = strings.EqualFold(os.Getenv("INGESTR_BUFFER_SPILL_COMPRESSION"), "lz4")
+	if v := os.Getenv("INGESTR_BUFFER_REPLAY_WORKERS"); v != "" {
+		if n, err := strconv.Atoi(v); err == nil && n > 0 {
+			opts.ReplayWorkers = n
+		} else {
+			config.Debug("[BUFFER] Invalid INGESTR_BUFFER_REPLAY_WORKERS=%q, using the default", v)
+		}
+	}
+	return opts
 }
 
-// Append adds a record batch to the buffer by writing it to a separate Arrow IPC file.
+// Append adds a record batch to the buffer. It is kept in memory while it
+// fits in the memory budget and appended to the spill file otherwise.
 func (b *FileBuffer) Append(ctx context.Context, batch arrow.RecordBatch) error {
 	if batch == nil {
 		return nil
@@ -74,49 +156,102 @@ func (b *FileBuffer) Append(ctx context.Context, batch arrow.RecordBatch) error
 		return ErrBufferClosed
 	}
 
-	batchPath := filepath.Join(b.baseDir, fmt.Sprintf("batch_%06d.arrow", b.batchCount))
-	if err := b.writeBatchToFile(batch, batchPath); err != nil {
-		return fmt.Errorf("failed to write batch: %w", err)
+	size := recordBatchBytes(batch)
+	if !b.spilling && b.memoryBytes+size <= b.memoryLimit {
+		batch.Retain()
+		b.memBatches = append(b.memBatches, batch)
+		b.memoryBytes += size
+	} else {
+		b.spilling = true
+		if err := b.spillBatch(batch); err != nil {
+			return fmt.Errorf("failed to write batch: %w", err)
+		}
+		b.spilledBytes += size
 	}
-	b.batchFiles = append(b.batchFiles, batchPath)
 
 	b.rowCount += batch.NumRows()
 	b.batchCount++
+	b.bytesUsed += size
 
-	for i := 0; i < int(batch.NumCols()); i++ {
-		col := batch.Column(i)
-		for _, buf := range col.Data().Buffers() {
-			if buf != nil {
-				b.bytesUsed += int64(buf.Len())
-			}
+	return nil
+}
+
+// spillSection is one Arrow IPC stream in the spill file.
+type spillSection struct {
+	offset int64
+	length int64
+}
+
+// spillWriter appends Arrow IPC stream sections to the spill file and counts
+// the bytes written, so that each section's offset is known.
+type spillWriter struct {
+	file *os.File
+	buf  *bufio.Writer
+	size int64
+
+	// The section being written, if any.
+	writer *ipc.Writer
+	schema *arrow.Schema
+	start  int64
+}
+
+func (w *spillWriter) Write(p []byte) (int, error) {
+	n, err := w.buf.Write(p)
+	w.size += int64(n)
+	return n, err
+}
+
+func (b *FileBuffer) spillBatch(batch arrow.RecordBatch) error {
+	if b.spill == nil {
+		file, err := os.Create(filepath.Join(b.baseDir, spillFileName))
+		if err != nil {
+			return fmt.Errorf("failed to create spill file: %w", err)
+		}
+		b.spill = &spillWriter{file: file, buf: bufio.NewWriterSize(file, 1<<20)}
+	}
+
+	spill := b.spill
+	if spill.writer != nil && !spill.schema.Equal(batch.Schema()) {
+		if err := b.finishSpillSection(); err != nil {
+			return err
 		}
 	}
+	if spill.writer == nil {
+		opts := []ipc.Option{ipc.WithSchema(batch.Schema()), ipc.WithAllocator(memory.DefaultAllocator)}
+		if b.compressSpill {
+			opts = append(opts, ipc.WithLZ4())
+		}
+		spill.writer = ipc.NewWriter(spill, opts...)
+		spill.schema = batch.Schema()
+		spill.start = spill.size
+	}
 
+	if err := spill.writer.Write(batch); err != nil {
+		return fmt.Errorf("failed to write to spill file: %w", err)
+	}
 	return nil
 }
 
-func (b *FileBuffer) writeBatchToFile(batch arrow.RecordBatch, path string) error {
-	f, err := os.Create(path)
-	if err != nil {
-		return fmt.Errorf("failed to create batch file: %w", err)
+// finishSpillSection ends the stream section being written and flushes it
+// to the spill file, so that it can be replayed.
+func (b *FileBuffer) finishSpillSection() error {
+	spill := b.spill
+	if spill == nil || spill.writer == nil {
+		return nil
 	}
-	defer func() { _ = f.Close() }()
 
-	writer, err := ipc.NewFileWriter(
-		f,
-		ipc.WithSchema(batch.Schema()),
-		ipc.WithAllocator(memory.DefaultAllocator),
-	)
-	if err != nil {
-		return fmt.Errorf("failed to create arrow ipc writer: %w", err)
+	err := spill.writer.Close()
+	spill.writer = nil
+	spill.schema = nil
+	if err == nil {
+		err = spill.buf.Flush()
 	}
-
-	if err := writer.Write(batch); err != nil {
-		_ = writer.Close()
-		return fmt.Errorf("failed to write batch: %w", err)
+	if err != nil {
+		return fmt.Errorf("failed to finish spill file section: %w", err)
 	}
 
-	return writer.Close()
+	b.sections = append(b.sections, spillSection{offset: spill.start, length: spill.size - spill.start})
+	return nil
 }
 
 // Reader returns a channel that replays all buffered batches, cast to the target schema.
@@ -134,113 +269,302 @@ func (b *FileBuffer) Reader(ctx context.Context, targetSchema *arrow.Schema) (<-
 		return out, nil
 	}
 
+	if err := b.finishSpillSection(); err != nil {
+		return nil, err
+	}
+
 	out := make(chan source.RecordBatchResult, 10)
-	batchFiles := make([]string, len(b.batchFiles))
-	copy(batchFiles, b.batchFiles)
+	memBatches := make([]arrow.RecordBatch, len(b.memBatches))
+	for i, batch := range b.memBatches {
+		batch.Retain()
+		memBatches[i] = batch
+	}
+	sections := make([]spillSection, len(b.sections))
+	copy(sections, b.sections)
+	spillPath := filepath.Join(b.baseDir, spillFileName)
+	workers := b.replayWorkers
 
 	go func() {
 		defer close(out)
-
-		for _, batchPath := range batchFiles {
-			record, err := b.readAndCastBatch(batchPath, targetSchema)
-			if err != nil {
-				out <- source.RecordBatchResult{Err: fmt.Errorf("failed to read batch %s: %w", batchPath, err)}
-				return
+		replayCtx, cancel := context.WithCancel(ctx)
+		defer cancel()
+
+		casts := make(chan func() (arrow.RecordBatch, error))
+		go func() {
+			defer close(casts)
+			queueReplay(replayCtx, memBatches, spillPath, sections, newCastPlans(targetSchema), casts)
+		}()
+
+		batchNum := 0
+		for result := range source.DecodeInOrder(replayCtx, casts, workers) {
+			if replayCtx.Err() != nil {
+				if result.Batch != nil {
+					result.Batch.Release()
+				}
+				continue
+			}
+			if result.Err != nil {
+				select {
+				case out <- source.RecordBatchResult{Err: fmt.Errorf("failed to read batch %d: %w", batchNum, result.Err)}:
+				case <-ctx.Done():
+				}
+				cancel()
+				continue
 			}
-
 			select {
-			case out <- source.RecordBatchResult{Batch: record}:
+			case out <- source.RecordBatchResult{Batch: result.Batch}:
 			case <-ctx.Done():
-				record.Release()
-				return
+				result.Batch.Release()
+				cancel()
 			}
+			batchNum++
 		}
 	}()
 
 	return out, nil
 }
 
-func (b *FileBuffer) readAndCastBatch(path string, targetSchema *arrow.Schema) (arrow.RecordBatch, error) {
-	file, err := os.Open(path)
-	if err != nil {
-		return nil, fmt.Errorf("failed to open batch file: %w", err)
+// queueReplay sends casts one function per buffered batch, in append order,
+// that casts the batch with plans. The memory batches are released by their
+// function, or here when ctx is cancelled before it is sent. The spill file
+// sections are memory-mapped and read here.
+func queueReplay(
+	ctx context.Context,
+	memBatches []arrow.RecordBatch,
+	spillPath string,
+	sections []spillSection,
+	plans *castPlans,
+	casts chan<- func() (arrow.RecordBatch, error),
+) {
+	queue := func(batch arrow.RecordBatch) bool {
+		cast := func() (arrow.RecordBatch, error) {
+			defer batch.Release()
+			return plans.cast(batch)
+		}
+		select {
+		case casts <- cast:
+			return true
+		case <-ctx.Done():
+			batch.Release()
+			return false
+		}
 	}
-	defer func() { _ = file.Close() }()
-
-	reader, err := ipc.NewFileReader(file, ipc.WithAllocator(memory.DefaultAllocator), ipc.WithBodySizeLimit(0))
-	if err != nil {
-		return nil, fmt.Errorf("failed to create arrow reader: %w", err)
+	fail := func(err error) {
+		select {
+		case casts <- func() (arrow.RecordBatch, error) { return nil, err }:
+		case <-ctx.Done():
+		}
 	}
-	defer func() { _ = reader.Close() }()
 
-	if reader.NumRecords() == 0 {
-		return nil, fmt.Errorf("empty batch file")
+	for i, batch := range memBatches {
+		if !queue(batch) {
+			for _, rest := range memBatches[i+1:] {
+				rest.Release()
+			}
+			return
+		}
+	}
+	if len(sections) == 0 {
+		return
 	}
 
-	record, err := reader.RecordBatch(0)
+	mapped, err := xpmmap.Open(spillPath)
 	if err != nil {
-		return nil, fmt.Errorf("failed to read record: %w", err)
+		fail(fmt.Errorf("failed to open spill file: %w", err))
+		return
+	}
+	// The IPC reader copies each message out of the mapping, so batches
+	// stay valid after it is unmapped.
+	defer func() { _ = mapped.Close() }()
+
+	for _, section := range sections {
+		reader, err := ipc.NewReader(
+			io.NewSectionReader(mapped, section.offset, section.length),
+			ipc.WithAllocator(memory.DefaultAllocator),
+		)
+		if err != nil {
+			fail(fmt.Errorf("failed to read spill file section: %w", err))
+			return
+		}
+
+		for reader.Next() {
+			record := reader.RecordBatch()
+			record.Retain()
+			if !queue(record) {
+				reader.Release()
+				return
+			}
+		}
+		err = reader.Err()
+		reader.Release()
+		if err != nil {
+			fail(err)
+			return
+		}
 	}
+}
 
-	if record.Schema().Equal(targetSchema) {
-		record.Retain()
-		return record, nil
+// recordBatchBytes returns the size of the buffers behind batch, including
+// those of child and dictionary arrays.
+func recordBatchBytes(batch arrow.RecordBatch) int64 {
+	var size int64
+	for _, column := range batch.Columns() {
+		size += arrayDataBytes(column.Data())
 	}
+	return size
+}
 
-	return CastRecordToSchema(record, targetSchema, true)
+func arrayDataBytes(data arrow.ArrayData) int64 {
+	var size int64
+	for _, buf := range data.Buffers() {
+		if buf != nil {
+			size += int64(buf.Len())
+		}
+	}
+	for _, child := range data.Children() {
+		size += arrayDataBytes(child)
+	}
+	if dictionary := data.Dictionary(); dictionary != nil {
+		size += arrayDataBytes(dictionary)
+	}
+	return size
 }
 
 // CastRecordToSchema creates a new record with the target schema, casting columns as needed.
 // When safe is false, lossy conversions (e.g. decimal → int64) are allowed to match
 // the behavior of user-specified column type overrides.
 func CastRecordToSchema(record arrow.RecordBatch, targetSchema *arrow.Schema, safe bool) (arrow.RecordBatch, error) {
-	mem := memory.DefaultAllocator
-	numRows := record.NumRows()
+	return newCastPlan(record.Schema(), targetSchema, safe).apply(context.Background(), record)
+}
 
-	existingCols := make(map[string]arrow.Array)
-	for i := 0; i < int(record.NumCols()); i++ {
-		existingCols[strings.ToLower(record.Schema().Field(i).Name)] = record.Column(i)
+// castPlan casts record batches of one schema to another. Which source column
+// fills each target column, and how its values are cast, is worked out once,
+// so batches of the same schema only run the casts.
+type castPlan struct {
+	source   *arrow.Schema
+	target   *arrow.Schema
+	identity bool
+	columns  []columnCast
+}
+
+// columnCast fills a target column from the source column at index, or with
+// nulls when index is -1. cast is nil when the column types already match.
+type columnCast struct {
+	index int
+	cast  arrayCast
+}
+
+func newCastPlan(sourceSchema, targetSchema *arrow.Schema, safe bool) *castPlan {
+	indices := make(map[string]int, sourceSchema.NumFields())
+	for i := 0; i < sourceSchema.NumFields(); i++ {
+		indices[strings.ToLower(sourceSchema.Field(i).Name)] = i
 	}
 
-	cols := make([]arrow.Array, targetSchema.NumFields())
+	columns := make([]columnCast, targetSchema.NumFields())
 	for i := 0; i < targetSchema.NumFields(); i++ {
 		field := targetSchema.Field(i)
-		existingCol, ok := existingCols[strings.ToLower(field.Name)]
+		index, ok := indices[strings.ToLower(field.Name)]
 		if !ok {
-			nullArray, err := makeNullArray(mem, field.Type, int(numRows))
+			columns[i] = columnCast{index: -1}
+			continue
+		}
+		columns[i] = columnCast{index: index}
+		if from := sourceSchema.Field(index).Type; !arrow.TypeEqual(from, field.Type) {
+			columns[i].cast = planArrayCast(from, field.Type, safe)
+		}
+	}
+
+	return &castPlan{
+		source:   sourceSchema,
+		target:   targetSchema,
+		identity: sourceSchema.Equal(targetSchema),
+		columns:  columns,
+	}
+}
+
+// apply casts record, which must have the plan's source schema.
+func (p *castPlan) apply(ctx context.Context, record arrow.RecordBatch) (arrow.RecordBatch, error) {
+	numRows := record.NumRows()
+	cols := make([]arrow.Array, len(p.columns))
+	release := func(n int) {
+		for _, col := range cols[:n] {
+			col.Release()
+		}
+	}
+
+	for i, column := range p.columns {
+		field := p.target.Field(i)
+		switch {
+		case column.index < 0:
+			nullArray, err := makeNullArray(memory.DefaultAllocator, field.Type, int(numRows))
 			if err != nil {
-				for j := 0; j < i; j++ {
-					cols[j].Release()
-				}
+				release(i)
 				return nil, fmt.Errorf("failed to create null array for field %s: %w", field.Name, err)
 			}
 			cols[i] = nullArray
-			continue
-		}
-
-		if arrow.TypeEqual(existingCol.DataType(), field.Type) {
+		case column.cast == nil:
+			existingCol := record.Column(column.index)
 			existingCol.Retain()
 			cols[i] = existingCol
-			continue
-		}
-
-		casted, err := castArrayToType(context.Background(), existingCol, field.Type, safe)
-		if err != nil {
-			for j := 0; j < i; j++ {
-				cols[j].Release()
+		default:
+			existingCol := record.Column(column.index)
+			casted, err := column.cast(ctx, existingCol)
+			if err != nil {
+				release(i)
+				return nil, fmt.Errorf("failed to cast field %s from %s to %s: %w",
+					field.Name, existingCol.DataType(), field.Type, err)
 			}
-			return nil, fmt.Errorf("failed to cast field %s from %s to %s: %w", field.Name, existingCol.DataType(), field.Type, err)
+			cols[i] = casted
 		}
-		cols[i] = casted
 	}
 
-	result := array.NewRecordBatch(targetSchema, cols, numRows)
+	result := array.NewRecordBatch(p.target, cols, numRows)
+	release(len(cols))
+	return result, nil
+}
+
+// castPlans caches the plans that cast each source schema seen during a
+// replay to one target schema. It is safe for concurrent use.
+type castPlans struct {
+	target *arrow.Schema
+
+	mu    sync.Mutex
+	plans []*castPlan
+}
+
+func newCastPlans(targetSchema *arrow.Schema) *castPlans {
+	return &castPlans{target: targetSchema}
+}
 
-	for _, col := range cols {
-		col.Release()
+// cast returns record cast to the target schema, or record itself, retained,
+// when it already has that schema.
+func (c *castPlans) cast(record arrow.RecordBatch) (arrow.RecordBatch, error) {
+	plan := c.plan(record.Schema())
+	if plan.identity {
+		record.Retain()
+		return record, nil
 	}
+	return plan.apply(context.Background(), record)
+}
 
-	return result, nil
+func (c *castPlans) plan(sourceSchema *arrow.Schema) *castPlan {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+
+	// Batches of one source or spill section usually share a schema pointer.
+	for _, plan := range c.plans {
+		if plan.source == sourceSchema {
+			return plan
+		}
+	}
+	for _, plan := range c.plans {
+		if plan.source.Equal(sourceSchema) {
+			return plan
+		}
+	}
+	plan := newCastPlan(sourceSchema, c.target, true)
+	c.plans = append(c.plans, plan)
+	return plan
 }
 
 func makeNullArray(mem memory.Allocator, dt arrow.DataType, length int) (arrow.Array, error) {
@@ -251,53 +575,88 @@ func makeNullArray(mem memory.Allocator, dt arrow.DataType, length int) (arrow.A
 	return builder.NewArray(), nil
 }
 
-func castArrayToType(ctx context.Context, arr arrow.Array, target arrow.DataType, safe bool) (arrow.Array, error) {
-	if arrow.TypeEqual(arr.DataType(), target) {
-		arr.Retain()
-		return arr, nil
-	}
+// arrayCast casts an array of the type it was planned for.
+type arrayCast func(ctx context.Context, arr arrow.Array) (arrow.Array, error)
 
-	arr, releaseArr, err := normalizeArrayOffset(arr)
-	if err != nil {
-		return nil, err
-	}
-	if releaseArr {
-		defer arr.Release()
-	}
-
-	if isUnknownType(arr.DataType()) {
-		return castUnknownArray(arr, target)
-	}
-	if target.ID() == arrow.LIST {
-		if values, ok := arr.(array.VarLenListLike); ok {
-			return castVariableListToList(ctx, values, target.(*arrow.ListType), safe)
+// planArrayCast picks how arrays of type from are cast to target.
+func planArrayCast(from, target arrow.DataType, safe bool) arrayCast {
+	if arrow.TypeEqual(from, target) {
+		return func(_ context.Context, arr arrow.Array) (arrow.Array, error) {
+			arr.Retain()
+			return arr, nil
 		}
 	}
 
-	if isJSONType(target) {
-		return castArrayToJSON(arr, target)
-	}
-
-	if isJSONType(arr.DataType()) && target.ID() == arrow.STRING {
-		if ext, ok := arr.(array.ExtensionArray); ok {
-			storage := ext.Storage()
-			storage.Retain()
-			return storage, nil
+	var cast arrayCast
+	switch {
+	case isUnknownType(from):
+		cast = func(_ context.Context, arr arrow.Array) (arrow.Array, error) {
+			return castUnknownArray(arr, target)
+		}
+	case target.ID() == arrow.LIST:
+		listType := target.(*arrow.ListType)
+		// The list values of arrays of one type share a type, so their cast
+		// is planned on the first array.
+		var planValues sync.Once
+		var castValues arrayCast
+		cast = func(ctx context.Context, arr arrow.Array) (arrow.Array, error) {
+			values, ok := arr.(array.VarLenListLike)
+			if !ok {
+				return castWithCompute(ctx, arr, target, safe)
+			}
+			planValues.Do(func() {
+				castValues = planArrayCast(values.ListValues().DataType(), listType.Elem(), safe)
+			})
+			return castVariableListToList(ctx, values, listType, castValues)
+		}
+	case isJSONType(target):
+		cast = func(_ context.Context, arr arrow.Array) (arrow.Array, error) {
+			return castArrayToJSON(arr, target)
+		}
+	case isJSONType(from) && target.ID() == arrow.STRING:
+		cast = func(ctx context.Context, arr arrow.Array) (arrow.Array, error) {
+			if ext, ok := arr.(array.ExtensionArray); ok {
+				storage := ext.Storage()
+				storage.Retain()
+				return storage, nil
+			}
+			return castWithCompute(ctx, arr, target, safe)
+		}
+	case target.ID() == arrow.TIMESTAMP && arrowconv.IsNumeric(from):
+		// For numeric → timestamp, cast to string first so the string→timestamp
+		// path can detect the unit via dateparse (seconds vs milliseconds vs micros).
+		cast = func(ctx context.Context, arr arrow.Array) (arrow.Array, error) {
+			strArr, err := compute.CastArray(ctx, arr, compute.SafeCastOptions(arrow.BinaryTypes.String))
+			if err == nil {
+				result, err := castStringArrayViaAppendValue(strArr, target)
+				strArr.Release()
+				return result, err
+			}
+			return castWithCompute(ctx, arr, target, safe)
+		}
+	default:
+		cast = func(ctx context.Context, arr arrow.Array) (arrow.Array, error) {
+			return castWithCompute(ctx, arr, target, safe)
 		}
 	}
 
-	// For numeric → timestamp, cast to string first so the string→timestamp
-	// path can detect the unit via dateparse (seconds vs milliseconds vs micros).
-	if target.ID() == arrow.TIMESTAMP && arrowconv.IsNumeric(arr.DataType()) {
-		strArr, err := compute.CastArray(ctx, arr, compute.SafeCastOptions(arrow.BinaryTypes.String))
-		if err == nil {
-			result, err := castStringArrayViaAppendValue(strArr, target)
-			strArr.Release()
-			return result, err
+	return func(ctx context.Context, arr arrow.Array) (arrow.Array, error) {
+		arr, releaseArr, err := normalizeArrayOffset(arr)
+		if err != nil {
+			return nil, err
 		}
+		if releaseArr {
+			defer arr.Release()
+		}
+		return cast(ctx, arr)
 	}
+}
 
+// castWithCompute casts arr with the Arrow compute kernels, falling back to
+// formatting or parsing values one by one for string sources and targets.
+func castWithCompute(ctx context.Context, arr arrow.Array, target arrow.DataType, safe bool) (arrow.Array, error) {
 	var casted arrow.Array
+	var err error
 	if safe {
 		casted, err = compute.CastArray(ctx, arr, compute.SafeCastOptions(target))
 	} else if (arr.DataType().ID() == arrow.DECIMAL128 || arr.DataType().ID() == arrow.DECIMAL256) && isIntegerType(target) {
@@ -330,7 +689,12 @@ func castArrayToType(ctx context.Context, arr arrow.Array, target arrow.DataType
 	return nil, err
 }
 
-func castVariableListToList(ctx context.Context, values array.VarLenListLike, target *arrow.ListType, safe bool) (arrow.Array, error) {
+func castVariableListToList(
+	ctx context.Context,
+	values array.VarLenListLike,
+	target *arrow.ListType,
+	castValues arrayCast,
+) (arrow.Array, error) {
 	validity := make([]byte, bitutil.BytesForBits(int64(values.Len())))
 	offsets := make([]int32, values.Len()+1)
 	slices := make([]arrow.Array, 0, values.Len())
@@ -375,7 +739,7 @@ func castVariableListToList(ctx context.Context, values array.VarLenListLike, ta
 		}
 	}
 	defer flattened.Release()
-	castedValues, err := castArrayToType(ctx, flattened, target.Elem(), safe)
+	castedValues, err := castValues(ctx, flattened)
 	if err != nil {
 		return nil, fmt.Errorf("failed to cast list values from %s to %s: %w", flattened.DataType(), target.Elem(), err)
 	}
@@ -769,6 +1133,19 @@ func (b *FileBuffer) Close() error {
 		return nil
 	}
 
+	for _, batch := range b.memBatches {
+		batch.Release()
+	}
+	b.memBatches = nil
+
+	if b.spill != nil {
+		if b.spill.writer != nil {
+			_ = b.spill.writer.Close()
+		}
+		_ = b.spill.file.Close()
+		b.spill = nil
+	}
+
 	if b.baseDir != "" {
 		_ = os.RemoveAll(b.baseDir)
 	}
@@ -782,10 +1159,18 @@ func (b *FileBuffer) Stats() BufferStats {
 	b.mu.Lock()
 	defer b.mu.Unlock()
 
+	var spillFileBytes int64
+	if b.spill != nil {
+		spillFileBytes = b.spill.size
+	}
+
 	return BufferStats{
-		BatchCount: b.batchCount,
-		RowCount:   b.rowCount,
-		BytesUsed:  b.bytesUsed,
+		BatchCount:     b.batchCount,
+		RowCount:       b.rowCount,
+		BytesUsed:      b.bytesUsed,
+		MemoryBytes:    b.memoryBytes,
+		SpilledBytes:   b.spilledBytes,
+		SpillFileBytes: spillFileBytes,
 	}
 }
 
@@ -114,7 +114,8 @@ func TestNewFileBuffer(t *testing.T) {
 		require.NoError(t, err)
 		defer func() { _ = buf.Close() }()
 
-		assert.Empty(t, buf.batchFiles)
+		assert.Empty(t, buf.memBatches)
+		assert.Nil(t, buf.spill)
 		assert.False(t, buf.closed)
 
 		stats := buf.Stats()
@@ -200,7 +201,7 @@ func TestFileBuffer_Append(t *testing.T) {
 		assert.Greater(t, stats.BytesUsed, int64(0))
 	})
 
-	t.Run("creates batch file on disk", func(t *testing.T) {
+	t.Run("keeps batches within the memory limit in memory", func(t *testing.T) {
 		buf, err := NewFileBuffer()
 		require.NoError(t, err)
 		defer func() { _ = buf.Close() }()
@@ -211,10 +212,34 @@ func TestFileBuffer_Append(t *testing.T) {
 		err = buf.Append(context.Background(), batch)
 		require.NoError(t, err)
 
-		expectedPath := filepath.Join(buf.baseDir, "batch_000000.arrow")
-		assert.FileExists(t, expectedPath)
-		assert.Len(t, buf.batchFiles, 1)
-		assert.Equal(t, expectedPath, buf.batchFiles[0])
+		assert.Len(t, buf.memBatches, 1)
+		assert.NoFileExists(t, filepath.Join(buf.baseDir, spillFileName))
+
+		stats := buf.Stats()
+		assert.Equal(t, stats.BytesUsed, stats.MemoryBytes)
+		assert.Zero(t, stats.SpilledBytes)
+	})
+
+	t.Run("spills batches past the memory limit to one file", func(t *testing.T) {
+		batch := makeSimpleBatch(t, simpleSchema, 5)
+		defer batch.Release()
+
+		buf, err := NewFileBufferWithOptions(t.TempDir(), FileBufferOptions{MemoryLimit: recordBatchBytes(batch) * 2})
+		require.NoError(t, err)
+		defer func() { _ = buf.Close() }()
+
+		for i := 0; i < 5; i++ {
+			require.NoError(t, buf.Append(context.Background(), batch))
+		}
+
+		assert.Len(t, buf.memBatches, 2)
+		assert.FileExists(t, filepath.Join(buf.baseDir, spillFileName))
+
+		stats := buf.Stats()
+		assert.Equal(t, recordBatchBytes(batch)*2, stats.MemoryBytes)
+		assert.Equal(t, recordBatchBytes(batch)*3, stats.SpilledBytes)
+		assert.Equal(t, stats.BytesUsed, stats.MemoryBytes+stats.SpilledBytes)
+		assert.Greater(t, stats.SpillFileBytes, int64(0))
 	})
 
 	t.Run("accumulates multiple batches", func(t *testing.T) {
@@ -232,7 +257,7 @@ func TestFileBuffer_Append(t *testing.T) {
 		stats := buf.Stats()
 		assert.Equal(t, int64(3), stats.BatchCount)
 		assert.Equal(t, int64(15), stats.RowCount)
-		assert.Len(t, buf.batchFiles, 3)
+		assert.Len(t, buf.memBatches, 3)
 	})
 }
 
@@ -1566,6 +1591,182 @@ func TestMakeNullArray(t *testing.T) {
 	}
 }
 
+// ============================================================================
+// Spill Tests
+// ============================================================================
+
+func TestFileBuffer_ReplaysMemoryAndSpilledBatchesInOrder(t *testing.T) {
+	narrow := arrow.NewSchema([]arrow.Field{
+		{Name: "id", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
+	}, nil)
+	wide := arrow.NewSchema([]arrow.Field{
+		{Name: "id", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
+		{Name: "name", Type: arrow.BinaryTypes.String, Nullable: true},
+	}, nil)
+
+	for _, tc := range []struct {
+		name     string
+		compress bool
+	}{
+		{name: "uncompressed"},
+		{name: "lz4", compress: true},
+	} {
+		t.Run(tc.name, func(t *testing.T) {
+			first := makeSimpleBatch(t, narrow, 10)
+			defer first.Release()
+
+			buf, err := NewFileBufferWithOptions(t.TempDir(), FileBufferOptions{
+				MemoryLimit:   recordBatchBytes(first),
+				CompressSpill: tc.compress,
+				ReplayWorkers: 4,
+			})
+			require.NoError(t, err)
+			defer func() { _ = buf.Close() }()
+
+			// The first batch stays in memory. The rest spill, in three stream
+			// sections as the schema changes twice.
+			rows := []int{10, 11, 12, 13, 14}
+			schemas := []*arrow.Schema{narrow, narrow, wide, wide, narrow}
+			require.NoError(t, buf.Append(context.Background(), first))
+			for i := 1; i < len(rows); i++ {
+				batch := makeSimpleBatch(t, schemas[i], rows[i])
+				require.NoError(t, buf.Append(context.Background(), batch))
+				batch.Release()
+			}
+
+			ch, err := buf.Reader(context.Background(), wide)
+			require.NoError(t, err)
+			batches := readAllBatches(t, ch)
+			defer releaseBatches(batches)
+
+			require.Len(t, buf.sections, 3)
+			require.Len(t, batches, len(rows))
+			for i, batch := range batches {
+				assert.Equal(t, int64(rows[i]), batch.NumRows())
+				assert.True(t, batch.Schema().Equal(wide))
+			}
+
+			stats := buf.Stats()
+			assert.Equal(t, recordBatchBytes(first), stats.MemoryBytes)
+			assert.Equal(t, stats.BytesUsed-stats.MemoryBytes, stats.SpilledBytes)
+
+			// Batches appended after a replay are replayed by the next one.
+			batch := makeSimpleBatch(t, narrow, 15)
+			require.NoError(t, buf.Append(context.Background(), batch))
+			batch.Release()
+
+			ch, err = buf.Reader(context.Background(), wide)
+			require.NoError(t, err)
+			again := readAllBatches(t, ch)
+			defer releaseBatches(again)
+			require.Len(t, again, len(rows)+1)
+			assert.Equal(t, int64(15), again[len(rows)].NumRows())
+		})
+	}
+}
+
+func TestFileBuffer_ParallelReplayKeepsAppendOrder(t *testing.T) {
+	int32IDs := arrow.NewSchema([]arrow.Field{
+		{Name: "ID", Type: arrow.PrimitiveTypes.Int32, Nullable: false},
+	}, nil)
+	target := arrow.NewSchema([]arrow.Field{
+		{Name: "id", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
+		{Name: "note", Type: arrow.BinaryTypes.String, Nullable: true},
+	}, nil)
+
+	const batches, rows = 64, 100
+	makeBatch := func(first int) arrow.RecordBatch {
+		builder := array.NewInt32Builder(memory.DefaultAllocator)
+		defer builder.Release()
+		for id := first; id < first+rows; id++ {
+			builder.Append(int32(id))
+		}
+		ids := builder.NewArray()
+		defer ids.Release()
+		return array.NewRecordBatch(int32IDs, []arrow.Array{ids}, rows)
+	}
+
+	first := makeBatch(0)
+	buf, err := NewFileBufferWithOptions(t.TempDir(), FileBufferOptions{
+		// Half of the batches stay in memory and the rest spill.
+		MemoryLimit:   recordBatchBytes(first) * batches / 2,
+		ReplayWorkers: 8,
+	})
+	require.NoError(t, err)
+	defer func() { _ = buf.Close() }()
+
+	require.NoError(t, buf.Append(context.Background(), first))
+	first.Release()
+	for i := 1; i < batches; i++ {
+		batch := makeBatch(i * rows)
+		require.NoError(t, buf.Append(context.Background(), batch))
+		batch.Release()
+	}
+	require.Positive(t, buf.Stats().SpilledBytes)
+
+	ch, err := buf.Reader(context.Background(), target)
+	require.NoError(t, err)
+	replayed := readAllBatches(t, ch)
+	defer releaseBatches(replayed)
+
+	require.Len(t, replayed, batches)
+	next := int64(0)
+	for _, batch := range replayed {
+		require.True(t, batch.Schema().Equal(target))
+		ids := batch.Column(0).(*array.Int64)
+		for i := 0; i < ids.Len(); i++ {
+			require.Equal(t, next, ids.Value(i))
+			next++
+		}
+		assert.Equal(t, batch.NumRows(), int64(batch.Column(1).NullN()))
+	}
+}
+
+func TestCastPlans_ReusesPlanPerSourceSchema(t *testing.T) {
+	t.Parallel()
+
+	newSource := func() *arrow.Schema {
+		return arrow.NewSchema([]arrow.Field{
+			{Name: "id", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
+			{Name: "score", Type: arrow.PrimitiveTypes.Float64, Nullable: false},
+		}, nil)
+	}
+	target := arrow.NewSchema([]arrow.Field{
+		{Name: "score", Type: arrow.BinaryTypes.String, Nullable: true},
+		{Name: "id", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
+		{Name: "missing", Type: arrow.FixedWidthTypes.Boolean, Nullable: true},
+	}, nil)
+
+	plans := newCastPlans(target)
+	var results []arrow.RecordBatch
+	defer func() { releaseBatches(results) }()
+
+	// Equal schemas share a plan even when they are different values.
+	for _, sourceSchema := range []*arrow.Schema{newSource(), newSource()} {
+		batch := makeSimpleBatch(t, sourceSchema, 5)
+		casted, err := plans.cast(batch)
+		require.NoError(t, err)
+		expected, err := CastRecordToSchema(batch, target, true)
+		require.NoError(t, err)
+		batch.Release()
+		results = append(results, casted, expected)
+
+		assert.True(t, array.RecordEqual(expected, casted))
+	}
+	require.Len(t, plans.plans, 1)
+	assert.False(t, plans.plans[0].identity)
+
+	// A batch that already has the target schema is passed through.
+	batch := makeSimpleBatch(t, target, 3)
+	defer batch.Release()
+	same, err := plans.cast(batch)
+	require.NoError(t, err)
+	defer same.Release()
+	assert.Same(t, batch, same)
+	require.Len(t, plans.plans, 2)
+	assert.True(t, plans.plans[1].identity)
+}
+
 // ============================================================================
 // Close Tests
 // ============================================================================
@@ -1584,8 +1785,8 @@ func TestFileBuffer_Close(t *testing.T) {
 		assert.NoDirExists(t, tmpDir)
 	})
 
-	t.Run("removes batch files", func(t *testing.T) {
-		buf, err := NewFileBuffer()
+	t.Run("removes spill file", func(t *testing.T) {
+		buf, err := NewFileBufferWithOptions(filepath.Join(t.TempDir(), "buffer"), FileBufferOptions{MemoryLimit: -1})
 		require.NoError(t, err)
 
 		schema := arrow.NewSchema([]arrow.Field{
@@ -1597,13 +1798,13 @@ func TestFileBuffer_Close(t *testing.T) {
 		batch.Release()
 		require.NoError(t, err)
 
-		batchFile := buf.batchFiles[0]
-		assert.FileExists(t, batchFile)
+		spillFile := filepath.Join(buf.baseDir, spillFileName)
+		assert.FileExists(t, spillFile)
 
 		err = buf.Close()
 		require.NoError(t, err)
 
-		assert.NoFileExists(t, batchFile)
+		assert.NoFileExists(t, spillFile)
 	})
 
 	t.Run("is idempotent", func(t *testing.T) {
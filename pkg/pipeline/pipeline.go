@@ -67,6 +67,7 @@ type Pipeline struct {
 	droppedColumns           map[string]bool // columns dropped during schema inference (all-null nullable)
 	logWriter                io.Writer
 	cdcConnectorID           string
+	sharedDest               bool // dest was set by SetDestination and is owned by the caller
 }
 
 func New(cfg *config.IngestConfig) *Pipeline {
@@ -79,6 +80,20 @@ func (p *Pipeline) SetLogWriter(w io.Writer) {
 	p.logWriter = w
 }
 
+// SetSource makes Run use src instead of looking the source up from the
+// configured URI. Run still connects and closes it.
+func (p *Pipeline) SetSource(src source.Source) {
+	p.src = src
+}
+
+// SetDestination makes Run use dest, which must already be connected to the
+// configured destination URI, instead of opening a new connection. The caller
+// owns dest: Run does not close it, so it can be reused across runs.
+func (p *Pipeline) SetDestination(dest destination.Destination) {
+	p.dest = dest
+	p.sharedDest = true
+}
+
 func (p *Pipeline) Run(ctx context.Context) (retErr error) {
 	// Parse query annotations once and carry the base payload on the context.
 	// Destinations read it (plus a per-operation step) to annotate queries for
@@ -95,11 +110,14 @@ func (p *Pipeline) Run(ctx context.Context) (retErr error) {
 		return err
 	}
 
-	src, err := uri.DefaultRegistry.GetSource(p.config.SourceURI)
-	if err != nil {
-		return fmt.Errorf("failed to get source: %w", err)
+	src := p.src
+	if src == nil {
+		src, err = uri.DefaultRegistry.GetSource(p.config.SourceURI)
+		if err != nil {
+			return fmt.Errorf("failed to get source: %w", err)
+		}
+		p.src = src
 	}
-	p.src = src
 
 	if err := src.Connect(ctx, p.config.SourceURI); err != nil {
 		return fmt.Errorf("failed to connect to source: %w", err)
@@ -141,22 +159,25 @@ func (p *Pipeline) Run(ctx context.Context) (retErr error) {
 		}
 	}
 
-	dest, err := uri.DefaultRegistry.GetDestination(p.config.DestURI)
-	if err != nil {
-		return fmt.Errorf("failed to get destination: %w", err)
-	}
-	p.dest = dest
+	dest := p.dest
+	if !p.sharedDest {
+		dest, err = uri.DefaultRegistry.GetDestination(p.config.DestURI)
+		if err != nil {
+			return fmt.Errorf("failed to get destination: %w", err)
+		}
+		p.dest = dest
 
-	if err := dest.Connect(ctx, p.config.DestURI); err != nil {
-		return fmt.Errorf("failed to connect to destination: %w", err)
-	}
-	defer func() {
-		closeCtx, cancel := resourceCloseContext(cleanupBaseCtx)
-		defer cancel()
-		if err := dest.Close(closeCtx); err != nil {
-			retErr = errors.Join(retErr, fmt.Errorf("failed to close destination: %w", err))
+		if err := dest.Connect(ctx, p.config.DestURI); err != nil {
+			return fmt.Errorf("failed to connect to destination: %w", err)
 		}
-	}()
+		defer func() {
+			closeCtx, cancel := resourceCloseContext(cleanupBaseCtx)
+			defer cancel()
+			if err := dest.Close(closeCtx); err != nil {
+				retErr = errors.Join(retErr, fmt.Errorf("failed to close destination: %w", err))
+			}
+		}()
+	}
 
 	managedPostgresCDC := isPostgresCDCSource(p.config.SourceURI)
 	managedMySQLCDC := isMySQLCDCSource(p.config.SourceURI)
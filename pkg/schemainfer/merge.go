@@ -303,6 +303,13 @@ func ArrowFieldToColumn(name string, dt arrow.DataType, nullable bool) schema.Co
 		col.ArrayType = elemCol.DataType
 	case arrow.FIXED_SIZE_LIST, arrow.STRUCT, arrow.MAP:
 		col.DataType = schema.TypeJSON
+	case arrow.DICTIONARY:
+		// Dictionary-encoded columns are decoded by the sources that read
+		// them, so they take the type of their values.
+		if dictType, ok := dt.(*arrow.DictionaryType); ok {
+			return ArrowFieldToColumn(name, dictType.ValueType, nullable)
+		}
+		col.DataType = schema.TypeString
 	case arrow.EXTENSION:
 		// Check if it's a JSON extension type
 		if isJSONType(dt) {
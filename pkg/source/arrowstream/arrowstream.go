@@ -1,17 +1,17 @@
 package arrowstream
 
 import (
+	"bufio"
 	"context"
 	"fmt"
 	"io"
+	"net/url"
 	"os"
 	"strings"
 	"sync"
 
 	"github.com/apache/arrow-go/v18/arrow"
 	"github.com/apache/arrow-go/v18/arrow/array"
-	"github.com/apache/arrow-go/v18/arrow/ipc"
-	"github.com/apache/arrow-go/v18/arrow/memory"
 	"github.com/bruin-data/ingestr/internal/config"
 	"github.com/bruin-data/ingestr/pkg/schema"
 	"github.com/bruin-data/ingestr/pkg/schemainfer"
@@ -20,10 +20,22 @@ import (
 
 type ArrowStreamSource struct {
 	input       io.Reader
-	reader      *ipc.Reader
+	reader      recordReader
 	knownSchema *schema.TableSchema
 	mu          sync.Mutex
 	readStarted bool
+
+	// Set by arrow-stream://-?multi_table=true; see multitable.go.
+	multiTable   bool
+	frames       *bufio.Reader
+	tables       []source.SourceTableInfo
+	tableSchemas []*arrow.Schema
+
+	// Set by the unix, tcp and flight listener URIs; see listener.go.
+	listener          producerListener
+	expectedProducers int
+	firstProducer     *openProducer
+	listenSchema      *arrow.Schema
 }
 
 func NewArrowStreamSource() *ArrowStreamSource {
@@ -39,24 +51,32 @@ func (s *ArrowStreamSource) Schemes() []string {
 }
 
 func (s *ArrowStreamSource) Connect(ctx context.Context, uri string) error {
-	target := extractStreamTarget(uri)
+	target, rawQuery, _ := strings.Cut(extractStreamTarget(uri), "?")
+	params, err := url.ParseQuery(rawQuery)
+	if err != nil {
+		return fmt.Errorf("invalid arrow stream URI %q: %w", uri, err)
+	}
+	if listenTarget(target) {
+		return s.connectListener(ctx, target, params)
+	}
 	if target != "-" && target != "stdin" {
-		return fmt.Errorf("invalid arrow stream URI %q: only arrow-stream://- is supported", uri)
+		return fmt.Errorf(
+			"invalid arrow stream URI %q: expected arrow-stream://-, unix:<path>, tcp://<host:port> or flight://<host:port>",
+			uri,
+		)
 	}
 
 	if s.input == nil {
 		s.input = os.Stdin
 	}
 
-	reader, err := ipc.NewReader(s.input, ipc.WithAllocator(memory.DefaultAllocator))
-	if err != nil {
-		return fmt.Errorf("failed to create arrow stream reader: %w", err)
+	if params.Get("multi_table") == "true" {
+		return s.connectMultiTable()
 	}
 
-	arrowSchema := reader.Schema()
-	if arrowSchema == nil {
-		reader.Release()
-		return fmt.Errorf("arrow stream has no schema")
+	reader, arrowSchema, err := newRecordReader(s.input)
+	if err != nil {
+		return fmt.Errorf("failed to create arrow stream reader: %w", err)
 	}
 
 	s.reader = reader
@@ -73,7 +93,20 @@ func (s *ArrowStreamSource) Close(ctx context.Context) error {
 		s.reader.Release()
 		s.reader = nil
 	}
+	// Once a read has started, it owns the listener and the first producer.
+	if s.firstProducer != nil {
+		s.firstProducer.release()
+		s.firstProducer = nil
+	}
+	if s.listener != nil && !s.readStarted {
+		_ = s.listener.Close()
+	}
+	s.listener = nil
+	s.listenSchema = nil
 	s.knownSchema = nil
+	s.frames = nil
+	s.tables = nil
+	s.tableSchemas = nil
 	return nil
 }
 
@@ -118,7 +151,11 @@ func (s *ArrowStreamSource) GetTable(ctx context.Context, req source.TableReques
 
 func (s *ArrowStreamSource) read(ctx context.Context, opts source.ReadOptions) (<-chan source.RecordBatchResult, error) {
 	s.mu.Lock()
-	if s.reader == nil {
+	if s.multiTable {
+		s.mu.Unlock()
+		return nil, fmt.Errorf("multi-table arrow stream must be read without --source-table")
+	}
+	if s.reader == nil && s.firstProducer == nil {
 		s.mu.Unlock()
 		return nil, fmt.Errorf("arrow stream source is not connected")
 	}
@@ -128,89 +165,138 @@ func (s *ArrowStreamSource) read(ctx context.Context, opts source.ReadOptions) (
 	}
 	s.readStarted = true
 	reader := s.reader
+	var merged *mergedReader
+	if s.firstProducer != nil {
+		merged = newMergedReader(s.listener, s.firstProducer, s.expectedProducers, s.listenSchema)
+		s.firstProducer = nil
+		reader = merged
+	}
 	s.mu.Unlock()
 
 	results := make(chan source.RecordBatchResult, 8)
 
 	go func() {
 		defer close(results)
-
-		batchSize := int64(opts.PageSize)
-		if batchSize < 0 {
-			batchSize = 0
+		if merged != nil {
+			defer merged.Release()
 		}
-		limit := int64(opts.Limit)
-		if limit < 0 {
-			limit = 0
+		forwardRecords(ctx, reader, "", opts, results)
+	}()
+
+	return results, nil
+}
+
+// forwardRecords sends the record batches of reader to results, sliced to
+// opts.PageSize and stopping at opts.Limit rows. Read errors are sent as a
+// result. It returns false if ctx was cancelled.
+func forwardRecords(
+	ctx context.Context,
+	reader recordReader,
+	tableName string,
+	opts source.ReadOptions,
+	results chan<- source.RecordBatchResult,
+) bool {
+	batchSize := int64(opts.PageSize)
+	if batchSize < 0 {
+		batchSize = 0
+	}
+	limit := int64(opts.Limit)
+	if limit < 0 {
+		limit = 0
+	}
+	exclude := buildExcludeSet(opts.ExcludeColumns)
+
+	var totalRows int64
+	batchNum := 0
+
+	for reader.Next() {
+		if limit > 0 && totalRows >= limit {
+			break
 		}
-		exclude := buildExcludeSet(opts.ExcludeColumns)
 
-		var totalRows int64
-		batchNum := 0
+		select {
+		case <-ctx.Done():
+			return false
+		default:
+		}
 
-		for reader.Next() {
-			if limit > 0 && totalRows >= limit {
-				break
+		record := reader.RecordBatch()
+		filtered, sameRecord := applyExcludeColumns(record, exclude)
+		if filtered.NumRows() == 0 {
+			if !sameRecord {
+				filtered.Release()
 			}
+			continue
+		}
 
-			select {
-			case <-ctx.Done():
-				return
-			default:
+		maxRows := filtered.NumRows()
+		if limit > 0 && totalRows+maxRows > limit {
+			maxRows = limit - totalRows
+		}
+
+		for offset := int64(0); offset < maxRows; {
+			chunkSize := maxRows - offset
+			if batchSize > 0 && chunkSize > batchSize {
+				chunkSize = batchSize
 			}
 
-			record := reader.RecordBatch()
-			filtered, sameRecord := applyExcludeColumns(record, exclude)
-			if filtered.NumRows() == 0 {
+			chunk, err := source.DecodeDictionaries(ctx, filtered.NewSlice(offset, offset+chunkSize))
+			if err != nil {
 				if !sameRecord {
 					filtered.Release()
 				}
-				continue
-			}
-
-			maxRows := filtered.NumRows()
-			if limit > 0 && totalRows+maxRows > limit {
-				maxRows = limit - totalRows
-			}
-
-			for offset := int64(0); offset < maxRows; {
-				chunkSize := maxRows - offset
-				if batchSize > 0 && chunkSize > batchSize {
-					chunkSize = batchSize
-				}
-
-				chunk := filtered.NewSlice(offset, offset+chunkSize)
-
 				select {
-				case results <- source.RecordBatchResult{Batch: chunk}:
+				case results <- source.RecordBatchResult{Err: err, TableName: tableName}:
 				case <-ctx.Done():
-					chunk.Release()
-					if !sameRecord {
-						filtered.Release()
-					}
-					return
+					return false
 				}
-
-				offset += chunkSize
-				totalRows += chunkSize
-				batchNum++
-				config.Debug("[ARROW-STREAM] Batch %d: %d rows (total: %d)", batchNum, chunkSize, totalRows)
+				return true
 			}
 
-			if !sameRecord {
-				filtered.Release()
+			select {
+			case results <- source.RecordBatchResult{Batch: chunk, TableName: tableName}:
+			case <-ctx.Done():
+				chunk.Release()
+				if !sameRecord {
+					filtered.Release()
+				}
+				return false
 			}
+
+			offset += chunkSize
+			totalRows += chunkSize
+			batchNum++
+			config.Debug("[ARROW-STREAM] %sBatch %d: %d rows (total: %d)", debugTablePrefix(tableName), batchNum, chunkSize, totalRows)
 		}
 
-		if err := reader.Err(); err != nil {
-			results <- source.RecordBatchResult{Err: fmt.Errorf("failed to read arrow stream: %w", err)}
-			return
+		if !sameRecord {
+			filtered.Release()
 		}
+	}
 
-		config.Debug("[ARROW-STREAM] Total: %d rows in %d batches", totalRows, batchNum)
-	}()
+	if err := reader.Err(); err != nil {
+		if tableName != "" {
+			err = fmt.Errorf("failed to read arrow stream for table %s: %w", tableName, err)
+		} else {
+			err = fmt.Errorf("failed to read arrow stream: %w", err)
+		}
+		select {
+		case results <- source.RecordBatchResult{Err: err, TableName: tableName}:
+		case <-ctx.Done():
+			return false
+		}
+		return true
+	}
 
-	return results, nil
+	config.Debug("[ARROW-STREAM] %sTotal: %d rows in %d batches", debugTablePrefix(tableName), totalRows, batchNum)
+	return true
+}
+
+func debugTablePrefix(tableName string) string {
+	if tableName == "" {
+		return ""
+	}
+	return tableName + ": "
 }
 
 func extractStreamTarget(uri string) string {
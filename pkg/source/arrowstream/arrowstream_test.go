@@ -3,7 +3,11 @@ package arrowstream
 import (
 	"bytes"
 	"context"
+	"encoding/binary"
+	"encoding/json"
+	"io"
 	"testing"
+	"time"
 
 	"github.com/apache/arrow-go/v18/arrow"
 	"github.com/apache/arrow-go/v18/arrow/array"
@@ -56,6 +60,230 @@ func TestArrowStreamSourceRead(t *testing.T) {
 	assert.Equal(t, 2, batches)
 }
 
+func TestArrowStreamSourceDecodesDeltaDictionaries(t *testing.T) {
+	t.Parallel()
+
+	dictType := &arrow.DictionaryType{IndexType: arrow.PrimitiveTypes.Int32, ValueType: arrow.BinaryTypes.String}
+	arrowSchema := arrow.NewSchema([]arrow.Field{{Name: "status", Type: dictType, Nullable: true}}, nil)
+
+	var buf bytes.Buffer
+	writer := ipc.NewWriter(&buf, ipc.WithSchema(arrowSchema), ipc.WithDictionaryDeltas(true))
+	// The second batch extends the first batch's dictionary, so it is sent
+	// as a delta.
+	for _, batch := range []struct {
+		dictionary []string
+		indices    []int32
+	}{
+		{dictionary: []string{"open", "closed"}, indices: []int32{0, 1, 0}},
+		{dictionary: []string{"open", "closed", "stale"}, indices: []int32{2, 0}},
+	} {
+		dictBuilder := array.NewStringBuilder(memory.DefaultAllocator)
+		dictBuilder.AppendValues(batch.dictionary, nil)
+		dictionary := dictBuilder.NewArray()
+		dictBuilder.Release()
+		indexBuilder := array.NewInt32Builder(memory.DefaultAllocator)
+		indexBuilder.AppendValues(batch.indices, nil)
+		indices := indexBuilder.NewArray()
+		indexBuilder.Release()
+
+		column := array.NewDictionaryArray(dictType, indices, dictionary)
+		record := array.NewRecordBatch(arrowSchema, []arrow.Array{column}, int64(len(batch.indices)))
+		require.NoError(t, writer.Write(record))
+		record.Release()
+		column.Release()
+		indices.Release()
+		dictionary.Release()
+	}
+	require.NoError(t, writer.Close())
+
+	ctx := context.Background()
+	src := NewArrowStreamSourceWithReader(&buf)
+	require.NoError(t, src.Connect(ctx, "arrow-stream://-"))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "events"})
+	require.NoError(t, err)
+	tableSchema, err := table.GetSchema(ctx)
+	require.NoError(t, err)
+	assert.Equal(t, schema.TypeString, tableSchema.Columns[0].DataType)
+
+	results, err := table.Read(ctx, source.ReadOptions{})
+	require.NoError(t, err)
+	var statuses []string
+	for result := range results {
+		require.NoError(t, result.Err)
+		column, ok := result.Batch.Column(0).(*array.String)
+		require.True(t, ok, "got %T", result.Batch.Column(0))
+		for i := 0; i < column.Len(); i++ {
+			statuses = append(statuses, column.Value(i))
+		}
+		result.Batch.Release()
+	}
+	assert.Equal(t, []string{"open", "closed", "open", "stale", "open"}, statuses)
+}
+
+func TestArrowStreamSourceReadsCompressedStreamsInOrder(t *testing.T) {
+	t.Parallel()
+
+	for name, codec := range map[string]ipc.Option{"lz4": ipc.WithLZ4(), "zstd": ipc.WithZstd()} {
+		t.Run(name, func(t *testing.T) {
+			t.Parallel()
+
+			var buf bytes.Buffer
+			writeSequentialStream(t, &buf, 40, 100, codec)
+
+			ctx := context.Background()
+			src := NewArrowStreamSourceWithReader(&buf)
+			require.NoError(t, src.Connect(ctx, "arrow-stream://-"))
+			t.Cleanup(func() { _ = src.Close(ctx) })
+
+			table, err := src.GetTable(ctx, source.TableRequest{Name: "events"})
+			require.NoError(t, err)
+			results, err := table.Read(ctx, source.ReadOptions{PageSize: 64})
+			require.NoError(t, err)
+
+			next := int64(0)
+			for result := range results {
+				require.NoError(t, result.Err)
+				ids := result.Batch.Column(0).(*array.Int64)
+				for i := 0; i < ids.Len(); i++ {
+					require.Equal(t, next, ids.Value(i))
+					next++
+				}
+				result.Batch.Release()
+			}
+			assert.Equal(t, int64(4000), next)
+		})
+	}
+}
+
+func TestArrowStreamSourceStopsDecodingAtLimit(t *testing.T) {
+	t.Parallel()
+
+	var buf bytes.Buffer
+	writeSequentialStream(t, &buf, 40, 100, ipc.WithZstd())
+
+	ctx := context.Background()
+	src := NewArrowStreamSourceWithReader(&buf)
+	require.NoError(t, src.Connect(ctx, "arrow-stream://-"))
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "events"})
+	require.NoError(t, err)
+	results, err := table.Read(ctx, source.ReadOptions{Limit: 250})
+	require.NoError(t, err)
+
+	var rows int64
+	for result := range results {
+		require.NoError(t, result.Err)
+		rows += result.Batch.NumRows()
+		result.Batch.Release()
+	}
+	assert.Equal(t, int64(250), rows)
+	require.NoError(t, src.Close(ctx))
+}
+
+func TestParallelRecordReaderSharesTheStreamSchema(t *testing.T) {
+	t.Parallel()
+
+	var buf bytes.Buffer
+	writeSequentialStream(t, &buf, 20, 10)
+
+	reader, arrowSchema, err := newRecordReaderWithWorkers(&buf, 4)
+	require.NoError(t, err)
+	defer reader.Release()
+	require.IsType(t, &parallelRecordReader{}, reader)
+
+	batches := 0
+	for reader.Next() {
+		require.Same(t, arrowSchema, reader.RecordBatch().Schema())
+		batches++
+	}
+	require.NoError(t, reader.Err())
+	assert.Equal(t, 20, batches)
+}
+
+func TestParallelRecordReaderReleaseDoesNotWaitForIdleInput(t *testing.T) {
+	t.Parallel()
+
+	input, output := io.Pipe()
+	t.Cleanup(func() { _ = output.Close() })
+	go func() {
+		// Send one batch, then leave the stream open like an idle stdin.
+		writer := ipc.NewWriter(output, ipc.WithSchema(testStreamSchema()), ipc.WithAllocator(memory.DefaultAllocator))
+		record := makeRecordBatch(t, testStreamSchema(), 0, 2)
+		defer record.Release()
+		_ = writer.Write(record)
+	}()
+
+	reader, _, err := newRecordReaderWithWorkers(input, 4)
+	require.NoError(t, err)
+	require.True(t, reader.Next())
+	assert.Equal(t, int64(2), reader.RecordBatch().NumRows())
+
+	released := make(chan struct{})
+	go func() {
+		reader.Release()
+		close(released)
+	}()
+	select {
+	case <-released:
+	case <-time.After(5 * time.Second):
+		t.Fatal("Release blocked on idle input")
+	}
+}
+
+// BenchmarkArrowStreamSourceCompression reads the same rows sent uncompressed
+// and with each IPC codec. Throughput is reported for the uncompressed bytes
+// and wire-B/op is the size of the stream, so the time saved by sending fewer
+// bytes can be weighed against the decompression cost shown here.
+func BenchmarkArrowStreamSourceCompression(b *testing.B) {
+	for _, codec := range []struct {
+		name   string
+		option ipc.Option
+	}{
+		{name: "none"},
+		{name: "lz4", option: ipc.WithLZ4()},
+		{name: "zstd", option: ipc.WithZstd()},
+	} {
+		b.Run(codec.name, func(b *testing.B) {
+			var uncompressed bytes.Buffer
+			writeSequentialStream(b, &uncompressed, 64, 16384)
+			payload := uncompressed.Bytes()
+			if codec.option != nil {
+				var compressed bytes.Buffer
+				writeSequentialStream(b, &compressed, 64, 16384, codec.option)
+				payload = compressed.Bytes()
+			}
+
+			b.SetBytes(int64(uncompressed.Len()))
+			b.ReportMetric(float64(len(payload)), "wire-B/op")
+			b.ResetTimer()
+			for range b.N {
+				ctx := context.Background()
+				src := NewArrowStreamSourceWithReader(bytes.NewReader(payload))
+				if err := src.Connect(ctx, "arrow-stream://-"); err != nil {
+					b.Fatal(err)
+				}
+				table, err := src.GetTable(ctx, source.TableRequest{Name: "events"})
+				if err != nil {
+					b.Fatal(err)
+				}
+				results, err := table.Read(ctx, source.ReadOptions{})
+				if err != nil {
+					b.Fatal(err)
+				}
+				for result := range results {
+					if result.Err != nil {
+						b.Fatal(result.Err)
+					}
+					result.Batch.Release()
+				}
+				_ = src.Close(ctx)
+			}
+		})
+	}
+}
+
 func TestArrowStreamSourceCanOnlyReadOnce(t *testing.T) {
 	t.Parallel()
 
@@ -113,15 +341,122 @@ func TestArrowStreamSourceSkipsBatchesWhenAllColumnsExcluded(t *testing.T) {
 	assert.Zero(t, batches)
 }
 
-func writeTestStream(t *testing.T, buf *bytes.Buffer) {
-	t.Helper()
+func TestArrowStreamSourceReadsInterleavedMultiTableStream(t *testing.T) {
+	t.Parallel()
 
-	arrowSchema := arrow.NewSchema([]arrow.Field{
+	arrowSchema := testStreamSchema()
+	var schemaMessage bytes.Buffer
+	require.NoError(t, ipc.NewWriter(&schemaMessage, ipc.WithSchema(arrowSchema)).Close())
+
+	header, err := json.Marshal(multiTableHeader{Tables: []multiTableHeaderTable{
+		{Name: "public.users", Schema: schemaMessage.Bytes(), PrimaryKeys: []string{"id"}},
+		{Name: "public.events", Schema: schemaMessage.Bytes()},
+	}})
+	require.NoError(t, err)
+
+	var buf bytes.Buffer
+	buf.WriteString(multiTableMagic)
+	require.NoError(t, binary.Write(&buf, binary.LittleEndian, uint32(len(header))))
+	buf.Write(header)
+
+	users := ipc.NewWriter(&frameWriter{out: &buf, index: 0}, ipc.WithSchema(arrowSchema))
+	events := ipc.NewWriter(&frameWriter{out: &buf, index: 1}, ipc.WithSchema(arrowSchema))
+	for i, writer := range []*ipc.Writer{users, events, users, events, events} {
+		record := makeRecordBatch(t, arrowSchema, i*2, 2)
+		require.NoError(t, writer.Write(record))
+		record.Release()
+	}
+	require.NoError(t, users.Close())
+	require.NoError(t, binary.Write(&buf, binary.LittleEndian, [2]uint32{0, 0}))
+	require.NoError(t, events.Close())
+	require.NoError(t, binary.Write(&buf, binary.LittleEndian, [2]uint32{1, 0}))
+
+	ctx := context.Background()
+	src := NewArrowStreamSourceWithReader(&buf)
+	require.NoError(t, src.Connect(ctx, "arrow-stream://-?multi_table=true"))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+	require.True(t, src.IsMultiTable())
+
+	tables, err := src.GetTables(ctx)
+	require.NoError(t, err)
+	require.Len(t, tables, 2)
+	assert.Equal(t, "public.users", tables[0].Name)
+	assert.Equal(t, []string{"id"}, tables[0].PrimaryKeys)
+	assert.True(t, tables[0].Schema.Columns[0].IsPrimaryKey)
+
+	results, err := src.ReadAll(ctx, source.MultiTableReadOptions{})
+	require.NoError(t, err)
+
+	rows := map[string]int64{}
+	for result := range results {
+		require.NoError(t, result.Err)
+		rows[result.TableName] += result.Batch.NumRows()
+		result.Batch.Release()
+	}
+	assert.Equal(t, map[string]int64{"public.users": 4, "public.events": 6}, rows)
+}
+
+func TestArrowStreamSourceReportsTruncatedMultiTableStream(t *testing.T) {
+	t.Parallel()
+
+	var schemaMessage bytes.Buffer
+	require.NoError(t, ipc.NewWriter(&schemaMessage, ipc.WithSchema(testStreamSchema())).Close())
+	header, err := json.Marshal(multiTableHeader{Tables: []multiTableHeaderTable{
+		{Name: "public.users", Schema: schemaMessage.Bytes()},
+	}})
+	require.NoError(t, err)
+
+	var buf bytes.Buffer
+	buf.WriteString(multiTableMagic)
+	require.NoError(t, binary.Write(&buf, binary.LittleEndian, uint32(len(header))))
+	buf.Write(header)
+
+	ctx := context.Background()
+	src := NewArrowStreamSourceWithReader(&buf)
+	require.NoError(t, src.Connect(ctx, "arrow-stream://-?multi_table=true"))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	results, err := src.ReadAll(ctx, source.MultiTableReadOptions{})
+	require.NoError(t, err)
+
+	var readErr error
+	for result := range results {
+		if result.Err != nil {
+			readErr = result.Err
+		}
+	}
+	require.ErrorContains(t, readErr, "public.users")
+}
+
+// frameWriter wraps everything written to it in multi-table frames for one table.
+type frameWriter struct {
+	out   *bytes.Buffer
+	index uint32
+}
+
+func (w *frameWriter) Write(p []byte) (int, error) {
+	if len(p) == 0 {
+		return 0, nil
+	}
+	if err := binary.Write(w.out, binary.LittleEndian, [2]uint32{w.index, uint32(len(p))}); err != nil {
+		return 0, err
+	}
+	return w.out.Write(p)
+}
+
+func testStreamSchema() *arrow.Schema {
+	return arrow.NewSchema([]arrow.Field{
 		{Name: "id", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
 		{Name: "name", Type: arrow.BinaryTypes.String, Nullable: false},
 		{Name: "score", Type: arrow.PrimitiveTypes.Int32, Nullable: false},
 		{Name: "is_active", Type: arrow.FixedWidthTypes.Boolean, Nullable: false},
 	}, nil)
+}
+
+func writeTestStream(t *testing.T, buf *bytes.Buffer) {
+	t.Helper()
+
+	arrowSchema := testStreamSchema()
 
 	writer := ipc.NewWriter(buf, ipc.WithSchema(arrowSchema), ipc.WithAllocator(memory.DefaultAllocator))
 	defer func() { require.NoError(t, writer.Close()) }()
@@ -135,7 +470,23 @@ func writeTestStream(t *testing.T, buf *bytes.Buffer) {
 	second.Release()
 }
 
-func makeRecordBatch(t *testing.T, arrowSchema *arrow.Schema, start, rows int) arrow.RecordBatch {
+// writeSequentialStream writes batches record batches of rows rows each, with
+// ids counting up from 0 across the stream.
+func writeSequentialStream(t testing.TB, buf *bytes.Buffer, batches, rows int, opts ...ipc.Option) {
+	t.Helper()
+
+	arrowSchema := testStreamSchema()
+	opts = append([]ipc.Option{ipc.WithSchema(arrowSchema), ipc.WithAllocator(memory.DefaultAllocator)}, opts...)
+	writer := ipc.NewWriter(buf, opts...)
+	for i := range batches {
+		record := makeRecordBatch(t, arrowSchema, i*rows, rows)
+		require.NoError(t, writer.Write(record))
+		record.Release()
+	}
+	require.NoError(t, writer.Close())
+}
+
+func makeRecordBatch(t testing.TB, arrowSchema *arrow.Schema, start, rows int) arrow.RecordBatch {
 	t.Helper()
 
 	builder := array.NewRecordBuilder(memory.DefaultAllocator, arrowSchema)
@@ -0,0 +1,313 @@
+package arrowstream
+
+import (
+	"context"
+	"errors"
+	"fmt"
+	"io"
+	"sync"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/array"
+	"github.com/apache/arrow-go/v18/arrow/ipc"
+	"github.com/apache/arrow-go/v18/arrow/memory"
+	"github.com/bruin-data/ingestr/pkg/source"
+)
+
+// recordReader is the part of ipc.Reader that forwardRecords uses.
+type recordReader interface {
+	Next() bool
+	RecordBatch() arrow.RecordBatch
+	Err() error
+	Release()
+}
+
+// newRecordReader reads the schema of the Arrow IPC stream in input and
+// returns a reader for its record batches. Without dictionary-encoded fields,
+// each record batch message is decoded on its own, so batches are decoded and
+// decompressed on up to source.DecodeWorkers() goroutines ahead of the
+// caller. Dictionary batches change how the record batches after them decode,
+// so streams with dictionary fields are read in order by one ipc.Reader.
+func newRecordReader(input io.Reader) (recordReader, *arrow.Schema, error) {
+	return newRecordReaderWithWorkers(input, source.DecodeWorkers())
+}
+
+func newRecordReaderWithWorkers(input io.Reader, workers int) (recordReader, *arrow.Schema, error) {
+	messages := ipc.NewMessageReader(input, ipc.WithAllocator(memory.DefaultAllocator))
+	schemaMessage, err := messages.Message()
+	if err != nil {
+		messages.Release()
+		if errors.Is(err, io.EOF) {
+			return nil, nil, fmt.Errorf("arrow stream has no schema")
+		}
+		return nil, nil, err
+	}
+	if schemaMessage.Type() != ipc.MessageSchema {
+		messages.Release()
+		return nil, nil, fmt.Errorf("arrow stream does not start with a schema message, got %v", schemaMessage.Type())
+	}
+	schemaMessage.Retain()
+
+	arrowSchema, err := decodeMessageSchema(schemaMessage)
+	if err != nil {
+		schemaMessage.Release()
+		messages.Release()
+		return nil, nil, err
+	}
+
+	if workers <= 1 || source.HasDictionaryFields(arrowSchema) {
+		reader, err := ipc.NewReaderFromMessageReader(
+			&messageList{messages: []*ipc.Message{schemaMessage}, rest: messages},
+			ipc.WithAllocator(memory.DefaultAllocator),
+		)
+		// The reader has decoded the schema message by now.
+		schemaMessage.Release()
+		if err != nil {
+			return nil, nil, err
+		}
+		return reader, arrowSchema, nil
+	}
+
+	return &parallelRecordReader{
+		messages: messages,
+		decoders: newRecordDecoders(arrowSchema, schemaMessage, workers),
+		workers:  workers,
+	}, arrowSchema, nil
+}
+
+// parallelRecordReader decodes the record batch messages of a stream without
+// dictionaries concurrently and returns the batches in stream order. Like
+// ipc.Reader, the batch returned by RecordBatch is valid until the next call
+// to Next.
+type parallelRecordReader struct {
+	messages ipc.MessageReader
+	decoders *recordDecoders
+	workers  int
+
+	cancel  context.CancelFunc
+	results <-chan source.RecordBatchResult
+	current arrow.RecordBatch
+	err     error
+}
+
+func (r *parallelRecordReader) Next() bool {
+	if r.current != nil {
+		r.current.Release()
+		r.current = nil
+	}
+	if r.err != nil {
+		return false
+	}
+	if r.results == nil {
+		r.start()
+	}
+
+	result, ok := <-r.results
+	if !ok {
+		return false
+	}
+	if result.Err != nil {
+		r.err = result.Err
+		return false
+	}
+	r.current = result.Batch
+	return true
+}
+
+func (r *parallelRecordReader) RecordBatch() arrow.RecordBatch {
+	return r.current
+}
+
+func (r *parallelRecordReader) Err() error {
+	return r.err
+}
+
+// Release stops decoding without waiting for the input. A reader goroutine
+// blocked on a read that never completes, such as an idle stdin, is left
+// behind; it stops at its next message and releases what it holds. Until
+// then it may still read from input.
+func (r *parallelRecordReader) Release() {
+	if r.current != nil {
+		r.current.Release()
+		r.current = nil
+	}
+	if r.results != nil {
+		// Batches decoded after this are released by source.DecodeInOrder.
+		r.cancel()
+		r.results = nil
+	} else if r.messages != nil {
+		r.messages.Release()
+		r.decoders.release()
+	}
+	r.messages = nil
+	r.decoders = nil
+}
+
+func (r *parallelRecordReader) start() {
+	ctx, cancel := context.WithCancel(context.Background())
+	r.cancel = cancel
+
+	messages := r.messages
+	decoders := r.decoders
+	decodes := make(chan func() (arrow.RecordBatch, error))
+	go func() {
+		// The decoders are released last, once every decode sent to
+		// source.DecodeInOrder has run.
+		defer decoders.release()
+		defer close(decodes)
+		defer messages.Release()
+
+		for ctx.Err() == nil {
+			message, err := messages.Message()
+			if errors.Is(err, io.EOF) {
+				return
+			}
+
+			var decode func() (arrow.RecordBatch, error)
+			switch {
+			case err != nil:
+				decode = func() (arrow.RecordBatch, error) { return nil, err }
+			case message.Type() != ipc.MessageRecordBatch:
+				messageType := message.Type()
+				decode = func() (arrow.RecordBatch, error) {
+					return nil, fmt.Errorf("unexpected %v message in arrow stream", messageType)
+				}
+			default:
+				// The message reader releases each message when it reads the
+				// next one.
+				message.Retain()
+				decoders.pending.Add(1)
+				decode = func() (arrow.RecordBatch, error) {
+					defer decoders.pending.Done()
+					defer message.Release()
+					return decoders.decode(message)
+				}
+			}
+
+			select {
+			case decodes <- decode:
+			case <-ctx.Done():
+				if err == nil && message.Type() == ipc.MessageRecordBatch {
+					message.Release()
+					decoders.pending.Done()
+				}
+				return
+			}
+			if err != nil || message.Type() != ipc.MessageRecordBatch {
+				return
+			}
+		}
+	}()
+
+	r.results = source.DecodeInOrder(ctx, decodes, r.workers)
+}
+
+// recordDecoders decode the record batch messages of a stream whose record
+// batches do not depend on dictionary batches. Each decoder is an ipc.Reader
+// that has read the schema message once and is then fed one record batch
+// message at a time, so the schema is not parsed again for every batch.
+// Decoded batches carry the stream's schema, so every batch shares one
+// *arrow.Schema.
+type recordDecoders struct {
+	schema        *arrow.Schema
+	schemaMessage *ipc.Message
+	idle          chan *recordDecoder
+	// pending counts decodes that have been handed out but not run.
+	pending sync.WaitGroup
+}
+
+type recordDecoder struct {
+	messages *messageList
+	reader   *ipc.Reader
+}
+
+// newRecordDecoders takes ownership of schemaMessage. At most workers decodes
+// run at once, so at most that many decoders are created.
+func newRecordDecoders(arrowSchema *arrow.Schema, schemaMessage *ipc.Message, workers int) *recordDecoders {
+	return &recordDecoders{
+		schema:        arrowSchema,
+		schemaMessage: schemaMessage,
+		idle:          make(chan *recordDecoder, workers),
+	}
+}
+
+func (d *recordDecoders) decode(message *ipc.Message) (arrow.RecordBatch, error) {
+	var decoder *recordDecoder
+	select {
+	case decoder = <-d.idle:
+	default:
+		messages := &messageList{messages: []*ipc.Message{d.schemaMessage}}
+		reader, err := ipc.NewReaderFromMessageReader(messages, ipc.WithAllocator(memory.DefaultAllocator))
+		if err != nil {
+			return nil, err
+		}
+		decoder = &recordDecoder{messages: messages, reader: reader}
+	}
+
+	decoder.messages.messages = append(decoder.messages.messages[:0], message)
+	if !decoder.reader.Next() {
+		// A reader that failed or saw the end of its input is not reused.
+		err := decoder.reader.Err()
+		decoder.reader.Release()
+		if err == nil {
+			err = fmt.Errorf("arrow stream record batch message has no record batch")
+		}
+		return nil, err
+	}
+
+	decoded := decoder.reader.RecordBatch()
+	batch := array.NewRecordBatch(d.schema, decoded.Columns(), decoded.NumRows())
+	d.idle <- decoder
+	return batch, nil
+}
+
+// release waits for pending decodes, then releases the decoders and the
+// schema message.
+func (d *recordDecoders) release() {
+	d.pending.Wait()
+	close(d.idle)
+	for decoder := range d.idle {
+		decoder.reader.Release()
+	}
+	d.schemaMessage.Release()
+}
+
+func decodeMessageSchema(schemaMessage *ipc.Message) (*arrow.Schema, error) {
+	reader, err := ipc.NewReaderFromMessageReader(
+		&messageList{messages: []*ipc.Message{schemaMessage}},
+		ipc.WithAllocator(memory.DefaultAllocator),
+	)
+	if err != nil {
+		return nil, fmt.Errorf("failed to read arrow stream schema: %w", err)
+	}
+	defer reader.Release()
+	return reader.Schema(), nil
+}
+
+// messageList is an ipc.MessageReader over messages, followed by the
+// messages of rest when it is set. It owns rest but not messages.
+type messageList struct {
+	messages []*ipc.Message
+	rest     ipc.MessageReader
+}
+
+func (l *messageList) Message() (*ipc.Message, error) {
+	if len(l.messages) > 0 {
+		message := l.messages[0]
+		l.messages = l.messages[1:]
+		return message, nil
+	}
+	if l.rest != nil {
+		return l.rest.Message()
+	}
+	return nil, io.EOF
+}
+
+func (l *messageList) Retain() {}
+
+func (l *messageList) Release() {
+	if l.rest != nil {
+		l.rest.Release()
+		l.rest = nil
+	}
+}
@@ -0,0 +1,94 @@
+package arrowstream
+
+import (
+	"fmt"
+	"net"
+	"sync"
+	"sync/atomic"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/flight"
+	"github.com/apache/arrow-go/v18/arrow/ipc"
+	"github.com/apache/arrow-go/v18/arrow/memory"
+)
+
+// flightListener is an Arrow Flight server that accepts each DoPut call as a
+// producer. The flight descriptor of the call is ignored. Other Flight methods
+// are unimplemented.
+type flightListener struct {
+	flight.BaseFlightServer
+
+	server    flight.Server
+	accepted  chan producer
+	closed    chan struct{}
+	closeOnce sync.Once
+}
+
+func listenFlight(address string) (producerListener, error) {
+	l := &flightListener{
+		server:   flight.NewServerWithMiddleware(nil),
+		accepted: make(chan producer),
+		closed:   make(chan struct{}),
+	}
+	if err := l.server.Init(address); err != nil {
+		return nil, fmt.Errorf("failed to listen for arrow flight on %s: %w", address, err)
+	}
+	l.server.RegisterFlightService(l)
+	go func() { _ = l.server.Serve() }()
+	return l, nil
+}
+
+// DoPut hands the call to Accept and keeps it open until the producer is
+// closed, as the stream ends when DoPut returns.
+func (l *flightListener) DoPut(stream flight.FlightService_DoPutServer) error {
+	done := make(chan struct{})
+	var once sync.Once
+	var opened atomic.Bool
+	p := producer{
+		open: func() (recordReader, *arrow.Schema, error) {
+			opened.Store(true)
+			reader, err := flight.NewRecordReader(stream, ipc.WithAllocator(memory.DefaultAllocator))
+			if err != nil {
+				return nil, nil, err
+			}
+			return reader, reader.Schema(), nil
+		},
+		close: func() {
+			once.Do(func() { close(done) })
+		},
+	}
+
+	select {
+	case l.accepted <- p:
+	case <-l.closed:
+		return fmt.Errorf("arrow stream source is no longer accepting producers")
+	}
+	<-done
+	if !opened.Load() {
+		return fmt.Errorf("arrow stream source is no longer accepting producers")
+	}
+	return nil
+}
+
+func (l *flightListener) Accept() (producer, error) {
+	select {
+	case p := <-l.accepted:
+		return p, nil
+	case <-l.closed:
+		return producer{}, net.ErrClosed
+	}
+}
+
+// Close stops accepting DoPut calls. Calls that were accepted go on until
+// their producer is closed, and the server shuts down after them.
+func (l *flightListener) Close() error {
+	l.closeOnce.Do(func() {
+		close(l.closed)
+		go l.server.Shutdown()
+	})
+	return nil
+}
+
+func (l *flightListener) Addr() net.Addr {
+	return l.server.Addr()
+}
@@ -0,0 +1,379 @@
+package arrowstream
+
+import (
+	"context"
+	"fmt"
+	"net"
+	"net/url"
+	"strconv"
+	"strings"
+	"sync"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/bruin-data/ingestr/internal/config"
+	"github.com/bruin-data/ingestr/pkg/source"
+)
+
+// Besides stdin, the source can listen for producers that connect to it:
+//
+//	arrow-stream://unix:/path/to/ingestr.sock
+//	arrow-stream://tcp://host:port
+//	arrow-stream://flight://host:port
+//
+// Each unix or tcp connection carries one Arrow IPC stream. Flight producers
+// send their stream with DoPut. All producers must send the same schema.
+// Connect waits for the first producer to read the schema. The batches of all
+// producers are read concurrently and interleaved. The read finishes once
+// every producer has closed its stream and none is connected. Add
+// ?producers=N to instead wait until N producers have connected and finished.
+
+// producer is a connected producer whose stream has not been read yet.
+type producer struct {
+	// open reads the schema of the producer's stream.
+	open func() (recordReader, *arrow.Schema, error)
+	// close ends the producer's connection. It is safe to call more than once.
+	close func()
+}
+
+// producerListener accepts producer connections. After Close, Accept returns
+// an error.
+type producerListener interface {
+	Accept() (producer, error)
+	Close() error
+	Addr() net.Addr
+}
+
+// listenTarget reports whether target names a listener rather than stdin.
+func listenTarget(target string) bool {
+	for _, prefix := range []string{"unix:", "tcp://", "flight://"} {
+		if strings.HasPrefix(target, prefix) {
+			return true
+		}
+	}
+	return false
+}
+
+func listen(target string) (producerListener, error) {
+	switch {
+	case strings.HasPrefix(target, "unix:"):
+		path := strings.TrimPrefix(strings.TrimPrefix(target, "unix:"), "//")
+		if path == "" {
+			return nil, fmt.Errorf("arrow stream unix socket path is empty")
+		}
+		listener, err := net.Listen("unix", path)
+		if err != nil {
+			return nil, fmt.Errorf("failed to listen on unix socket %s: %w", path, err)
+		}
+		return &socketListener{listener: listener}, nil
+	case strings.HasPrefix(target, "tcp://"):
+		address := strings.TrimPrefix(target, "tcp://")
+		listener, err := net.Listen("tcp", address)
+		if err != nil {
+			return nil, fmt.Errorf("failed to listen on tcp address %s: %w", address, err)
+		}
+		return &socketListener{listener: listener}, nil
+	case strings.HasPrefix(target, "flight://"):
+		return listenFlight(strings.TrimPrefix(target, "flight://"))
+	default:
+		return nil, fmt.Errorf("unsupported arrow stream listener %q", target)
+	}
+}
+
+// socketListener accepts producers that write an Arrow IPC stream to a unix
+// or tcp connection.
+type socketListener struct {
+	listener net.Listener
+}
+
+func (l *socketListener) Accept() (producer, error) {
+	conn, err := l.listener.Accept()
+	if err != nil {
+		return producer{}, err
+	}
+
+	var once sync.Once
+	return producer{
+		open: func() (recordReader, *arrow.Schema, error) {
+			return newRecordReader(conn)
+		},
+		close: func() {
+			once.Do(func() { _ = conn.Close() })
+		},
+	}, nil
+}
+
+func (l *socketListener) Close() error {
+	return l.listener.Close()
+}
+
+func (l *socketListener) Addr() net.Addr {
+	return l.listener.Addr()
+}
+
+// parseExpectedProducers reads the producers parameter of a listener URI.
+// Zero means the read finishes as soon as no producer is connected.
+func parseExpectedProducers(params url.Values) (int, error) {
+	value := params.Get("producers")
+	if value == "" {
+		return 0, nil
+	}
+	producers, err := strconv.Atoi(value)
+	if err != nil || producers <= 0 {
+		return 0, fmt.Errorf("invalid arrow stream producers %q: must be a positive integer", value)
+	}
+	return producers, nil
+}
+
+func (s *ArrowStreamSource) connectListener(ctx context.Context, target string, params url.Values) error {
+	if params.Get("multi_table") == "true" {
+		return fmt.Errorf("multi-table arrow streams are only supported on stdin")
+	}
+	expected, err := parseExpectedProducers(params)
+	if err != nil {
+		return err
+	}
+
+	listener, err := listen(target)
+	if err != nil {
+		return err
+	}
+	config.Debug("[ARROW-STREAM] Listening for producers on %s", listener.Addr())
+
+	// The schema comes from the first producer, so wait for it to connect.
+	stopWaiting := context.AfterFunc(ctx, func() { _ = listener.Close() })
+	first, err := listener.Accept()
+	if !stopWaiting() && err == nil {
+		first.close()
+		err = ctx.Err()
+	}
+	if err != nil {
+		_ = listener.Close()
+		return fmt.Errorf("failed to accept arrow stream producer: %w", err)
+	}
+
+	reader, arrowSchema, err := first.open()
+	if err != nil {
+		first.close()
+		_ = listener.Close()
+		return fmt.Errorf("failed to create arrow stream reader: %w", err)
+	}
+
+	s.listener = listener
+	s.expectedProducers = expected
+	s.firstProducer = &openProducer{reader: reader, close: first.close}
+	s.listenSchema = arrowSchema
+	s.knownSchema = schemaFromArrow(arrowSchema, "")
+	config.Debug("[ARROW-STREAM] First producer connected with %d columns", len(s.knownSchema.Columns))
+	return nil
+}
+
+// openProducer is a producer whose schema has been read.
+type openProducer struct {
+	reader recordReader
+	close  func()
+}
+
+// release closes the producer's connection before releasing its reader, so
+// that a reader waiting for the next message returns.
+func (p *openProducer) release() {
+	p.close()
+	p.reader.Release()
+}
+
+// serveProducers reads the stream of first and of every producer that
+// connects to listener after it, and sends their record batches to batches
+// until all of them are done or ctx is cancelled. It closes listener and then
+// batches before returning.
+func serveProducers(
+	ctx context.Context,
+	listener producerListener,
+	first *openProducer,
+	expected int,
+	arrowSchema *arrow.Schema,
+	batches chan<- source.RecordBatchResult,
+) {
+	defer close(batches)
+
+	var mu sync.Mutex
+	active, accepted := 1, 1
+	stopped := false
+	// stopAccepting must be called with mu held.
+	stopAccepting := func() {
+		if !stopped {
+			stopped = true
+			_ = listener.Close()
+		}
+	}
+	finished := func() {
+		mu.Lock()
+		defer mu.Unlock()
+		active--
+		if active == 0 && (expected == 0 || accepted >= expected) {
+			stopAccepting()
+		}
+	}
+
+	mu.Lock()
+	if expected > 0 && accepted >= expected {
+		stopAccepting()
+	}
+	mu.Unlock()
+	stopOnCancel := context.AfterFunc(ctx, func() {
+		mu.Lock()
+		defer mu.Unlock()
+		stopAccepting()
+	})
+	defer stopOnCancel()
+
+	var wg sync.WaitGroup
+	wg.Add(1)
+	go func() {
+		defer wg.Done()
+		defer finished()
+		// Closing the connection wakes a reader waiting for the next message.
+		defer context.AfterFunc(ctx, first.close)()
+		forwardProducer(ctx, first, batches)
+	}()
+
+	for {
+		next, err := listener.Accept()
+		if err != nil {
+			mu.Lock()
+			wasStopped := stopped
+			stopAccepting()
+			mu.Unlock()
+			if !wasStopped && ctx.Err() == nil {
+				sendProducerError(ctx, fmt.Errorf("failed to accept arrow stream producer: %w", err), batches)
+			}
+			break
+		}
+
+		mu.Lock()
+		if stopped {
+			mu.Unlock()
+			next.close()
+			continue
+		}
+		active++
+		accepted++
+		if expected > 0 && accepted >= expected {
+			stopAccepting()
+		}
+		mu.Unlock()
+
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			defer finished()
+			defer context.AfterFunc(ctx, next.close)()
+
+			reader, producerSchema, err := next.open()
+			if err != nil {
+				next.close()
+				sendProducerError(ctx, fmt.Errorf("failed to create arrow stream reader: %w", err), batches)
+				return
+			}
+			p := &openProducer{reader: reader, close: next.close}
+			if !producerSchema.Equal(arrowSchema) {
+				p.release()
+				sendProducerError(ctx, fmt.Errorf("arrow stream producer schema %s does not match %s",
+					producerSchema, arrowSchema), batches)
+				return
+			}
+			forwardProducer(ctx, p, batches)
+		}()
+	}
+
+	wg.Wait()
+}
+
+// forwardProducer sends the record batches of one producer to batches.
+func forwardProducer(ctx context.Context, p *openProducer, batches chan<- source.RecordBatchResult) {
+	defer p.release()
+
+	for p.reader.Next() {
+		batch := p.reader.RecordBatch()
+		batch.Retain()
+		select {
+		case batches <- source.RecordBatchResult{Batch: batch}:
+		case <-ctx.Done():
+			batch.Release()
+			return
+		}
+	}
+	if err := p.reader.Err(); err != nil {
+		sendProducerError(ctx, err, batches)
+	}
+}
+
+func sendProducerError(ctx context.Context, err error, batches chan<- source.RecordBatchResult) {
+	select {
+	case batches <- source.RecordBatchResult{Err: err}:
+	case <-ctx.Done():
+	}
+}
+
+// mergedReader is a recordReader over the record batches of all producers,
+// in the order they arrive. The first producer error ends it.
+type mergedReader struct {
+	batches <-chan source.RecordBatchResult
+	cancel  context.CancelFunc
+	current arrow.RecordBatch
+	err     error
+}
+
+func newMergedReader(
+	listener producerListener,
+	first *openProducer,
+	expected int,
+	arrowSchema *arrow.Schema,
+) *mergedReader {
+	ctx, cancel := context.WithCancel(context.Background())
+	batches := make(chan source.RecordBatchResult, 8)
+	go serveProducers(ctx, listener, first, expected, arrowSchema, batches)
+	return &mergedReader{batches: batches, cancel: cancel}
+}
+
+func (r *mergedReader) Next() bool {
+	if r.current != nil {
+		r.current.Release()
+		r.current = nil
+	}
+	if r.err != nil {
+		return false
+	}
+
+	result, ok := <-r.batches
+	if !ok {
+		return false
+	}
+	if result.Err != nil {
+		r.err = result.Err
+		return false
+	}
+	r.current = result.Batch
+	return true
+}
+
+func (r *mergedReader) RecordBatch() arrow.RecordBatch {
+	return r.current
+}
+
+func (r *mergedReader) Err() error {
+	return r.err
+}
+
+// Release disconnects all producers, stops listening and waits until no
+// producer is being read.
+func (r *mergedReader) Release() {
+	if r.current != nil {
+		r.current.Release()
+		r.current = nil
+	}
+	r.cancel()
+	for result := range r.batches {
+		if result.Batch != nil {
+			result.Batch.Release()
+		}
+	}
+}
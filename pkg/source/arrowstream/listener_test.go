@@ -0,0 +1,259 @@
+package arrowstream
+
+import (
+	"context"
+	"errors"
+	"io"
+	"net"
+	"path/filepath"
+	"sync"
+	"testing"
+	"time"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/array"
+	"github.com/apache/arrow-go/v18/arrow/flight"
+	"github.com/apache/arrow-go/v18/arrow/ipc"
+	"github.com/apache/arrow-go/v18/arrow/memory"
+	"github.com/bruin-data/ingestr/pkg/source"
+	"github.com/stretchr/testify/assert"
+	"github.com/stretchr/testify/require"
+	"google.golang.org/grpc"
+	"google.golang.org/grpc/credentials/insecure"
+)
+
+func TestArrowStreamSourceMergesUnixSocketProducers(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	socketPath := filepath.Join(t.TempDir(), "ingest.sock")
+
+	var wg sync.WaitGroup
+	for i := range 3 {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			assert.NoError(t, produceSocketStream(t, "unix", socketPath, i*1000, 4, 50))
+		}()
+	}
+
+	src := NewArrowStreamSource()
+	require.NoError(t, src.Connect(ctx, "arrow-stream://unix:"+socketPath+"?producers=3"))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	ids := readStreamIDs(t, src, source.ReadOptions{PageSize: 32})
+	wg.Wait()
+
+	require.Len(t, ids, 600)
+	for i := range 3 {
+		for id := i * 1000; id < i*1000+200; id++ {
+			assert.Contains(t, ids, int64(id))
+		}
+	}
+}
+
+func TestArrowStreamSourceFinishesWhenTCPProducersClose(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	address := freeTCPAddress(t)
+
+	produced := make(chan error, 1)
+	go func() { produced <- produceSocketStream(t, "tcp", address, 0, 5, 100) }()
+
+	src := NewArrowStreamSource()
+	require.NoError(t, src.Connect(ctx, "arrow-stream://tcp://"+address))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	ids := readStreamIDs(t, src, source.ReadOptions{Limit: 321})
+	// The source may disconnect the producer once the limit is reached.
+	<-produced
+	assert.Len(t, ids, 321)
+}
+
+func TestArrowStreamSourceRejectsProducerWithDifferentSchema(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	socketPath := filepath.Join(t.TempDir(), "ingest.sock")
+
+	go func() { _ = produceSocketStream(t, "unix", socketPath, 0, 1, 10) }()
+
+	src := NewArrowStreamSource()
+	require.NoError(t, src.Connect(ctx, "arrow-stream://unix:"+socketPath+"?producers=2"))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	go func() {
+		conn, err := dialWithRetry("unix", socketPath)
+		if err != nil {
+			return
+		}
+		defer func() { _ = conn.Close() }()
+		other := arrow.NewSchema([]arrow.Field{{Name: "other", Type: arrow.PrimitiveTypes.Int64}}, nil)
+		writer := ipc.NewWriter(conn, ipc.WithSchema(other))
+		_ = writer.Close()
+	}()
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "events"})
+	require.NoError(t, err)
+	results, err := table.Read(ctx, source.ReadOptions{})
+	require.NoError(t, err)
+
+	var readErr error
+	for result := range results {
+		if result.Err != nil {
+			readErr = result.Err
+			continue
+		}
+		result.Batch.Release()
+	}
+	require.ErrorContains(t, readErr, "does not match")
+}
+
+func TestArrowStreamSourceAcceptsFlightDoPut(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	address := freeTCPAddress(t)
+
+	var wg sync.WaitGroup
+	for i := range 2 {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			assert.NoError(t, produceFlightStream(t, address, i*1000, 3, 40))
+		}()
+	}
+
+	src := NewArrowStreamSource()
+	require.NoError(t, src.Connect(ctx, "arrow-stream://flight://"+address+"?producers=2"))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	ids := readStreamIDs(t, src, source.ReadOptions{})
+	wg.Wait()
+
+	require.Len(t, ids, 240)
+	assert.Contains(t, ids, int64(0))
+	assert.Contains(t, ids, int64(1119))
+}
+
+// readStreamIDs reads the source to the end and returns the ids it produced.
+func readStreamIDs(t *testing.T, src *ArrowStreamSource, opts source.ReadOptions) map[int64]struct{} {
+	t.Helper()
+
+	table, err := src.GetTable(context.Background(), source.TableRequest{Name: "events"})
+	require.NoError(t, err)
+	results, err := table.Read(context.Background(), opts)
+	require.NoError(t, err)
+
+	ids := make(map[int64]struct{})
+	for result := range results {
+		require.NoError(t, result.Err)
+		column := result.Batch.Column(0).(*array.Int64)
+		for i := 0; i < column.Len(); i++ {
+			ids[column.Value(i)] = struct{}{}
+		}
+		result.Batch.Release()
+	}
+	return ids
+}
+
+// produceSocketStream connects to the source and sends it the batches of
+// producerBatches.
+func produceSocketStream(t testing.TB, network, address string, start, batches, rows int) error {
+	conn, err := dialWithRetry(network, address)
+	if err != nil {
+		return err
+	}
+	defer func() { _ = conn.Close() }()
+
+	records := producerBatches(t, start, batches, rows)
+	defer releaseBatches(records)
+
+	writer := ipc.NewWriter(conn, ipc.WithSchema(testStreamSchema()), ipc.WithAllocator(memory.DefaultAllocator))
+	for _, record := range records {
+		if err := writer.Write(record); err != nil {
+			return err
+		}
+	}
+	return writer.Close()
+}
+
+func produceFlightStream(t testing.TB, address string, start, batches, rows int) error {
+	client, err := flight.NewClientWithMiddleware(address, nil, nil,
+		grpc.WithTransportCredentials(insecure.NewCredentials()))
+	if err != nil {
+		return err
+	}
+	defer func() { _ = client.Close() }()
+
+	ctx, cancel := context.WithTimeout(context.Background(), 10*time.Second)
+	defer cancel()
+	stream, err := client.DoPut(ctx, grpc.WaitForReady(true))
+	if err != nil {
+		return err
+	}
+
+	records := producerBatches(t, start, batches, rows)
+	defer releaseBatches(records)
+
+	writer := flight.NewRecordWriter(stream, ipc.WithSchema(testStreamSchema()))
+	writer.SetFlightDescriptor(&flight.FlightDescriptor{Type: flight.DescriptorPATH, Path: []string{"events"}})
+	for _, record := range records {
+		if err := writer.Write(record); err != nil {
+			return err
+		}
+	}
+	if err := writer.Close(); err != nil {
+		return err
+	}
+	if err := stream.CloseSend(); err != nil {
+		return err
+	}
+	for {
+		if _, err := stream.Recv(); err != nil {
+			if errors.Is(err, io.EOF) {
+				return nil
+			}
+			return err
+		}
+	}
+}
+
+// producerBatches returns batches record batches of rows rows each, with ids
+// counting up from start.
+func producerBatches(t testing.TB, start, batches, rows int) []arrow.RecordBatch {
+	records := make([]arrow.RecordBatch, batches)
+	for i := range batches {
+		records[i] = makeRecordBatch(t, testStreamSchema(), start+i*rows, rows)
+	}
+	return records
+}
+
+func releaseBatches(records []arrow.RecordBatch) {
+	for _, record := range records {
+		record.Release()
+	}
+}
+
+// dialWithRetry dials address until the source under test is listening.
+func dialWithRetry(network, address string) (net.Conn, error) {
+	deadline := time.Now().Add(10 * time.Second)
+	for {
+		conn, err := net.Dial(network, address)
+		if err == nil || time.Now().After(deadline) {
+			return conn, err
+		}
+		time.Sleep(10 * time.Millisecond)
+	}
+}
+
+func freeTCPAddress(t *testing.T) string {
+	t.Helper()
+
+	listener, err := net.Listen("tcp", "127.0.0.1:0")
+	require.NoError(t, err)
+	address := listener.Addr().String()
+	require.NoError(t, listener.Close())
+	return address
+}
@@ -0,0 +1,287 @@
+package arrowstream
+
+import (
+	"bufio"
+	"bytes"
+	"context"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"io"
+	"sync"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/ipc"
+	"github.com/apache/arrow-go/v18/arrow/memory"
+	"github.com/bruin-data/ingestr/internal/config"
+	"github.com/bruin-data/ingestr/pkg/source"
+)
+
+// A multi-table Arrow stream (arrow-stream://-?multi_table=true) carries
+// several tables over one input, so a single ingestr process and destination
+// connection can load all of them. The input is laid out as:
+//
+//	magic   "ARROWMT1"
+//	header  uint32 little-endian length, followed by that many bytes of JSON
+//	frames  uint32 table index, uint32 payload length, payload
+//
+// The header lists every table up front with its Arrow schema (an IPC schema
+// message, base64-encoded in the JSON) and optional primary keys, because the
+// multi-table pipeline prepares all destination tables before reading. Each
+// frame payload is the next chunk of that table's own Arrow IPC stream, and a
+// zero-length frame ends the table. Frames of different tables may be
+// interleaved.
+const multiTableMagic = "ARROWMT1"
+
+// maxMultiTableHeaderSize bounds the header allocation for corrupt input.
+const maxMultiTableHeaderSize = 64 << 20
+
+type multiTableHeader struct {
+	Tables []multiTableHeaderTable `json:"tables"`
+}
+
+type multiTableHeaderTable struct {
+	Name        string   `json:"name"`
+	Schema      []byte   `json:"schema"`
+	PrimaryKeys []string `json:"primary_keys,omitempty"`
+}
+
+func (s *ArrowStreamSource) connectMultiTable() error {
+	frames := bufio.NewReader(s.input)
+	header, err := readMultiTableHeader(frames)
+	if err != nil {
+		return err
+	}
+	if len(header.Tables) == 0 {
+		return fmt.Errorf("multi-table arrow stream header lists no tables")
+	}
+
+	tables := make([]source.SourceTableInfo, 0, len(header.Tables))
+	arrowSchemas := make([]*arrow.Schema, 0, len(header.Tables))
+	seen := make(map[string]struct{}, len(header.Tables))
+	for _, table := range header.Tables {
+		if table.Name == "" {
+			return fmt.Errorf("multi-table arrow stream header has a table without a name")
+		}
+		if _, ok := seen[table.Name]; ok {
+			return fmt.Errorf("multi-table arrow stream header lists table %s more than once", table.Name)
+		}
+		seen[table.Name] = struct{}{}
+
+		arrowSchema, err := decodeSchemaMessage(table.Schema)
+		if err != nil {
+			return fmt.Errorf("invalid schema for table %s in multi-table arrow stream: %w", table.Name, err)
+		}
+
+		tableSchema := schemaFromArrow(arrowSchema, table.Name)
+		tableSchema.PrimaryKeys = table.PrimaryKeys
+		primaryKeys := make(map[string]struct{}, len(table.PrimaryKeys))
+		for _, key := range table.PrimaryKeys {
+			primaryKeys[key] = struct{}{}
+		}
+		for i := range tableSchema.Columns {
+			if _, ok := primaryKeys[tableSchema.Columns[i].Name]; ok {
+				tableSchema.Columns[i].IsPrimaryKey = true
+			}
+		}
+
+		tables = append(tables, source.SourceTableInfo{
+			Name:        table.Name,
+			Schema:      tableSchema,
+			PrimaryKeys: table.PrimaryKeys,
+		})
+		arrowSchemas = append(arrowSchemas, arrowSchema)
+	}
+
+	s.multiTable = true
+	s.frames = frames
+	s.tables = tables
+	s.tableSchemas = arrowSchemas
+	config.Debug("[ARROW-STREAM] Connected to multi-table Arrow IPC stream with %d tables", len(tables))
+	return nil
+}
+
+func (s *ArrowStreamSource) IsMultiTable() bool {
+	return s.multiTable
+}
+
+func (s *ArrowStreamSource) GetTables(ctx context.Context) ([]source.SourceTableInfo, error) {
+	if !s.multiTable {
+		return nil, fmt.Errorf("arrow stream source is not a multi-table stream")
+	}
+
+	tables := make([]source.SourceTableInfo, len(s.tables))
+	copy(tables, s.tables)
+	return tables, nil
+}
+
+func (s *ArrowStreamSource) ReadAll(ctx context.Context, opts source.MultiTableReadOptions) (<-chan source.RecordBatchResult, error) {
+	s.mu.Lock()
+	if !s.multiTable || s.frames == nil {
+		s.mu.Unlock()
+		return nil, fmt.Errorf("arrow stream source is not connected to a multi-table stream")
+	}
+	if s.readStarted {
+		s.mu.Unlock()
+		return nil, fmt.Errorf("arrow stream source can only be read once")
+	}
+	s.readStarted = true
+	frames := s.frames
+	tables := s.tables
+	tableSchemas := s.tableSchemas
+	s.mu.Unlock()
+
+	results := make(chan source.RecordBatchResult, 8)
+	pipes := make([]*io.PipeWriter, len(tables))
+
+	var wg sync.WaitGroup
+	for i, table := range tables {
+		pipeReader, pipeWriter := io.Pipe()
+		pipes[i] = pipeWriter
+
+		wg.Add(1)
+		go func(name string, expected *arrow.Schema) {
+			defer wg.Done()
+			readTableStream(ctx, pipeReader, name, expected, opts.ReadOptions, results)
+		}(table.Name, tableSchemas[i])
+	}
+
+	go func() {
+		defer close(results)
+
+		open, err := demuxFrames(frames, pipes)
+		for _, pipe := range pipes {
+			if err != nil {
+				_ = pipe.CloseWithError(err)
+			} else {
+				_ = pipe.Close()
+			}
+		}
+		wg.Wait()
+
+		// Tables that were still open already reported err through their pipes.
+		if err != nil && open == 0 {
+			select {
+			case results <- source.RecordBatchResult{Err: err}:
+			case <-ctx.Done():
+			}
+		}
+	}()
+
+	return results, nil
+}
+
+// readTableStream forwards one table's Arrow IPC stream from its pipe. Input
+// left over after --sql-limit is discarded so frames for other tables keep
+// flowing; on cancellation the pipe is closed to stop the demultiplexer.
+func readTableStream(
+	ctx context.Context,
+	input *io.PipeReader,
+	tableName string,
+	expected *arrow.Schema,
+	opts source.ReadOptions,
+	results chan<- source.RecordBatchResult,
+) {
+	reader, arrowSchema, err := newRecordReader(input)
+	if err == nil && !arrowSchema.Equal(expected) {
+		reader.Release()
+		err = fmt.Errorf("schema does not match the multi-table stream header")
+	}
+	if err != nil {
+		_ = input.CloseWithError(err)
+		select {
+		case results <- source.RecordBatchResult{Err: fmt.Errorf("failed to read arrow stream for table %s: %w", tableName, err), TableName: tableName}:
+		case <-ctx.Done():
+		}
+		return
+	}
+	if !forwardRecords(ctx, reader, tableName, opts, results) {
+		_ = input.CloseWithError(ctx.Err())
+		reader.Release()
+		return
+	}
+	// Release does not wait for the reader's goroutine, which may still be
+	// reading a message; whatever it does not read is discarded here.
+	reader.Release()
+	_, _ = io.Copy(io.Discard, input)
+}
+
+// demuxFrames copies each frame's payload into its table's pipe until the
+// input ends, closing a table's pipe at its zero-length frame. It returns the
+// number of tables that were still open when it stopped.
+func demuxFrames(input io.Reader, pipes []*io.PipeWriter) (int, error) {
+	open := len(pipes)
+	finished := make([]bool, len(pipes))
+	var frameHeader [8]byte
+
+	for {
+		if _, err := io.ReadFull(input, frameHeader[:]); err != nil {
+			if errors.Is(err, io.EOF) {
+				if open == 0 {
+					return 0, nil
+				}
+				return open, fmt.Errorf("multi-table arrow stream ended before all tables were complete")
+			}
+			return open, fmt.Errorf("failed to read multi-table arrow stream frame: %w", err)
+		}
+
+		index := binary.LittleEndian.Uint32(frameHeader[:4])
+		length := binary.LittleEndian.Uint32(frameHeader[4:])
+		if uint64(index) >= uint64(len(pipes)) || finished[index] {
+			return open, fmt.Errorf("multi-table arrow stream frame refers to unknown or finished table %d", index)
+		}
+
+		if length == 0 {
+			finished[index] = true
+			open--
+			_ = pipes[index].Close()
+			continue
+		}
+
+		if _, err := io.CopyN(pipes[index], input, int64(length)); err != nil {
+			return open, fmt.Errorf("failed to forward multi-table arrow stream frame for table %d: %w", index, err)
+		}
+	}
+}
+
+func readMultiTableHeader(input io.Reader) (*multiTableHeader, error) {
+	magic := make([]byte, len(multiTableMagic))
+	if _, err := io.ReadFull(input, magic); err != nil {
+		return nil, fmt.Errorf("failed to read multi-table arrow stream header: %w", err)
+	}
+	if string(magic) != multiTableMagic {
+		return nil, fmt.Errorf("input is not a multi-table arrow stream")
+	}
+
+	var size uint32
+	if err := binary.Read(input, binary.LittleEndian, &size); err != nil {
+		return nil, fmt.Errorf("failed to read multi-table arrow stream header: %w", err)
+	}
+	if size > maxMultiTableHeaderSize {
+		return nil, fmt.Errorf("multi-table arrow stream header is too large: %d bytes", size)
+	}
+
+	payload := make([]byte, size)
+	if _, err := io.ReadFull(input, payload); err != nil {
+		return nil, fmt.Errorf("failed to read multi-table arrow stream header: %w", err)
+	}
+
+	var header multiTableHeader
+	if err := json.Unmarshal(payload, &header); err != nil {
+		return nil, fmt.Errorf("invalid multi-table arrow stream header: %w", err)
+	}
+	return &header, nil
+}
+
+func decodeSchemaMessage(message []byte) (*arrow.Schema, error) {
+	reader, err := ipc.NewReader(bytes.NewReader(message), ipc.WithAllocator(memory.DefaultAllocator))
+	if err != nil {
+		return nil, err
+	}
+	defer reader.Release()
+
+	return reader.Schema(), nil
+}
+
+var _ source.MultiTableSource = (*ArrowStreamSource)(nil)
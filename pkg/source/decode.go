@@ -0,0 +1,62 @@
+package source
+
+import (
+	"context"
+	"runtime"
+
+	"github.com/apache/arrow-go/v18/arrow"
+)
+
+// DecodeWorkers returns how many record batches the Arrow IPC sources decode
+// at once. Decoding includes decompressing LZ4/ZSTD-compressed buffers, which
+// dominates the read time of compressed input.
+func DecodeWorkers() int {
+	return min(runtime.GOMAXPROCS(0), 8)
+}
+
+// DecodeInOrder runs each function received from decodes on its own
+// goroutine, at most workers at a time, and sends the results to the returned
+// channel in the order the functions were received. The channel is closed
+// once decodes is closed and every result has been sent. After ctx is
+// cancelled, results are released instead of sent; the caller must still
+// close decodes, and can wait for the channel to close to know that no decode
+// is running.
+func DecodeInOrder(ctx context.Context, decodes <-chan func() (arrow.RecordBatch, error), workers int) <-chan RecordBatchResult {
+	workers = max(workers, 1)
+	out := make(chan RecordBatchResult)
+	pending := make(chan chan RecordBatchResult, workers)
+	sem := make(chan struct{}, workers)
+
+	go func() {
+		defer close(pending)
+		for decode := range decodes {
+			slot := make(chan RecordBatchResult, 1)
+			sem <- struct{}{}
+			go func() {
+				defer func() { <-sem }()
+				batch, err := decode()
+				slot <- RecordBatchResult{Batch: batch, Err: err}
+			}()
+			pending <- slot
+		}
+	}()
+
+	go func() {
+		defer close(out)
+		for slot := range pending {
+			result := <-slot
+			if ctx.Err() == nil {
+				select {
+				case out <- result:
+					continue
+				case <-ctx.Done():
+				}
+			}
+			if result.Batch != nil {
+				result.Batch.Release()
+			}
+		}
+	}()
+
+	return out
+}
@@ -0,0 +1,91 @@
+package source
+
+import (
+	"context"
+	"sync/atomic"
+	"testing"
+	"time"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/array"
+	"github.com/apache/arrow-go/v18/arrow/memory"
+	"github.com/stretchr/testify/assert"
+	"github.com/stretchr/testify/require"
+)
+
+func int64Batch(t *testing.T, mem memory.Allocator, value int64) arrow.RecordBatch {
+	t.Helper()
+
+	s := arrow.NewSchema([]arrow.Field{{Name: "id", Type: arrow.PrimitiveTypes.Int64}}, nil)
+	builder := array.NewRecordBuilder(mem, s)
+	defer builder.Release()
+	builder.Field(0).(*array.Int64Builder).Append(value)
+	return builder.NewRecordBatch()
+}
+
+func TestDecodeInOrderKeepsOrderAndBoundsConcurrency(t *testing.T) {
+	t.Parallel()
+
+	mem := memory.NewCheckedAllocator(memory.NewGoAllocator())
+	defer mem.AssertSize(t, 0)
+
+	const workers = 3
+	var running, peak atomic.Int32
+	decodes := make(chan func() (arrow.RecordBatch, error))
+	go func() {
+		defer close(decodes)
+		for i := range 20 {
+			decodes <- func() (arrow.RecordBatch, error) {
+				now := running.Add(1)
+				for {
+					seen := peak.Load()
+					if now <= seen || peak.CompareAndSwap(seen, now) {
+						break
+					}
+				}
+				// Later batches finish first.
+				time.Sleep(time.Duration(20-i) * time.Millisecond)
+				running.Add(-1)
+				return int64Batch(t, mem, int64(i)), nil
+			}
+		}
+	}()
+
+	var got []int64
+	for result := range DecodeInOrder(context.Background(), decodes, workers) {
+		require.NoError(t, result.Err)
+		got = append(got, result.Batch.Column(0).(*array.Int64).Value(0))
+		result.Batch.Release()
+	}
+
+	require.Len(t, got, 20)
+	for i, value := range got {
+		assert.Equal(t, int64(i), value)
+	}
+	assert.LessOrEqual(t, peak.Load(), int32(workers))
+	assert.Greater(t, peak.Load(), int32(1))
+}
+
+func TestDecodeInOrderReleasesResultsAfterCancel(t *testing.T) {
+	t.Parallel()
+
+	mem := memory.NewCheckedAllocator(memory.NewGoAllocator())
+	defer mem.AssertSize(t, 0)
+
+	ctx, cancel := context.WithCancel(context.Background())
+	decodes := make(chan func() (arrow.RecordBatch, error), 10)
+	for i := range 10 {
+		decodes <- func() (arrow.RecordBatch, error) { return int64Batch(t, mem, int64(i)), nil }
+	}
+	close(decodes)
+
+	results := DecodeInOrder(ctx, decodes, 4)
+	first := <-results
+	require.NoError(t, first.Err)
+	first.Batch.Release()
+
+	cancel()
+	for result := range results {
+		result.Batch.Release()
+	}
+}
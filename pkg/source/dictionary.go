@@ -0,0 +1,78 @@
+package source
+
+import (
+	"context"
+	"fmt"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/array"
+	"github.com/apache/arrow-go/v18/arrow/compute"
+)
+
+// HasDictionaryFields reports whether any top-level field of s is
+// dictionary-encoded.
+func HasDictionaryFields(s *arrow.Schema) bool {
+	for _, field := range s.Fields() {
+		if field.Type.ID() == arrow.DICTIONARY {
+			return true
+		}
+	}
+	return false
+}
+
+// DecodeDictionarySchema returns s with each dictionary-encoded field replaced
+// by a field of its value type.
+func DecodeDictionarySchema(s *arrow.Schema) *arrow.Schema {
+	if !HasDictionaryFields(s) {
+		return s
+	}
+
+	fields := make([]arrow.Field, s.NumFields())
+	for i, field := range s.Fields() {
+		if dictType, ok := field.Type.(*arrow.DictionaryType); ok {
+			field.Type = dictType.ValueType
+		}
+		fields[i] = field
+	}
+	metadata := s.Metadata()
+	return arrow.NewSchema(fields, &metadata)
+}
+
+// DecodeDictionaries replaces the dictionary-encoded columns of record with
+// dense arrays of their value type, so destinations only ever see the plain
+// types reported in the source schema. Sources call it per forwarded slice,
+// so only rows that are actually sent are decoded.
+//
+// It takes ownership of record: when record has no dictionary columns it is
+// returned as is, otherwise it is released and a new record is returned.
+func DecodeDictionaries(ctx context.Context, record arrow.RecordBatch) (arrow.RecordBatch, error) {
+	s := record.Schema()
+	if !HasDictionaryFields(s) {
+		return record, nil
+	}
+	defer record.Release()
+
+	columns := make([]arrow.Array, record.NumCols())
+	var decoded []arrow.Array
+	defer func() {
+		for _, arr := range decoded {
+			arr.Release()
+		}
+	}()
+
+	for i, col := range record.Columns() {
+		dict, ok := col.(*array.Dictionary)
+		if !ok {
+			columns[i] = col
+			continue
+		}
+		dense, err := compute.TakeArray(ctx, dict.Dictionary(), dict.Indices())
+		if err != nil {
+			return nil, fmt.Errorf("failed to decode dictionary column %s: %w", s.Field(i).Name, err)
+		}
+		decoded = append(decoded, dense)
+		columns[i] = dense
+	}
+
+	return array.NewRecordBatch(DecodeDictionarySchema(s), columns, record.NumRows()), nil
+}
@@ -0,0 +1,65 @@
+package source
+
+import (
+	"context"
+	"testing"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/array"
+	"github.com/apache/arrow-go/v18/arrow/memory"
+	"github.com/stretchr/testify/assert"
+	"github.com/stretchr/testify/require"
+)
+
+func TestDecodeDictionariesReplacesDictionaryColumns(t *testing.T) {
+	t.Parallel()
+
+	mem := memory.NewCheckedAllocator(memory.NewGoAllocator())
+	defer mem.AssertSize(t, 0)
+
+	dictType := &arrow.DictionaryType{IndexType: arrow.PrimitiveTypes.Int32, ValueType: arrow.BinaryTypes.String}
+	s := arrow.NewSchema([]arrow.Field{
+		{Name: "id", Type: arrow.PrimitiveTypes.Int64},
+		{Name: "status", Type: dictType, Nullable: true},
+	}, nil)
+
+	builder := array.NewRecordBuilder(mem, s)
+	defer builder.Release()
+	builder.Field(0).(*array.Int64Builder).AppendValues([]int64{1, 2, 3, 4}, nil)
+	statuses := builder.Field(1).(*array.BinaryDictionaryBuilder)
+	require.NoError(t, statuses.AppendString("open"))
+	require.NoError(t, statuses.AppendString("closed"))
+	statuses.AppendNull()
+	require.NoError(t, statuses.AppendString("open"))
+	record := builder.NewRecordBatch()
+
+	decoded, err := DecodeDictionaries(context.Background(), record.NewSlice(1, 4))
+	record.Release()
+	require.NoError(t, err)
+	defer decoded.Release()
+
+	assert.Equal(t, arrow.BinaryTypes.String, decoded.Schema().Field(1).Type)
+	assert.True(t, decoded.Schema().Field(1).Nullable)
+	status := decoded.Column(1).(*array.String)
+	require.Equal(t, 3, status.Len())
+	assert.Equal(t, "closed", status.Value(0))
+	assert.True(t, status.IsNull(1))
+	assert.Equal(t, "open", status.Value(2))
+	assert.Equal(t, int64(3), decoded.Column(0).(*array.Int64).Value(1))
+}
+
+func TestDecodeDictionariesReturnsDenseRecordsUnchanged(t *testing.T) {
+	t.Parallel()
+
+	s := arrow.NewSchema([]arrow.Field{{Name: "id", Type: arrow.PrimitiveTypes.Int64}}, nil)
+	builder := array.NewRecordBuilder(memory.DefaultAllocator, s)
+	defer builder.Release()
+	builder.Field(0).(*array.Int64Builder).Append(1)
+	record := builder.NewRecordBatch()
+	defer record.Release()
+
+	decoded, err := DecodeDictionaries(context.Background(), record)
+	require.NoError(t, err)
+	assert.Same(t, record, decoded)
+	assert.Same(t, s, DecodeDictionarySchema(s))
+}
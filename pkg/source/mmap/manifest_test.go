@@ -0,0 +1,40 @@
+package mmap
+
+import (
+	"os"
+	"testing"
+
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/array"
+	"github.com/apache/arrow-go/v18/arrow/ipc"
+	"github.com/apache/arrow-go/v18/arrow/memory"
+	"github.com/stretchr/testify/require"
+)
+
+// writeSegmentArrowFile writes one segment file with a single record batch of
+// rows sequential ids starting at first.
+func writeSegmentArrowFile(t *testing.T, path string, first, rows int) {
+	t.Helper()
+
+	arrowSchema := arrow.NewSchema([]arrow.Field{
+		{Name: "id", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
+	}, nil)
+
+	builder := array.NewRecordBuilder(memory.DefaultAllocator, arrowSchema)
+	defer builder.Release()
+	ids := builder.Field(0).(*array.Int64Builder)
+	for i := 0; i < rows; i++ {
+		ids.Append(int64(first + i))
+	}
+	record := builder.NewRecordBatch()
+	defer record.Release()
+
+	file, err := os.Create(path)
+	require.NoError(t, err)
+	defer func() { _ = file.Close() }()
+
+	writer, err := ipc.NewFileWriter(file, ipc.WithSchema(arrowSchema))
+	require.NoError(t, err)
+	require.NoError(t, writer.Write(record))
+	require.NoError(t, writer.Close())
+}
@@ -1,12 +1,18 @@
 package mmap
 
 import (
+	"bytes"
 	"context"
 	"fmt"
 	"io"
+	"net/url"
 	"os"
+	"path/filepath"
 	"sort"
+	"strconv"
 	"strings"
+	"sync"
+	"sync/atomic"
 	"time"
 
 	"github.com/apache/arrow-go/v18/arrow"
@@ -22,13 +28,31 @@ import (
 )
 
 type MMapSource struct {
-	filePaths   []string
-	arrowSchema *arrow.Schema
-	knownSchema *schema.TableSchema
+	filePaths       []string
+	manifestPath    string
+	waitTimeout     time.Duration
+	readParallelism int
+	ordered         *bool
+	arrowSchema     *arrow.Schema
+	knownSchema     *schema.TableSchema
 }
 
 const (
 	defaultReadChannelBufferSize = 8
+
+	// A path ending in manifestSuffix names a segment manifest: one Arrow file
+	// per line, appended by the producer as each segment is complete, followed
+	// by manifestEndMarker (or manifestAbortMarker if the producer failed).
+	manifestSuffix       = ".manifest"
+	manifestEndMarker    = "#end"
+	manifestAbortMarker  = "#abort"
+	manifestPollInterval = 20 * time.Millisecond
+
+	// defaultManifestWaitTimeout is how long a manifest may go without a new
+	// segment or a newer modification time before its producer is taken to
+	// be gone. The Python SDK touches its manifest every few seconds until
+	// it writes the end marker.
+	defaultManifestWaitTimeout = 10 * time.Minute
 )
 
 func NewMMapSource() *MMapSource {
@@ -40,14 +64,37 @@ func (s *MMapSource) Schemes() []string {
 }
 
 func (s *MMapSource) Connect(ctx context.Context, uri string) error {
-	path := extractFilePath(uri)
+	path, params, err := splitReadParams(extractFilePath(uri))
+	if err != nil {
+		return err
+	}
 	if path == "" {
 		return fmt.Errorf("invalid mmap URI: %s", uri)
 	}
 
-	filePaths, err := resolveFilePaths(path)
-	if err != nil {
-		return err
+	waitTimeout := defaultManifestWaitTimeout
+	if params.waitTimeout != nil {
+		waitTimeout = *params.waitTimeout
+	}
+
+	var manifestPath string
+	var filePaths []string
+	if isManifestPath(path) {
+		manifest, err := waitForManifest(ctx, path, 0, waitTimeout)
+		if err != nil {
+			return err
+		}
+		if len(manifest.segments) == 0 {
+			return fmt.Errorf("mmap manifest lists no segments: %s", path)
+		}
+		manifestPath = path
+		filePaths = manifest.segments
+	} else {
+		resolved, err := resolveFilePaths(path)
+		if err != nil {
+			return err
+		}
+		filePaths = resolved
 	}
 
 	arrowSchema, err := readArrowSchema(filePaths[0])
@@ -56,6 +103,10 @@ func (s *MMapSource) Connect(ctx context.Context, uri string) error {
 	}
 
 	s.filePaths = filePaths
+	s.manifestPath = manifestPath
+	s.waitTimeout = waitTimeout
+	s.readParallelism = params.parallelism
+	s.ordered = params.ordered
 	s.arrowSchema = arrowSchema
 	s.knownSchema = schemaFromArrow(arrowSchema, "")
 
@@ -65,6 +116,10 @@ func (s *MMapSource) Connect(ctx context.Context, uri string) error {
 
 func (s *MMapSource) Close(ctx context.Context) error {
 	s.filePaths = nil
+	s.manifestPath = ""
+	s.waitTimeout = 0
+	s.readParallelism = 0
+	s.ordered = nil
 	s.arrowSchema = nil
 	s.knownSchema = nil
 	return nil
@@ -104,22 +159,47 @@ func (s *MMapSource) GetTable(ctx context.Context, req source.TableRequest) (sou
 			}, nil
 		},
 		ReadFn: func(ctx context.Context, opts source.ReadOptions) (<-chan source.RecordBatchResult, error) {
-			return s.read(ctx, opts)
+			return s.read(ctx, opts, strategy)
 		},
 	}, nil
 }
 
-func (s *MMapSource) read(ctx context.Context, opts source.ReadOptions) (<-chan source.RecordBatchResult, error) {
+func (s *MMapSource) read(
+	ctx context.Context,
+	opts source.ReadOptions,
+	strategy config.IncrementalStrategy,
+) (<-chan source.RecordBatchResult, error) {
 	if len(s.filePaths) == 0 {
 		return nil, fmt.Errorf("mmap source is not connected")
 	}
 
+	filePaths := s.filePaths
+	manifestPath := s.manifestPath
+	waitTimeout := s.waitTimeout
+
+	// The URI's read_parallelism wins over --extract-parallelism. Without a
+	// manifest there is no point in more readers than files.
+	parallelism := s.readParallelism
+	if parallelism <= 0 {
+		parallelism = opts.Parallelism
+	}
+	if parallelism <= 0 {
+		parallelism = 1
+	}
+	if manifestPath == "" {
+		parallelism = min(parallelism, len(filePaths))
+	}
+	ordered := orderedByDefault(strategy)
+	if s.ordered != nil {
+		ordered = *s.ordered
+	}
+
 	startTotal := time.Now()
-	config.Debug("[MMAP] Starting read from %d file(s)", len(s.filePaths))
+	config.Debug("[MMAP] Starting read from %d file(s) with parallelism %d (ordered: %v)",
+		len(filePaths), parallelism, ordered)
 
 	results := make(chan source.RecordBatchResult, defaultReadChannelBufferSize)
 
-	filePaths := s.filePaths
 	go func() {
 		defer close(results)
 
@@ -135,54 +215,207 @@ func (s *MMapSource) read(ctx context.Context, opts source.ReadOptions) (<-chan
 
 		exclude := buildExcludeSet(opts.ExcludeColumns)
 
+		// Files read at the same time share the record batch decode workers.
+		decodeWorkers := max(1, source.DecodeWorkers()/parallelism)
+
+		readCtx, cancelReads := context.WithCancel(ctx)
+		defer cancelReads()
+
+		// In ordered mode every file gets its own channel, and the channels
+		// are queued in pending in file order, at most parallelism ahead of
+		// the file being forwarded. Otherwise all files share one channel.
+		jobs := make(chan fileJob)
+		pending := make(chan chan source.RecordBatchResult, parallelism)
+		shared := make(chan source.RecordBatchResult, defaultReadChannelBufferSize)
+
+		go func() {
+			defer close(jobs)
+			defer close(pending)
+
+			submit := func(job fileJob) bool {
+				if ordered {
+					out := make(chan source.RecordBatchResult, defaultReadChannelBufferSize)
+					select {
+					case pending <- out:
+					case <-readCtx.Done():
+						return false
+					}
+					job.out = out
+				} else {
+					job.out = shared
+				}
+				select {
+				case jobs <- job:
+					return true
+				case <-readCtx.Done():
+					if ordered {
+						close(job.out)
+					}
+					return false
+				}
+			}
+
+			// Without a manifest the file list is final. With one, segments
+			// are read as they are published until the manifest is marked
+			// complete.
+			complete := manifestPath == ""
+			processed := 0
+			for {
+				for ; processed < len(filePaths); processed++ {
+					if !submit(fileJob{path: filePaths[processed]}) {
+						return
+					}
+				}
+				if complete {
+					return
+				}
+
+				manifest, err := waitForManifest(readCtx, manifestPath, processed, waitTimeout)
+				if err != nil {
+					if readCtx.Err() == nil {
+						submit(fileJob{err: err})
+					}
+					return
+				}
+				filePaths = manifest.segments
+				complete = manifest.complete
+			}
+		}()
+
+		var filesRead atomic.Int64
+		var wg sync.WaitGroup
+		for range parallelism {
+			wg.Add(1)
+			go func() {
+				defer wg.Done()
+				for job := range jobs {
+					err := job.err
+					if err == nil {
+						err = readFile(readCtx, job.path, exclude, batchSize, decodeWorkers, job.out)
+					}
+					if err != nil {
+						select {
+						case job.out <- source.RecordBatchResult{Err: err}:
+						case <-readCtx.Done():
+						}
+					} else {
+						filesRead.Add(1)
+					}
+					if ordered {
+						close(job.out)
+					}
+				}
+			}()
+		}
+		go func() {
+			wg.Wait()
+			close(shared)
+		}()
+
+		// The limit is applied here, after the files are merged, so it stays
+		// exact however many files are read at once. Once it is reached or an
+		// error is forwarded, the readers are cancelled and what they already
+		// produced is released.
 		batchNum := 0
 		totalRows := int64(0)
+		stopped := false
+		forward := func(result source.RecordBatchResult) {
+			if stopped {
+				if result.Batch != nil {
+					result.Batch.Release()
+				}
+				return
+			}
+			if result.Err != nil {
+				select {
+				case results <- result:
+				case <-ctx.Done():
+				}
+				stopped = true
+				cancelReads()
+				return
+			}
 
-		for _, filePath := range filePaths {
-			if limit > 0 && totalRows >= limit {
-				break
+			batch := result.Batch
+			rows := batch.NumRows()
+			if limit > 0 && totalRows+rows > limit {
+				rows = limit - totalRows
+				sliced := batch.NewSlice(0, rows)
+				batch.Release()
+				batch = sliced
 			}
 
 			select {
+			case results <- source.RecordBatchResult{Batch: batch}:
 			case <-ctx.Done():
+				batch.Release()
+				stopped = true
+				cancelReads()
 				return
-			default:
 			}
 
-			done, err := readFile(ctx, filePath, exclude, batchSize, limit, &totalRows, &batchNum, results)
-			if err != nil {
-				results <- source.RecordBatchResult{Err: err}
-				return
+			totalRows += rows
+			batchNum++
+			config.Debug("[MMAP] Batch %d: %d rows (total: %d)", batchNum, rows, totalRows)
+			if limit > 0 && totalRows >= limit {
+				stopped = true
+				cancelReads()
+			}
+		}
+
+		if ordered {
+			for out := range pending {
+				for result := range out {
+					forward(result)
+				}
 			}
-			if done {
-				break
+		} else {
+			for result := range shared {
+				forward(result)
 			}
 		}
 
 		config.Debug("[MMAP] Total: %d rows in %d batches from %d file(s), read time: %v",
-			totalRows, batchNum, len(filePaths), time.Since(startTotal))
+			totalRows, batchNum, filesRead.Load(), time.Since(startTotal))
 	}()
 
 	return results, nil
 }
 
-// readFile reads all record batches from a single Arrow IPC file.
-// It returns true if the limit has been reached and reading should stop.
+// fileJob is one file for a read worker, or an error to report in its place.
+type fileJob struct {
+	path string
+	err  error
+	out  chan<- source.RecordBatchResult
+}
+
+// orderedByDefault reports whether strategy needs the rows in the order of
+// the files, such as merge, where the last row for a key wins.
+func orderedByDefault(strategy config.IncrementalStrategy) bool {
+	switch strategy {
+	case config.StrategyMerge, config.StrategyDeleteInsert, config.StrategySCD2:
+		return true
+	default:
+		return false
+	}
+}
+
+// readFile sends all record batches from a single Arrow IPC file to out, split
+// into chunks of at most batchSize rows. It returns nil without reading the
+// rest of the file once ctx is cancelled.
 func readFile(
 	ctx context.Context,
 	filePath string,
 	exclude map[string]struct{},
 	batchSize int,
-	limit int64,
-	totalRows *int64,
-	batchNum *int,
-	results chan<- source.RecordBatchResult,
-) (bool, error) {
+	decodeWorkers int,
+	out chan<- source.RecordBatchResult,
+) error {
 	config.Debug("[MMAP] Reading file: %s", filePath)
 
 	mapped, err := xpmmap.Open(filePath)
 	if err != nil {
-		return false, fmt.Errorf("failed to open mmap file %s: %w", filePath, err)
+		return fmt.Errorf("failed to open mmap file %s: %w", filePath, err)
 	}
 	defer func() { _ = mapped.Close() }()
 
@@ -191,76 +424,93 @@ func readFile(
 		ipc.WithAllocator(memory.DefaultAllocator),
 	)
 	if err != nil {
-		return false, fmt.Errorf("failed to create arrow file reader for %s: %w", filePath, err)
+		return fmt.Errorf("failed to create arrow file reader for %s: %w", filePath, err)
 	}
 	defer func() { _ = reader.Close() }()
 
 	recordCount := reader.NumRecords()
 	if recordCount == 0 {
 		config.Debug("[MMAP] file has no record batches: %s", filePath)
-		return false, nil
+		return nil
 	}
 
-	for recIdx := 0; recIdx < recordCount; recIdx++ {
-		if limit > 0 && *totalRows >= limit {
-			return true, nil
-		}
-
-		record, err := reader.RecordBatch(recIdx)
-		if err != nil {
-			return false, fmt.Errorf("failed to read record batch %d from %s: %w", recIdx, filePath, err)
+	// Record batches are decoded, and decompressed when the file is
+	// compressed, on up to decodeWorkers goroutines ahead of this loop. The
+	// deferred drain waits for them before the file is unmapped.
+	//
+	// The IPC reader has no field projection: RecordBatchAt copies and
+	// decompresses every column, excluded ones included. Excluded columns
+	// are only dropped on the decode goroutine right after that, so they are
+	// not queued, sliced or dictionary-decoded.
+	decodeCtx, cancelDecodes := context.WithCancel(ctx)
+	decodes := make(chan func() (arrow.RecordBatch, error))
+	go func() {
+		defer close(decodes)
+		for recIdx := range recordCount {
+			decode := func() (arrow.RecordBatch, error) {
+				record, err := reader.RecordBatchAt(recIdx)
+				if err != nil {
+					return nil, fmt.Errorf("failed to read record batch %d from %s: %w", recIdx, filePath, err)
+				}
+				filtered, sameRecord := applyExcludeColumns(record, exclude)
+				if !sameRecord {
+					record.Release()
+				}
+				return filtered, nil
+			}
+			select {
+			case decodes <- decode:
+			case <-decodeCtx.Done():
+				return
+			}
 		}
-
-		filtered, sameRecord := applyExcludeColumns(record, exclude)
-
-		rows := filtered.NumRows()
-		if rows == 0 {
-			// When sameRecord is true, filtered IS record, so one Release covers both.
-			filtered.Release()
-			if !sameRecord {
-				record.Release()
+	}()
+	records := source.DecodeInOrder(decodeCtx, decodes, min(decodeWorkers, recordCount))
+	defer func() {
+		cancelDecodes()
+		for result := range records {
+			if result.Batch != nil {
+				result.Batch.Release()
 			}
-			continue
 		}
+	}()
 
-		maxRows := rows
-		if limit > 0 && *totalRows+maxRows > limit {
-			maxRows = limit - *totalRows
+	recIdx := -1
+	for result := range records {
+		recIdx++
+		if result.Err != nil {
+			return result.Err
 		}
+		record := result.Batch
 
+		rows := record.NumRows()
 		var offset int64
-		for offset < maxRows {
-			chunkSize := maxRows - offset
+		for offset < rows {
+			chunkSize := rows - offset
 			if batchSize > 0 && chunkSize > int64(batchSize) {
 				chunkSize = int64(batchSize)
 			}
 
-			chunk := filtered.NewSlice(offset, offset+chunkSize)
+			chunk, err := source.DecodeDictionaries(ctx, record.NewSlice(offset, offset+chunkSize))
+			if err != nil {
+				record.Release()
+				return fmt.Errorf("failed to read record batch %d from %s: %w", recIdx, filePath, err)
+			}
 
 			select {
-			case results <- source.RecordBatchResult{Batch: chunk}:
+			case out <- source.RecordBatchResult{Batch: chunk}:
 			case <-ctx.Done():
 				chunk.Release()
-				filtered.Release()
-				if !sameRecord {
-					record.Release()
-				}
-				return true, nil
+				record.Release()
+				return nil
 			}
-
 			offset += chunkSize
-			*totalRows += chunkSize
-			*batchNum++
-			config.Debug("[MMAP] Batch %d: %d rows (total: %d)", *batchNum, chunkSize, *totalRows)
 		}
 
-		filtered.Release()
-		if !sameRecord {
-			record.Release()
-		}
+		record.Release()
 	}
 
-	return false, nil
+	return nil
 }
 
 func resolveFilePaths(path string) ([]string, error) {
@@ -287,6 +537,92 @@ func resolveFilePaths(path string) ([]string, error) {
 	return matches, nil
 }
 
+type segmentManifest struct {
+	segments []string
+	complete bool
+}
+
+// readManifest parses the complete lines of a segment manifest. Segment paths
+// are relative to the manifest's directory unless they are absolute.
+func readManifest(path string) (segmentManifest, error) {
+	data, err := os.ReadFile(path)
+	if err != nil {
+		return segmentManifest{}, fmt.Errorf("failed to read mmap manifest: %w", err)
+	}
+
+	// A trailing line without a newline is still being written.
+	data = data[:bytes.LastIndexByte(data, '\n')+1]
+
+	var manifest segmentManifest
+	dir := filepath.Dir(path)
+	for _, line := range strings.Split(string(data), "\n") {
+		line = strings.TrimSpace(line)
+		switch line {
+		case "":
+			continue
+		case manifestEndMarker:
+			manifest.complete = true
+			return manifest, nil
+		case manifestAbortMarker:
+			return manifest, fmt.Errorf("mmap manifest was aborted by its producer: %s", path)
+		}
+
+		if !filepath.IsAbs(line) {
+			line = filepath.Join(dir, line)
+		}
+		manifest.segments = append(manifest.segments, line)
+	}
+
+	return manifest, nil
+}
+
+// waitForManifest polls the manifest until it lists more than seen segments or
+// is marked complete. It fails once the manifest has not been modified for
+// timeout, as its producer has then most likely exited without marking it;
+// a timeout of 0 waits for as long as ctx allows.
+func waitForManifest(ctx context.Context, path string, seen int, timeout time.Duration) (segmentManifest, error) {
+	ticker := time.NewTicker(manifestPollInterval)
+	defer ticker.Stop()
+
+	var modified time.Time
+	lastChange := time.Now()
+	for {
+		info, err := os.Stat(path)
+		if err != nil {
+			return segmentManifest{}, fmt.Errorf("failed to read mmap manifest: %w", err)
+		}
+		manifest, err := readManifest(path)
+		if err != nil {
+			return manifest, err
+		}
+		if manifest.complete || len(manifest.segments) > seen {
+			return manifest, nil
+		}
+
+		// Staleness is measured on the local clock from when a change was
+		// seen, so clock skew with the producer's file system does not matter.
+		if !info.ModTime().Equal(modified) {
+			modified = info.ModTime()
+			lastChange = time.Now()
+		} else if timeout > 0 && time.Since(lastChange) >= timeout {
+			return manifest, fmt.Errorf(
+				"mmap manifest %s has not changed for %s and is not marked %s; its producer appears to have stopped (set ?wait_timeout= to wait longer)",
+				path, timeout, manifestEndMarker,
+			)
+		}
+
+		select {
+		case <-ctx.Done():
+			return manifest, ctx.Err()
+		case <-ticker.C:
+		}
+	}
+}
+
+func isManifestPath(path string) bool {
+	return strings.HasSuffix(path, manifestSuffix)
+}
+
 func isGlobPattern(path string) bool {
 	return strings.ContainsAny(path, "*?[")
 }
@@ -302,6 +638,65 @@ func extractFilePath(uri string) string {
 	return ""
 }
 
+// readParams are the read options given in the query of an mmap URI.
+type readParams struct {
+	parallelism int
+	ordered     *bool
+	waitTimeout *time.Duration
+}
+
+var knownReadParams = map[string]struct{}{
+	"read_parallelism": {},
+	"ordered":          {},
+	"wait_timeout":     {},
+}
+
+// splitReadParams splits the read options, such as
+// ?read_parallelism=4&ordered=true, off the end of an mmap path. As ? is also
+// a glob wildcard, the text after the last ? is only taken as a query when
+// all of its keys are read options.
+func splitReadParams(path string) (string, readParams, error) {
+	var params readParams
+
+	idx := strings.LastIndex(path, "?")
+	if idx < 0 {
+		return path, params, nil
+	}
+	query, err := url.ParseQuery(path[idx+1:])
+	if err != nil || len(query) == 0 {
+		return path, params, nil
+	}
+	for key := range query {
+		if _, ok := knownReadParams[key]; !ok {
+			return path, params, nil
+		}
+	}
+
+	if value := query.Get("read_parallelism"); value != "" {
+		parallelism, err := strconv.Atoi(value)
+		if err != nil || parallelism <= 0 {
+			return "", params, fmt.Errorf("invalid mmap read_parallelism %q: must be a positive integer", value)
+		}
+		params.parallelism = parallelism
+	}
+	if value := query.Get("ordered"); value != "" {
+		ordered, err := strconv.ParseBool(value)
+		if err != nil {
+			return "", params, fmt.Errorf("invalid mmap ordered %q: must be true or false", value)
+		}
+		params.ordered = &ordered
+	}
+	if value := query.Get("wait_timeout"); value != "" {
+		timeout, err := time.ParseDuration(value)
+		if err != nil || timeout < 0 {
+			return "", params, fmt.Errorf("invalid mmap wait_timeout %q: must be a duration such as 30s or 5m, or 0 to wait forever", value)
+		}
+		params.waitTimeout = &timeout
+	}
+
+	return path[:idx], params, nil
+}
+
 func buildExcludeSet(exclude []string) map[string]struct{} {
 	if len(exclude) == 0 {
 		return nil
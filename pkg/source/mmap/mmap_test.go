@@ -4,9 +4,16 @@ import (
 	"context"
 	"database/sql"
 	"fmt"
+	"os"
 	"path/filepath"
 	"testing"
+	"time"
 
+	"github.com/apache/arrow-go/v18/arrow"
+	"github.com/apache/arrow-go/v18/arrow/array"
+	"github.com/apache/arrow-go/v18/arrow/ipc"
+	"github.com/apache/arrow-go/v18/arrow/memory"
+	"github.com/bruin-data/ingestr/internal/config"
 	"github.com/bruin-data/ingestr/pkg/destination"
 	"github.com/bruin-data/ingestr/pkg/destination/duckdb"
 	"github.com/bruin-data/ingestr/pkg/source"
@@ -137,6 +144,325 @@ func TestMMapSourceGlobPattern(t *testing.T) {
 	assert.Equal(t, int64(totalRows-1), maxID)
 }
 
+func TestMMapSourceReadsCompressedFileInOrder(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	path := filepath.Join(t.TempDir(), "compressed.arrow")
+	writeSequentialArrowFile(t, path, 0, 30, 100, ipc.WithZstd())
+
+	src := NewMMapSource()
+	require.NoError(t, src.Connect(ctx, "mmap://"+path))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "events"})
+	require.NoError(t, err)
+	results, err := table.Read(ctx, source.ReadOptions{PageSize: 64, Limit: 2950})
+	require.NoError(t, err)
+
+	next := int64(0)
+	for result := range results {
+		require.NoError(t, result.Err)
+		ids := result.Batch.Column(0).(*array.Int64)
+		for i := 0; i < ids.Len(); i++ {
+			require.Equal(t, next, ids.Value(i))
+			next++
+		}
+		result.Batch.Release()
+	}
+	assert.Equal(t, int64(2950), next)
+}
+
+// writeSequentialArrowFiles writes files Arrow files of batches record batches
+// of rows rows each to dir, with ids counting up from 0 across the files in
+// name order, and returns a glob matching them.
+func writeSequentialArrowFiles(t *testing.T, dir string, files, batches, rows int) string {
+	t.Helper()
+
+	for i := range files {
+		path := filepath.Join(dir, fmt.Sprintf("part-%03d.arrow", i))
+		writeSequentialArrowFile(t, path, i*batches*rows, batches, rows)
+	}
+	return filepath.Join(dir, "part-*.arrow")
+}
+
+func TestMMapSourceReadsFilesInParallelWithExactLimit(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	glob := writeSequentialArrowFiles(t, t.TempDir(), 6, 5, 100)
+
+	src := NewMMapSource()
+	require.NoError(t, src.Connect(ctx, "mmap://"+glob+"?read_parallelism=3"))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+	require.Len(t, src.filePaths, 6)
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "events"})
+	require.NoError(t, err)
+	results, err := table.Read(ctx, source.ReadOptions{PageSize: 64, Limit: 1234})
+	require.NoError(t, err)
+
+	seen := make(map[int64]struct{})
+	for result := range results {
+		require.NoError(t, result.Err)
+		ids := result.Batch.Column(0).(*array.Int64)
+		for i := 0; i < ids.Len(); i++ {
+			seen[ids.Value(i)] = struct{}{}
+		}
+		result.Batch.Release()
+	}
+	assert.Len(t, seen, 1234)
+}
+
+func TestMMapSourceKeepsFileOrderForMerge(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	glob := writeSequentialArrowFiles(t, t.TempDir(), 8, 3, 100)
+
+	src := NewMMapSource()
+	require.NoError(t, src.Connect(ctx, "mmap://"+glob))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "events", Strategy: config.StrategyMerge})
+	require.NoError(t, err)
+	results, err := table.Read(ctx, source.ReadOptions{PageSize: 64, Parallelism: 4, Limit: 2250})
+	require.NoError(t, err)
+
+	next := int64(0)
+	for result := range results {
+		require.NoError(t, result.Err)
+		ids := result.Batch.Column(0).(*array.Int64)
+		for i := 0; i < ids.Len(); i++ {
+			require.Equal(t, next, ids.Value(i))
+			next++
+		}
+		result.Batch.Release()
+	}
+	assert.Equal(t, int64(2250), next)
+}
+
+func TestMMapSourceDropsExcludedColumnsOnDecode(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	path := filepath.Join(t.TempDir(), "excluded.arrow")
+	writeSequentialArrowFile(t, path, 0, 4, 100, ipc.WithLZ4())
+
+	src := NewMMapSource()
+	require.NoError(t, src.Connect(ctx, "mmap://"+path))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "events"})
+	require.NoError(t, err)
+	results, err := table.Read(ctx, source.ReadOptions{PageSize: 64, ExcludeColumns: []string{"ID"}})
+	require.NoError(t, err)
+
+	var rows int64
+	for result := range results {
+		require.NoError(t, result.Err)
+		assert.Zero(t, result.Batch.Schema().NumFields())
+		rows += result.Batch.NumRows()
+		result.Batch.Release()
+	}
+	assert.Equal(t, int64(400), rows)
+}
+
+func TestSplitReadParams(t *testing.T) {
+	t.Parallel()
+
+	path, params, err := splitReadParams("/data/part-*.arrow?read_parallelism=4&ordered=false")
+	require.NoError(t, err)
+	assert.Equal(t, "/data/part-*.arrow", path)
+	assert.Equal(t, 4, params.parallelism)
+	require.NotNil(t, params.ordered)
+	assert.False(t, *params.ordered)
+
+	// A ? that is not followed by read options is a glob wildcard.
+	path, params, err = splitReadParams("/data/part-00?.arrow")
+	require.NoError(t, err)
+	assert.Equal(t, "/data/part-00?.arrow", path)
+	assert.Zero(t, params.parallelism)
+	assert.Nil(t, params.ordered)
+
+	_, _, err = splitReadParams("/data/source.arrow?read_parallelism=0")
+	require.ErrorContains(t, err, "read_parallelism")
+	_, _, err = splitReadParams("/data/source.arrow?ordered=sometimes")
+	require.ErrorContains(t, err, "ordered")
+
+	path, params, err = splitReadParams("/data/segments.manifest?wait_timeout=90s")
+	require.NoError(t, err)
+	assert.Equal(t, "/data/segments.manifest", path)
+	require.NotNil(t, params.waitTimeout)
+	assert.Equal(t, 90*time.Second, *params.waitTimeout)
+	_, _, err = splitReadParams("/data/segments.manifest?wait_timeout=soon")
+	require.ErrorContains(t, err, "wait_timeout")
+}
+
+func TestMMapSourceTailsSegmentManifest(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	dir := t.TempDir()
+	manifestPath := filepath.Join(dir, "segments.manifest")
+
+	writeSegmentArrowFile(t, filepath.Join(dir, "segment-000000.arrow"), 0, 3)
+	appendToManifest(t, manifestPath, "segment-000000.arrow\n")
+
+	src := NewMMapSource()
+	require.NoError(t, src.Connect(ctx, "mmap://"+manifestPath))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "rows"})
+	require.NoError(t, err)
+
+	results, err := table.Read(ctx, source.ReadOptions{})
+	require.NoError(t, err)
+
+	first := <-results
+	require.NoError(t, first.Err)
+	rows := first.Batch.NumRows()
+	first.Batch.Release()
+
+	// The second segment is published only after the first one has been read.
+	writeSegmentArrowFile(t, filepath.Join(dir, "segment-000001.arrow"), 3, 4)
+	appendToManifest(t, manifestPath, "segment-000001.arrow\n"+manifestEndMarker+"\n")
+
+	for result := range results {
+		require.NoError(t, result.Err)
+		rows += result.Batch.NumRows()
+		result.Batch.Release()
+	}
+	assert.Equal(t, int64(7), rows)
+}
+
+func TestMMapSourceReportsAbortedSegmentManifest(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	dir := t.TempDir()
+	manifestPath := filepath.Join(dir, "segments.manifest")
+
+	writeSegmentArrowFile(t, filepath.Join(dir, "segment-000000.arrow"), 0, 3)
+	appendToManifest(t, manifestPath, "segment-000000.arrow\n")
+
+	src := NewMMapSource()
+	require.NoError(t, src.Connect(ctx, "mmap://"+manifestPath))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "rows"})
+	require.NoError(t, err)
+
+	appendToManifest(t, manifestPath, manifestAbortMarker+"\n")
+	results, err := table.Read(ctx, source.ReadOptions{})
+	require.NoError(t, err)
+
+	var readErr error
+	for result := range results {
+		if result.Err != nil {
+			readErr = result.Err
+			continue
+		}
+		result.Batch.Release()
+	}
+	require.ErrorContains(t, readErr, "aborted")
+}
+
+func TestMMapSourceConnectFailsOnStaleEmptyManifest(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	manifestPath := filepath.Join(t.TempDir(), "segments.manifest")
+	appendToManifest(t, manifestPath, "")
+
+	src := NewMMapSource()
+	err := src.Connect(ctx, "mmap://"+manifestPath+"?wait_timeout=100ms")
+	require.ErrorContains(t, err, "has not changed for 100ms")
+}
+
+func TestMMapSourceReadFailsWhenManifestProducerStops(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	dir := t.TempDir()
+	manifestPath := filepath.Join(dir, "segments.manifest")
+
+	writeSegmentArrowFile(t, filepath.Join(dir, "segment-000000.arrow"), 0, 3)
+	appendToManifest(t, manifestPath, "segment-000000.arrow\n")
+
+	src := NewMMapSource()
+	require.NoError(t, src.Connect(ctx, "mmap://"+manifestPath+"?wait_timeout=100ms"))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	table, err := src.GetTable(ctx, source.TableRequest{Name: "rows"})
+	require.NoError(t, err)
+	results, err := table.Read(ctx, source.ReadOptions{})
+	require.NoError(t, err)
+
+	var rows int64
+	var readErr error
+	for result := range results {
+		if result.Err != nil {
+			readErr = result.Err
+			continue
+		}
+		rows += result.Batch.NumRows()
+		result.Batch.Release()
+	}
+	assert.Equal(t, int64(3), rows)
+	require.ErrorContains(t, readErr, "producer appears to have stopped")
+}
+
+func TestReadManifestIgnoresPartialLine(t *testing.T) {
+	t.Parallel()
+
+	dir := t.TempDir()
+	manifestPath := filepath.Join(dir, "segments.manifest")
+	appendToManifest(t, manifestPath, "segment-000000.arrow\nsegment-0000")
+
+	manifest, err := readManifest(manifestPath)
+	require.NoError(t, err)
+	assert.Equal(t, []string{filepath.Join(dir, "segment-000000.arrow")}, manifest.segments)
+	assert.False(t, manifest.complete)
+}
+
+// writeSequentialArrowFile writes an Arrow file of batches record batches of
+// rows rows each, with ids counting up from first across the file.
+func writeSequentialArrowFile(t *testing.T, path string, first, batches, rows int, opts ...ipc.Option) {
+	t.Helper()
+
+	arrowSchema := arrow.NewSchema([]arrow.Field{{Name: "id", Type: arrow.PrimitiveTypes.Int64}}, nil)
+	file, err := os.Create(path)
+	require.NoError(t, err)
+	defer func() { _ = file.Close() }()
+
+	writer, err := ipc.NewFileWriter(file, append([]ipc.Option{ipc.WithSchema(arrowSchema)}, opts...)...)
+	require.NoError(t, err)
+	for i := range batches {
+		builder := array.NewInt64Builder(memory.DefaultAllocator)
+		for id := first + i*rows; id < first+(i+1)*rows; id++ {
+			builder.Append(int64(id))
+		}
+		ids := builder.NewArray()
+		builder.Release()
+		record := array.NewRecordBatch(arrowSchema, []arrow.Array{ids}, int64(rows))
+		require.NoError(t, writer.Write(record))
+		record.Release()
+		ids.Release()
+	}
+	require.NoError(t, writer.Close())
+}
+
+func appendToManifest(t *testing.T, path, lines string) {
+	t.Helper()
+
+	file, err := os.OpenFile(path, os.O_APPEND|os.O_CREATE|os.O_WRONLY, 0o644)
+	require.NoError(t, err)
+	_, err = file.WriteString(lines)
+	require.NoError(t, err)
+	require.NoError(t, file.Close())
+}
+
 func expectedScoreSum(totalRows int) int64 {
 	var sum int64
 	for i := 0; i < totalRows; i++ {
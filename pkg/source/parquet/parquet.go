@@ -192,7 +192,14 @@ func readFile(
 		return false, fmt.Errorf("failed to create parquet arrow reader: %w", err)
 	}
 
-	rr, err := fr.GetRecordReader(ctx, nil, nil)
+	// Only the column chunks of the fields that are kept are read and
+	// decompressed. Past this point the records have no excluded columns.
+	columns := projectedColumns(fr.Manifest, exclude)
+	if columns != nil {
+		exclude = nil
+	}
+
+	rr, err := fr.GetRecordReader(ctx, columns, nil)
 	if err != nil {
 		return false, fmt.Errorf("failed to get parquet record reader: %w", err)
 	}
@@ -264,6 +271,42 @@ func readFile(
 	return false, nil
 }
 
+// projectedColumns returns the leaf column indices of the fields that are not
+// excluded. It returns nil, which reads every column, when no field is
+// excluded or when every field is, as an empty projection cannot be read.
+func projectedColumns(manifest *pqarrow.SchemaManifest, exclude map[string]struct{}) []int {
+	if len(exclude) == 0 {
+		return nil
+	}
+
+	var columns []int
+	hasExcluded := false
+	for _, field := range manifest.Fields {
+		if _, skip := exclude[strings.ToLower(field.Field.Name)]; skip {
+			hasExcluded = true
+			continue
+		}
+		columns = appendLeafColumns(columns, field)
+	}
+
+	if !hasExcluded || len(columns) == 0 {
+		return nil
+	}
+	return columns
+}
+
+// appendLeafColumns appends the parquet leaf columns that make up field,
+// which is more than one for nested types.
+func appendLeafColumns(columns []int, field pqarrow.SchemaField) []int {
+	if field.IsLeaf() {
+		return append(columns, field.ColIndex)
+	}
+	for _, child := range field.Children {
+		columns = appendLeafColumns(columns, child)
+	}
+	return columns
+}
+
 func readParquetSchema(filePath string) (*arrow.Schema, error) {
 	f, err := os.Open(filePath)
 	if err != nil {
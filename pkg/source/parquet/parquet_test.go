@@ -13,6 +13,7 @@ import (
 	"github.com/apache/arrow-go/v18/arrow/array"
 	"github.com/apache/arrow-go/v18/arrow/memory"
 	pqgo "github.com/apache/arrow-go/v18/parquet"
+	"github.com/apache/arrow-go/v18/parquet/file"
 	"github.com/apache/arrow-go/v18/parquet/pqarrow"
 	"github.com/bruin-data/ingestr/pkg/destination"
 	"github.com/bruin-data/ingestr/pkg/destination/duckdb"
@@ -137,6 +138,49 @@ func TestParquetSource_ExcludeColumns(t *testing.T) {
 	}
 }
 
+func TestParquetSource_ExcludeColumnsSkipsColumnChunks(t *testing.T) {
+	t.Parallel()
+
+	ctx := context.Background()
+	parquetPath := filepath.Join(t.TempDir(), "nested.parquet")
+	writeNestedParquet(t, parquetPath)
+
+	f, err := os.Open(parquetPath)
+	require.NoError(t, err)
+	t.Cleanup(func() { _ = f.Close() })
+	pr, err := file.NewParquetReader(f)
+	require.NoError(t, err)
+	fr, err := pqarrow.NewFileReader(pr, pqarrow.ArrowReadProperties{}, memory.DefaultAllocator)
+	require.NoError(t, err)
+
+	// id, payload.a, payload.b and note are leaf columns 0 to 3.
+	assert.Equal(t, []int{0, 3}, projectedColumns(fr.Manifest, buildExcludeSet([]string{"PAYLOAD"})))
+	assert.Equal(t, []int{1, 2}, projectedColumns(fr.Manifest, buildExcludeSet([]string{"id", "note"})))
+	assert.Nil(t, projectedColumns(fr.Manifest, buildExcludeSet([]string{"missing"})))
+	assert.Nil(t, projectedColumns(fr.Manifest, buildExcludeSet([]string{"id", "payload", "note"})))
+
+	src := NewParquetSource()
+	require.NoError(t, src.Connect(ctx, "parquet://"+parquetPath))
+	t.Cleanup(func() { _ = src.Close(ctx) })
+
+	tbl, err := src.GetTable(ctx, source.TableRequest{Name: "nested"})
+	require.NoError(t, err)
+	results, err := tbl.Read(ctx, source.ReadOptions{ExcludeColumns: []string{"payload"}})
+	require.NoError(t, err)
+
+	var rows int64
+	for r := range results {
+		require.NoError(t, r.Err)
+		require.Equal(t, 2, r.Batch.Schema().NumFields())
+		assert.Equal(t, "id", r.Batch.Schema().Field(0).Name)
+		assert.Equal(t, "note", r.Batch.Schema().Field(1).Name)
+		assert.Equal(t, "note_2", r.Batch.Column(1).(*array.String).Value(1))
+		rows += r.Batch.NumRows()
+		r.Batch.Release()
+	}
+	assert.Equal(t, int64(3), rows)
+}
+
 func TestParquetSource_Glob(t *testing.T) {
 	t.Parallel()
 
@@ -422,6 +466,44 @@ func writeRichParquet(t *testing.T, path string) {
 	require.NoError(t, w.Close())
 }
 
+func writeNestedParquet(t *testing.T, path string) {
+	t.Helper()
+
+	payloadType := arrow.StructOf(
+		arrow.Field{Name: "a", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
+		arrow.Field{Name: "b", Type: arrow.BinaryTypes.String, Nullable: true},
+	)
+	schema := arrow.NewSchema([]arrow.Field{
+		{Name: "id", Type: arrow.PrimitiveTypes.Int64, Nullable: false},
+		{Name: "payload", Type: payloadType, Nullable: true},
+		{Name: "note", Type: arrow.BinaryTypes.String, Nullable: true},
+	}, nil)
+
+	bld := array.NewRecordBuilder(memory.DefaultAllocator, schema)
+	defer bld.Release()
+
+	payload := bld.Field(1).(*array.StructBuilder)
+	for i := 0; i < 3; i++ {
+		bld.Field(0).(*array.Int64Builder).Append(int64(i + 1))
+		payload.Append(true)
+		payload.FieldBuilder(0).(*array.Int64Builder).Append(int64(i * 10))
+		payload.FieldBuilder(1).(*array.StringBuilder).Append(fmt.Sprintf("b_%d", i+1))
+		bld.Field(2).(*array.StringBuilder).Append(fmt.Sprintf("note_%d", i+1))
+	}
+
+	rec := bld.NewRecordBatch()
+	defer rec.Release()
+
+	f, err := os.Create(path)
+	require.NoError(t, err)
+	defer func() { _ = f.Close() }()
+
+	w, err := pqarrow.NewFileWriter(schema, f, pqgo.NewWriterProperties(), pqarrow.DefaultWriterProps())
+	require.NoError(t, err)
+	require.NoError(t, w.WriteBuffered(rec))
+	require.NoError(t, w.Close())
+}
+
 func openDuckDBForTest(t *testing.T, path string) *sql.DB {
 	t.Helper()
 	db, err := sql.Open("adbc_generic", fmt.Sprintf("driver=duckdb;path=%s", path))
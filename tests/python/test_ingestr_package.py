@@ -1,12 +1,26 @@
+import asyncio
+import base64
+import collections
+import contextlib
 import hashlib
+import http.server
 import io
+import json
+import logging
 import os
+import socket
+import struct
 import subprocess
+import sys
 import tarfile
 import tempfile
+import threading
+import time
 import unittest
+from collections import namedtuple
 from dataclasses import dataclass
 from datetime import date, datetime
+from decimal import Decimal
 from pathlib import Path
 from unittest.mock import patch
 
@@ -19,6 +33,16 @@ try:
 except ImportError:
     pa = None
 
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
 
 class NonClosingBytesIO(io.BytesIO):
     def close(self):
@@ -49,7 +73,36 @@ class FakePopen:
         return self.returncode
 
 
+class FakeJobPopen:
+    """A finished ingestr process with fixed text output."""
+
+    def __init__(self, args, returncode, output, errors="", **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        self.stdout = io.StringIO(output)
+        self.stderr = io.StringIO(errors)
+        self.returncode = returncode
+
+    def wait(self):
+        return self.returncode
+
+
+def ingestr_output_logger(name):
+    logger = logging.getLogger(name)
+    logger.records = []
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = []
+    handler = logging.Handler()
+    handler.emit = logger.records.append
+    logger.addHandler(handler)
+    return logger
+
+
 class IngestrPackageTest(unittest.TestCase):
+    def setUp(self):
+        ingestr_runner._clear_binary_path_cache()
+
     def test_build_ingest_args_maps_python_values_to_cli_flags(self):
         args = ingestr.build_ingest_args(
             source_uri="postgres://source",
@@ -191,6 +244,101 @@ class IngestrPackageTest(unittest.TestCase):
                 with patch("ingestr._runner._local_binary_dirs", return_value=[Path(tmp)]):
                     self.assertEqual(ingestr.binary_path(), str(executable))
 
+    def test_binary_path_is_memoized_until_env_or_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            first = Path(tmp) / "ingestr"
+            second = Path(tmp) / "ingestr-next"
+            for executable in (first, second):
+                executable.write_text("#!/bin/sh\n", encoding="utf-8")
+
+            with patch.dict(os.environ, {"INGESTR_BINARY_PATH": str(first)}):
+                resolve = patch("ingestr._runner._resolve_binary_path", wraps=ingestr_runner._resolve_binary_path)
+                with resolve as resolved:
+                    self.assertEqual(ingestr.binary_path(), str(first))
+                    self.assertEqual(ingestr.binary_path(), str(first))
+                    self.assertEqual(resolved.call_count, 1)
+
+                    os.utime(first, ns=(0, 0))
+                    self.assertEqual(ingestr.binary_path(), str(first))
+                    self.assertEqual(resolved.call_count, 2)
+
+                    os.environ["INGESTR_BINARY_PATH"] = str(second)
+                    self.assertEqual(ingestr.binary_path(), str(second))
+                    self.assertEqual(resolved.call_count, 3)
+
+                    second.unlink()
+                    with self.assertRaises(ingestr.IngestrNotFoundError):
+                        ingestr.binary_path()
+
+    def test_import_ingestr_defers_sdk_and_download_modules(self):
+        script = (
+            "import json, sys\n"
+            "import ingestr\n"
+            "before = set(sys.modules)\n"
+            "ingestr.ingest, ingestr.aingest, ingestr.run_many, ingestr.__version__\n"
+            "print(json.dumps([sorted(before), sorted(set(sys.modules) - before)]))\n"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", script],
+            env={**os.environ, "PYTHONPATH": str(Path(ingestr.__file__).resolve().parents[1])},
+            stdout=subprocess.PIPE,
+            check=True,
+        )
+        before, loaded_later = json.loads(completed.stdout)
+
+        deferred = {
+            "asyncio",
+            "concurrent.futures",
+            "hashlib",
+            "importlib.metadata",
+            "ingestr._data",
+            "logging",
+            "platform",
+            "tarfile",
+            "tempfile",
+            "urllib.request",
+            "zipfile",
+        }
+        self.assertEqual(deferred & set(before), set())
+        self.assertLessEqual({"asyncio", "ingestr._async", "ingestr._data", "ingestr._jobs"}, set(loaded_later))
+
+    def test_import_and_first_call_latency_benchmark(self):
+        script = (
+            "import sys, time\n"
+            "started = time.perf_counter()\n"
+            "import ingestr\n"
+            "imported = time.perf_counter()\n"
+            "ingestr.binary_path()\n"
+            "first_call = time.perf_counter()\n"
+            "for _ in range(1000):\n"
+            "    ingestr.binary_path()\n"
+            "repeated = time.perf_counter()\n"
+            "ingestr.ingest, ingestr.aingest, ingestr.run_many\n"
+            "sdk = time.perf_counter()\n"
+            "print(imported - started, first_call - imported, (repeated - first_call) / 1000, sdk - imported)\n"
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            executable = Path(tmp) / "ingestr"
+            executable.write_text("#!/bin/sh\n", encoding="utf-8")
+            env = {
+                **os.environ,
+                "PYTHONPATH": str(Path(ingestr.__file__).resolve().parents[1]),
+                "INGESTR_BINARY_PATH": str(executable),
+            }
+            samples = []
+            # The first run may compile bytecode; keep the best of the rest.
+            for _ in range(4):
+                completed = subprocess.run(
+                    [sys.executable, "-c", script], env=env, stdout=subprocess.PIPE, check=True
+                )
+                samples.append([float(value) for value in completed.stdout.split()])
+            import_time, first_call, repeated_call, sdk_import = (min(column) for column in zip(*samples[1:]))
+
+        # Absolute timings depend on the machine, so compare against the work
+        # that is now deferred: the data SDK imports and an unmemoized lookup.
+        self.assertLess(import_time, sdk_import)
+        self.assertLess(repeated_call, first_call)
+
     def test_binary_path_downloads_release_binary(self):
         binary = b"#!/bin/sh\necho ingestr\n"
 
@@ -257,6 +405,113 @@ class IngestrPackageTest(unittest.TestCase):
                 "this happens once per version and may take a moment\n",
             )
 
+    def test_binary_path_downloads_once_across_concurrent_processes(self):
+        binary = b"#!/bin/sh\necho ingestr\n"
+        script = (
+            "import sys\n"
+            "import ingestr._runner as runner\n"
+            "runner._GITHUB_RELEASE_BASE_URL = sys.argv[1]\n"
+            "runner.ARCHIVE_SHA256.clear()\n"
+            "runner.ARCHIVE_SHA256['v1.2.3'] = {'ingestr_Linux_x86_64.tar.gz': sys.argv[2]}\n"
+            "runner._local_binary_path = lambda: None\n"
+            "runner._release_platform = lambda: runner._ReleasePlatform('Linux', 'x86_64', 'tar.gz', 'ingestr')\n"
+            "print(runner.binary_path())\n"
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            archive_path = root / "ingestr_Linux_x86_64.tar.gz"
+            _write_tar_binary(archive_path, "ingestr", binary)
+            checksum = hashlib.sha256(archive_path.read_bytes()).hexdigest()
+            env = {
+                **os.environ,
+                "PYTHONPATH": str(Path(ingestr.__file__).resolve().parents[1]),
+                "INGESTR_BINARY_CACHE_DIR": str(root / "cache"),
+                "INGESTR_BINARY_TAG": "v1.2.3",
+            }
+            env.pop("INGESTR_BINARY_PATH", None)
+
+            with _serve_release_archive(archive_path.read_bytes(), delay=0.5) as (base_url, requests):
+                procs = [
+                    subprocess.Popen(
+                        [sys.executable, "-c", script, base_url, checksum],
+                        env=env,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                    )
+                    for _ in range(4)
+                ]
+                outputs = [proc.communicate(timeout=60) for proc in procs]
+
+            self.assertEqual([proc.returncode for proc in procs], [0] * 4, outputs)
+            paths = {stdout.decode().strip() for stdout, _ in outputs}
+            self.assertEqual(len(paths), 1)
+            self.assertEqual(Path(paths.pop()).read_bytes(), binary)
+            self.assertEqual(requests, ["/v1.2.3/ingestr_Linux_x86_64.tar.gz"])
+            # The lock and every temporary download directory are cleaned up.
+            cache_dir = root / "cache" / "bin" / "v1.2.3" / "Linux_x86_64"
+            self.assertEqual([entry.name for entry in cache_dir.iterdir()], ["ingestr"])
+
+    def test_binary_path_recovers_stale_download_locks(self):
+        binary = b"#!/bin/sh\necho ingestr\n"
+        stale_age = ingestr_runner._DOWNLOAD_LOCK_STALE_SECONDS + 1
+        # The heartbeat decides even for a live pid on this host, which may
+        # be a different process in another PID namespace.
+        stale_holders = {
+            "this host": ("%s:%d:abc" % (socket.gethostname(), os.getpid()), stale_age),
+            "other host": ("other-host:1:abc", stale_age),
+        }
+
+        for label, (holder, age) in stale_holders.items():
+            with self.subTest(label), tempfile.TemporaryDirectory() as tmp:
+                root = Path(tmp)
+                archive_path = root / "ingestr_Linux_x86_64.tar.gz"
+                _write_tar_binary(archive_path, "ingestr", binary)
+                checksum = hashlib.sha256(archive_path.read_bytes()).hexdigest()
+                checksums = {"v1.2.3": {"ingestr_Linux_x86_64.tar.gz": checksum}}
+                lock = root / "cache" / "bin" / "v1.2.3" / "Linux_x86_64" / "ingestr.lock"
+                lock.parent.mkdir(parents=True)
+                lock.write_text(holder)
+                os.utime(lock, (time.time() - age, time.time() - age))
+
+                release = ingestr_runner._ReleasePlatform("Linux", "x86_64", "tar.gz", "ingestr")
+                env = {"INGESTR_BINARY_CACHE_DIR": str(root / "cache"), "INGESTR_BINARY_TAG": "v1.2.3"}
+                with _serve_release_archive(archive_path.read_bytes()) as (base_url, requests):
+                    with patch.dict(os.environ, env, clear=True):
+                        with patch("ingestr._runner._local_binary_path", return_value=None):
+                            with patch("ingestr._runner._release_platform", return_value=release):
+                                with patch.dict(ingestr_runner.ARCHIVE_SHA256, checksums, clear=True):
+                                    with patch("ingestr._runner._GITHUB_RELEASE_BASE_URL", base_url):
+                                        with patch("sys.stderr", io.StringIO()):
+                                            path = Path(ingestr.binary_path())
+
+                self.assertEqual(path.read_bytes(), binary)
+                self.assertEqual(len(requests), 1)
+                self.assertFalse(lock.exists())
+
+    def test_download_lock_keeps_a_lock_refreshed_before_it_is_broken(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "ingestr.lock"
+            path.write_text("other-host:1:abc")
+            stale = time.time() - ingestr_runner._DOWNLOAD_LOCK_STALE_SECONDS - 1
+            os.utime(path, (stale, stale))
+            rename = os.rename
+
+            def refresh_then_rename(src, dst):
+                # The holder's heartbeat lands between the check and the rename.
+                os.utime(src)
+                rename(src, dst)
+
+            with patch("ingestr._runner.os.rename", side_effect=refresh_then_rename):
+                ingestr_runner._DownloadLock(path)._break_if_stale()
+
+            self.assertEqual(path.read_text(), "other-host:1:abc")
+            self.assertEqual([entry.name for entry in Path(tmp).iterdir()], ["ingestr.lock"])
+
+            os.utime(path, (stale, stale))
+            ingestr_runner._DownloadLock(path)._break_if_stale()
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
     def test_binary_path_uses_tag_specific_checksum_for_tag_override(self):
         binary = b"#!/bin/sh\necho ingestr\n"
 
@@ -405,6 +660,278 @@ class IngestrPackageTest(unittest.TestCase):
         table = pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())).read_all()
         self.assertEqual(table.to_pylist(), [{"id": 1, "name": "Ada"}, {"id": 2, "name": "Grace"}])
 
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_ingest_many_multiplexes_tables_over_one_stream(self):
+        fake = None
+
+        def popen(*args, **kwargs):
+            nonlocal fake
+            fake = FakePopen(*args, **kwargs)
+            return fake
+
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=popen):
+                result = ingestr.ingest_many(
+                    {
+                        "main.people": [{"id": 1, "name": "Ada"}, {"id": 2, "name": "Grace"}],
+                        "main.scores": ({"person_id": i, "score": i * 0.5} for i in range(5)),
+                    },
+                    dest_uri="duckdb:///tmp/out.duckdb",
+                    batch_size=2,
+                    primary_keys={"main.people": ["id"]},
+                )
+
+        self.assertEqual(result.process.returncode, 0)
+        self.assertEqual(result.rows, {"main.people": 2, "main.scores": 5})
+        self.assertIn("arrow-stream://-?multi_table=true", fake.args)
+        self.assertNotIn("--dest-table", fake.args)
+
+        payload = fake.stdin_buffer.getvalue()
+        self.assertEqual(payload[:8], b"ARROWMT1")
+        (header_size,) = struct.unpack_from("<I", payload, 8)
+        header = json.loads(payload[12 : 12 + header_size])
+        self.assertEqual([table["name"] for table in header["tables"]], ["main.people", "main.scores"])
+        self.assertEqual(header["tables"][0]["primary_keys"], ["id"])
+        self.assertNotIn("primary_keys", header["tables"][1])
+
+        streams = [b"", b""]
+        ended = [False, False]
+        offset = 12 + header_size
+        while offset < len(payload):
+            index, length = struct.unpack_from("<II", payload, offset)
+            offset += 8
+            if length == 0:
+                ended[index] = True
+                continue
+            streams[index] += payload[offset : offset + length]
+            offset += length
+
+        self.assertEqual(ended, [True, True])
+        people = pa.ipc.open_stream(pa.BufferReader(streams[0])).read_all()
+        scores = pa.ipc.open_stream(pa.BufferReader(streams[1])).read_all()
+        self.assertEqual(people.to_pylist(), [{"id": 1, "name": "Ada"}, {"id": 2, "name": "Grace"}])
+        self.assertEqual(scores.column("person_id").to_pylist(), list(range(5)))
+        header_schema = pa.ipc.read_schema(pa.py_buffer(base64.b64decode(header["tables"][1]["schema"])))
+        self.assertEqual(header_schema, scores.schema)
+
+    def test_ingest_many_rejects_single_table_options(self):
+        with self.assertRaisesRegex(ValueError, "dest_table"):
+            ingestr.ingest_many({"main.people": [{"id": 1}]}, dest_uri="duckdb:///tmp/out.duckdb", dest_table="x")
+        with self.assertRaisesRegex(ValueError, "not being ingested"):
+            ingestr.ingest_many(
+                {"main.people": [{"id": 1}]},
+                dest_uri="duckdb:///tmp/out.duckdb",
+                primary_keys={"main.other": ["id"]},
+            )
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    @unittest.skipIf(os.name == "nt", "fake ingestr executable uses a shebang")
+    def test_worker_pool_reuses_worker_process_across_calls(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            executable = _write_fake_worker_executable(Path(tmp))
+            with ingestr.WorkerPool(size=1, executable=executable) as pool:
+                first = pool.ingest([{"id": 1}, {"id": 2}], dest_uri="duckdb:///tmp/out.duckdb", dest_table="a")
+                second = pool.ingest([{"id": 3}], dest_uri="duckdb:///tmp/out.duckdb", dest_table="b")
+                failed = pool.ingest([{"id": 4}], dest_uri="duckdb:///tmp/out.duckdb", dest_table="fail", check=False)
+                with self.assertRaises(subprocess.CalledProcessError):
+                    pool.ingest([{"id": 5}], dest_uri="duckdb:///tmp/out.duckdb", dest_table="fail")
+
+        self.assertEqual(first.returncode, 0)
+        self.assertIn("--dest-table", first.args)
+        self.assertIn(b"loaded 2 rows into a", first.stdout)
+        self.assertIn(b"loaded 1 rows into b", second.stdout)
+        self.assertEqual(first.stdout.split()[1], second.stdout.split()[1])
+        self.assertEqual(failed.returncode, 1)
+        self.assertEqual(failed.stdout.split()[1], first.stdout.split()[1])
+        self.assertEqual(first.stderr, b"warning for a\n")
+        self.assertEqual(second.stderr, b"warning for b\n")
+        self.assertEqual(failed.stderr, b"warning for fail\n")
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    @unittest.skipIf(os.name == "nt", "fake ingestr executable uses a shebang")
+    def test_worker_pool_stops_idle_workers_after_ttl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            executable = _write_fake_worker_executable(Path(tmp))
+            with ingestr.WorkerPool(size=2, idle_ttl=0.1, executable=executable) as pool:
+                first = pool.ingest([{"id": 1}], dest_uri="duckdb:///tmp/out.duckdb", dest_table="a")
+                deadline = time.monotonic() + 5
+                while pool._running and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                self.assertEqual(pool._running, 0)
+                second = pool.ingest([{"id": 2}], dest_uri="duckdb:///tmp/out.duckdb", dest_table="a")
+
+        self.assertNotEqual(first.stdout.split()[1], second.stdout.split()[1])
+
+    def test_worker_pool_rejects_per_call_process_options(self):
+        with ingestr.WorkerPool(size=1, idle_ttl=None, executable="/tmp/ingestr") as pool:
+            with self.assertRaisesRegex(ValueError, "WorkerPool"):
+                pool.ingest([{"id": 1}], dest_uri="duckdb:///tmp/out.duckdb", dest_table="a", env={})
+        with self.assertRaisesRegex(ValueError, "size"):
+            ingestr.WorkerPool(size=0)
+
+    def test_run_many_retries_transient_failures_and_reports_results_in_job_order(self):
+        calls = []
+
+        def fake_run(args, **kwargs):
+            calls.append(args)
+            table = args[args.index("--dest-table") + 1]
+            attempts = sum(1 for call in calls if table in call)
+            events = ['{"event":"progress","mem_mb":120.5}', '{"event":"progress","mem_mb":240.0}']
+            if table == "flaky" and attempts == 1:
+                events.append('{"event":"end","status":"error","error":"connection reset by peer"}')
+                return FakeJobPopen(args, 1, "\n".join(events), **kwargs)
+            if table == "broken":
+                events.append('{"event":"end","status":"error","error":"column id does not exist"}')
+                return FakeJobPopen(args, 1, "\n".join(events), **kwargs)
+            return FakeJobPopen(args, 0, "\n".join(events), **kwargs)
+
+        jobs = [
+            {"source_uri": "postgres://src", "dest_uri": "duckdb:///tmp/a.db", "dest_table": table}
+            for table in ("ok", "flaky", "broken")
+        ]
+        with patch("ingestr._jobs.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=fake_run):
+                results = ingestr.run_many(jobs, max_parallel=2, backoff=0)
+
+        self.assertEqual([result.job["dest_table"] for result in results], ["ok", "flaky", "broken"])
+        self.assertEqual([result.ok for result in results], [True, True, False])
+        self.assertEqual([result.attempts for result in results], [1, 2, 1])
+        self.assertEqual(results[0].peak_memory_mb, 240.0)
+        self.assertEqual(results[2].error, "column id does not exist")
+        self.assertTrue(all(call[call.index("--progress") + 1] == "json" for call in calls))
+
+    def test_run_many_keeps_job_progress_and_only_an_output_tail(self):
+        calls = []
+
+        def fake_run(args, **kwargs):
+            calls.append(args)
+            return FakeJobPopen(args, 0, "".join("line %d\n" % i for i in range(5000)), **kwargs)
+
+        jobs = [
+            {"source_uri": "postgres://src", "dest_uri": "duckdb:///tmp/tail.db", "dest_table": "t", "progress": "log"}
+        ]
+        with patch("ingestr._jobs.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=fake_run):
+                (result,) = ingestr.run_many(jobs)
+
+        self.assertEqual(calls[0][calls[0].index("--progress") + 1], "log")
+        self.assertIsNone(result.peak_memory_mb)
+        lines = result.stdout.splitlines()
+        self.assertEqual(len(lines), ingestr.OutputCapture().tail_lines)
+        self.assertEqual(lines[-1], "line 4999")
+
+    def test_run_many_forgets_least_recently_used_peak_memory(self):
+        def fake_run(args, **kwargs):
+            return FakeJobPopen(args, 0, '{"event":"progress","mem_mb":64.0}', **kwargs)
+
+        jobs = [
+            {"source_uri": "postgres://src", "dest_uri": "duckdb:///tmp/lru.db", "dest_table": "t%d" % i}
+            for i in range(3)
+        ]
+        with patch("ingestr._jobs.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=fake_run):
+                with patch("ingestr._jobs._PEAK_MEMORY_CACHE_SIZE", 2):
+                    with patch("ingestr._jobs._PEAK_MEMORY_MB", collections.OrderedDict()) as peaks:
+                        ingestr.run_many(jobs, max_parallel=1)
+
+        self.assertEqual([key[3] for key in peaks], ["t1", "t2"])
+
+    def test_run_many_respects_destination_and_memory_limits(self):
+        lock = threading.Lock()
+        running = collections.Counter()
+        peaks = collections.Counter()
+
+        def fake_run(args, **kwargs):
+            dest = args[args.index("--dest-uri") + 1].split("@")[-1].split("/")[0]
+            with lock:
+                running[dest] += 1
+                running["total"] += 1
+                peaks[dest] = max(peaks[dest], running[dest])
+                peaks["total"] = max(peaks["total"], running["total"])
+            time.sleep(0.02)
+            with lock:
+                running[dest] -= 1
+                running["total"] -= 1
+            return FakeJobPopen(args, 0, "", **kwargs)
+
+        jobs = [
+            {"source_uri": "postgres://src", "dest_uri": f"postgresql://user:pw@{host}/db", "dest_table": f"t{i}"}
+            for i, host in enumerate(["a", "a", "a", "b", "b", "b"])
+        ]
+        with patch("ingestr._jobs.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=fake_run):
+                results = ingestr.run_many(jobs, max_parallel=4, max_per_destination=1)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(peaks["a"], 1)
+        self.assertEqual(peaks["b"], 1)
+
+        peaks.clear()
+        with patch("ingestr._jobs.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=fake_run):
+                ingestr.run_many(jobs, max_parallel=4, memory_budget_mb=1000, default_memory_mb=600)
+        self.assertEqual(peaks["total"], 1)
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_ingest_reports_progress_events_and_result_metrics(self):
+        events = [
+            {"event": "start", "dest_table": "main.people"},
+            {"event": "progress", "rows": 1, "batches": 1, "rows_per_sec": 10.0, "mem_mb": 80.0},
+            {"event": "progress", "rows": 2, "batches": 1, "rows_per_sec": 12.0, "mem_mb": 96.5},
+            {"event": "end", "status": "success", "rows": 2, "batches": 1, "duration_sec": 0.5, "error": None},
+        ]
+        stdout = "".join(json.dumps(event) + "\n" for event in events).encode()
+        fake = None
+
+        def popen(*args, **kwargs):
+            nonlocal fake
+            fake = FakePopen(*args, **kwargs)
+            # Split mid-line to exercise incremental parsing.
+            fake.stdout = io.BufferedReader(io.BytesIO(stdout), buffer_size=7)
+            return fake
+
+        seen = []
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=popen):
+                result = ingestr.ingest(
+                    [{"id": 1}, {"id": 2}],
+                    dest_uri="duckdb:///tmp/out.duckdb",
+                    dest_table="main.people",
+                    on_progress=seen.append,
+                )
+
+        self.assertEqual(fake.args[fake.args.index("--progress") + 1], "json")
+        self.assertEqual(fake.kwargs["stdout"], subprocess.PIPE)
+        self.assertEqual([event["event"] for event in seen], ["start", "progress", "progress", "end"])
+        self.assertIsInstance(result, ingestr.IngestResult)
+        self.assertIsInstance(result, subprocess.CompletedProcess)
+        self.assertIsNone(result.stdout)
+        self.assertEqual(result.rows, 2)
+        self.assertEqual(result.batches, 1)
+        self.assertEqual(result.duration, 0.5)
+        self.assertEqual(result.rows_per_sec, 4.0)
+        self.assertEqual(result.peak_memory_mb, 96.5)
+
+    def test_progress_events_raise_callback_errors_after_exit(self):
+        def fail(event):
+            raise RuntimeError("dashboard down")
+
+        progress = ingestr_data._ProgressEvents(fail)
+        progress.feed(b'{"event":"progress","rows":1}\nnot json\n{"event":"end","rows":1,"duration_sec":0}')
+        progress.finish()
+
+        self.assertEqual(progress.rows, 1)
+        with self.assertRaisesRegex(RuntimeError, "dashboard down"):
+            progress.result(["ingestr"], 0, None, None)
+
+    def test_on_progress_requires_json_progress(self):
+        with self.assertRaisesRegex(ValueError, "progress='json'"):
+            ingestr.IngestSession(
+                dest_uri="duckdb:///tmp/out.duckdb",
+                dest_table="main.people",
+                progress="log",
+                on_progress=print,
+            )
+
     @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
     def test_ingest_stream_capture_output_collects_child_pipes(self):
         fake = None
@@ -426,6 +953,58 @@ class IngestrPackageTest(unittest.TestCase):
         self.assertEqual(result.stdout, b"captured stdout")
         self.assertEqual(result.stderr, b"captured stderr")
 
+    def test_output_capture_forwards_every_line_and_keeps_a_bounded_tail(self):
+        logger = ingestr_output_logger("ingestr.test.tail")
+        sink = ingestr.OutputCapture(logger=logger, tail_lines=3, tail_bytes=None).open()
+        tail = sink.stream("stderr")
+        for index in range(1000):
+            tail.write(f"line {index}\n".encode()[:4])
+            tail.write(f"line {index}\n".encode()[4:])
+        tail.write(b"no newline")
+        tail.close()
+
+        self.assertEqual(tail.value(), b"line 998\nline 999\nno newline")
+        self.assertEqual(len(logger.records), 1001)
+        self.assertEqual(logger.records[0].getMessage(), "line 0")
+        self.assertEqual(logger.records[0].ingestr_stream, "stderr")
+
+    def test_output_capture_bounds_tail_bytes(self):
+        sink = ingestr.OutputCapture(tail_lines=None, tail_bytes=10).open()
+        tail = sink.stream("stdout")
+        tail.write(b"aaaa\nbbbb\ncccc\n" + b"d" * 30)
+        tail.close()
+
+        self.assertEqual(tail.value(), b"d" * 10)
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_ingest_streams_output_capture_to_logger_and_rotating_file(self):
+        stdout = b"".join(f"out {index}\n".encode() for index in range(50))
+
+        def popen(*args, **kwargs):
+            fake = FakePopen(*args, **kwargs)
+            fake.stdout = io.BytesIO(stdout)
+            fake.stderr = io.BytesIO(b"warn 1\nwarn 2\n")
+            return fake
+
+        logger = ingestr_output_logger("ingestr.test.ingest")
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "ingestr.log"
+            with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+                with patch("subprocess.Popen", side_effect=popen):
+                    result = ingestr.ingest(
+                        [{"id": 1}],
+                        dest_uri="duckdb:///tmp/out.duckdb",
+                        dest_table="main.people",
+                        capture_output=ingestr.OutputCapture(logger=logger, file=log_file, tail_lines=2),
+                    )
+            written = log_file.read_text().splitlines()
+
+        self.assertEqual(result.stdout, b"out 48\nout 49\n")
+        self.assertEqual(result.stderr, b"warn 1\nwarn 2\n")
+        self.assertEqual(len(written), 52)
+        self.assertIn("out 0", written)
+        self.assertEqual(len(logger.records), 52)
+
     @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
     def test_ingest_flattens_pages_into_arrow_stream(self):
         fake = None
@@ -450,6 +1029,181 @@ class IngestrPackageTest(unittest.TestCase):
         table = pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())).read_all()
         self.assertEqual(table.to_pylist(), [{"id": 1}, {"id": 2}, {"id": 3}])
 
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_batch_bytes_sizes_wide_row_batches_by_measured_width(self):
+        rows = [{"id": index, "payload": "x" * 2000} for index in range(3000)]
+        batches = self._ingested_batches(iter(rows), batch_bytes=256 * 1024)
+
+        self.assertEqual(sum(batch.num_rows for batch in batches), 3000)
+        # The first batch is a small probe; the rest are sized from its width
+        # instead of the default 10000 rows (about 20 MB here).
+        for batch in batches[1:-1]:
+            self.assertLess(abs(batch.nbytes - 256 * 1024), 64 * 1024)
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_batch_bytes_combines_narrow_batches_and_aligns_to_page_size(self):
+        table = pa.table({"id": pa.array(range(200000), type=pa.int64())})
+        pages = [table.slice(offset, 500) for offset in range(0, 200000, 500)]
+
+        batches = self._ingested_batches(iter(pages), batch_bytes=256 * 1024)
+        self.assertEqual(sum(batch.num_rows for batch in batches), 200000)
+        self.assertLess(len(batches), 10)
+        self.assertTrue(all(batch.num_rows >= 24576 for batch in batches[:-1]))
+
+        batches = self._ingested_batches(table, batch_bytes=256 * 1024, page_size=10000)
+        self.assertEqual([batch.num_rows for batch in batches[:-1]], [30000] * 6)
+        self.assertEqual(batches[-1].num_rows, 20000)
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_batch_bytes_sends_whole_pages_until_the_last_batch(self):
+        table = pa.table({"id": pa.array(range(85000), type=pa.int64())})
+        # Pages of 8500 rows fall just short of the 10000-row target.
+        pages = [table.slice(offset, 8500) for offset in range(0, 85000, 8500)]
+
+        batches = self._ingested_batches(iter(pages), batch_bytes=80000, page_size=1000)
+
+        self.assertEqual([row for batch in batches for row in batch.column(0).to_pylist()], list(range(85000)))
+        for batch in batches[:-1]:
+            self.assertEqual(batch.num_rows % 1000, 0)
+
+    def test_batch_bytes_must_be_positive(self):
+        with self.assertRaisesRegex(ValueError, "batch_bytes"):
+            ingestr.IngestSession(dest_uri="duckdb:///tmp/out.duckdb", dest_table="main.people", batch_bytes=0)
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_dictionary_encode_sends_new_values_as_dictionary_deltas(self):
+        statuses = ["new", "paid", "shipped"]
+        rows = [{"id": "order-%d" % i, "status": statuses[min(i // 100, 2)] if i % 7 else None} for i in range(300)]
+
+        def payload(**options):
+            fake = None
+
+            def popen(*args, **kwargs):
+                nonlocal fake
+                fake = FakePopen(*args, **kwargs)
+                return fake
+
+            with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+                with patch("subprocess.Popen", side_effect=popen):
+                    ingestr.ingest(
+                        iter(rows),
+                        dest_uri="duckdb:///tmp/out.duckdb",
+                        dest_table="main.orders",
+                        batch_size=100,
+                        **options,
+                    )
+            return fake.stdin_buffer.getvalue()
+
+        encoded = payload(dictionary_encode="auto")
+        reader = pa.ipc.open_stream(pa.BufferReader(encoded))
+        table = reader.read_all()
+
+        self.assertEqual(table.schema.field("id").type, pa.string())
+        self.assertEqual(table.schema.field("status").type, pa.dictionary(pa.int32(), pa.string()))
+        self.assertEqual(reader.stats.num_dictionary_deltas, 2)
+        self.assertEqual(reader.stats.num_replaced_dictionaries, 0)
+        self.assertEqual(table.to_pylist(), rows)
+        self.assertLess(len(encoded), len(payload()))
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_dictionary_encode_extends_mmap_file_dictionaries_across_session_calls(self):
+        captured = {}
+
+        def fake_ingest(**kwargs):
+            path = kwargs["source_uri"][len("mmap://"):]
+            captured["table"] = pa.ipc.open_file(path).read_all()
+            return subprocess.CompletedProcess(["/tmp/ingestr"], 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch("ingestr._data._cli_ingest", side_effect=fake_ingest):
+                with ingestr.ingest(
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.events",
+                    transport="mmap",
+                    dictionary_encode="auto",
+                    temp_dir=tmp,
+                ) as session:
+                    session([{"kind": "click"}, {"kind": "click"}, {"kind": "view"}, {"kind": "view"}])
+                    session([{"kind": "scroll"}, {"kind": "click"}])
+
+        table = captured["table"]
+        self.assertEqual(table.schema.field("kind").type, pa.dictionary(pa.int32(), pa.string()))
+        self.assertEqual(
+            table.column("kind").to_pylist(),
+            ["click", "click", "view", "view", "scroll", "click"],
+        )
+
+    def test_dictionary_encode_must_be_auto(self):
+        with self.assertRaisesRegex(ValueError, "dictionary_encode"):
+            ingestr.IngestSession(
+                dest_uri="duckdb:///tmp/out.duckdb",
+                dest_table="main.people",
+                dictionary_encode="all",
+            )
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_compression_compresses_stream_and_mmap_payloads(self):
+        rows = [{"id": i, "name": "user-%d" % (i % 10)} for i in range(5000)]
+
+        def stream_payload(**options):
+            fake = None
+
+            def popen(*args, **kwargs):
+                nonlocal fake
+                fake = FakePopen(*args, **kwargs)
+                return fake
+
+            with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+                with patch("subprocess.Popen", side_effect=popen):
+                    ingestr.ingest(rows, dest_uri="duckdb:///tmp/out.duckdb", dest_table="main.users", **options)
+            return fake.stdin_buffer.getvalue()
+
+        for codec in ("lz4", "zstd"):
+            with self.subTest(transport="stream", codec=codec):
+                payload = stream_payload(compression=codec)
+                self.assertLess(len(payload), len(stream_payload()) / 2)
+                self.assertEqual(pa.ipc.open_stream(pa.BufferReader(payload)).read_all().to_pylist(), rows)
+
+        captured = {}
+
+        def fake_ingest(**kwargs):
+            path = kwargs["source_uri"][len("mmap://"):]
+            captured["size"] = os.path.getsize(path)
+            captured["rows"] = pa.ipc.open_file(path).read_all().to_pylist()
+            return subprocess.CompletedProcess(["/tmp/ingestr"], 0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch("ingestr._data._cli_ingest", side_effect=fake_ingest):
+                ingestr.ingest(
+                    rows,
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.users",
+                    transport="mmap",
+                    compression="zstd",
+                    temp_dir=tmp,
+                )
+
+        self.assertEqual(captured["rows"], rows)
+        self.assertLess(captured["size"], len(stream_payload()) / 2)
+
+    def test_compression_must_be_a_supported_codec(self):
+        with self.assertRaisesRegex(ValueError, "compression"):
+            ingestr.IngestSession(dest_uri="duckdb:///tmp/out.duckdb", dest_table="main.people", compression="gzip")
+
+    def _ingested_batches(self, data, **options):
+        fake = None
+
+        def popen(*args, **kwargs):
+            nonlocal fake
+            fake = FakePopen(*args, **kwargs)
+            return fake
+
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=popen):
+                ingestr.ingest(data, dest_uri="duckdb:///tmp/out.duckdb", dest_table="main.rows", **options)
+
+        return list(pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())))
+
     @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
     def test_ingest_accepts_generator_function(self):
         fake = None
@@ -474,6 +1228,167 @@ class IngestrPackageTest(unittest.TestCase):
         table = pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())).read_all()
         self.assertEqual(table.to_pylist(), [{"id": 1}, {"id": 2}, {"id": 3}])
 
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_ingest_fans_in_generator_factories_concurrently(self):
+        started = threading.Barrier(2, timeout=5)
+
+        def account(account_id):
+            def fetch():
+                started.wait()
+                yield [{"account": account_id, "id": 1}]
+                yield {"account": account_id, "id": 2}
+
+            return fetch
+
+        def reordered():
+            started.wait()
+            yield {"id": 3, "account": "c"}
+
+        batches, _ = ingestr_data._batches_from_input(
+            [account("a"), reordered],
+            pa=pa,
+            batch_size=10,
+            fetch_concurrency=2,
+        )
+        rows = pa.Table.from_batches(list(batches)).to_pylist()
+
+        self.assertEqual(
+            sorted(rows, key=lambda row: (row["account"], row["id"])),
+            [{"account": "a", "id": 1}, {"account": "a", "id": 2}, {"account": "c", "id": 3}],
+        )
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_ingest_fan_in_names_failing_factory(self):
+        def healthy():
+            yield {"id": 1}
+
+        def flaky_shard():
+            yield {"id": 2}
+            raise ConnectionError("rate limited")
+
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=FakePopen):
+                with self.assertRaisesRegex(ingestr.DataSourceError, r"#1 \(.*flaky_shard\).*rate limited") as raised:
+                    ingestr.ingest(
+                        [healthy, flaky_shard],
+                        dest_uri="sqlite:///tmp/out.db",
+                        dest_table="main.rows",
+                        fetch_concurrency=2,
+                    )
+
+        self.assertIsInstance(raised.exception.__cause__, ConnectionError)
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_fan_in_rejects_columns_missing_from_first_schema(self):
+        def narrow():
+            yield {"id": 1}
+
+        def wide():
+            yield {"id": 2, "extra": "x"}
+
+        batches, _ = ingestr_data._batches_from_input(
+            [narrow, wide],
+            pa=pa,
+            batch_size=10,
+            fetch_concurrency=1,
+        )
+        with self.assertRaisesRegex(ingestr.DataSourceError, r"#1 \(.*wide\).*'extra'"):
+            list(batches)
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_fan_in_names_factory_and_column_when_cast_fails(self):
+        def numbers():
+            yield {"id": 1}
+
+        def words():
+            yield {"id": "one"}
+
+        batches, _ = ingestr_data._batches_from_input(
+            [numbers, words],
+            pa=pa,
+            batch_size=10,
+            fetch_concurrency=1,
+        )
+        with self.assertRaisesRegex(ingestr.DataSourceError, r"#1 \(.*words\).*cannot cast column 'id'") as raised:
+            list(batches)
+
+        self.assertIsInstance(raised.exception.__cause__, ValueError)
+
+    def test_ingest_rejects_fetch_concurrency_without_factories(self):
+        with self.assertRaisesRegex(ValueError, "fetch_concurrency requires a list of generator factories"):
+            ingestr.ingest(
+                [{"id": 1}],
+                dest_uri="sqlite:///tmp/out.db",
+                dest_table="main.rows",
+                fetch_concurrency=2,
+            )
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_ingest_encodes_rows_on_process_pool_in_order(self):
+        fake = None
+
+        def popen(*args, **kwargs):
+            nonlocal fake
+            fake = FakePopen(*args, **kwargs)
+            return fake
+
+        def fetch_pages():
+            yield [{"id": 1, "name": "a"}, {"id": 2, "name": None}]
+            yield [{"id": i, "name": str(i)} for i in range(3, 9)]
+            yield pa.table({"id": [9], "name": ["i"]})
+            yield {"id": 10, "name": "j"}
+
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=popen):
+                ingestr.ingest(
+                    fetch_pages,
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.pages",
+                    batch_size=2,
+                    encode_workers=2,
+                )
+
+        table = pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())).read_all()
+        self.assertEqual(table.column("id").to_pylist(), list(range(1, 11)))
+        self.assertEqual(table.column("name").to_pylist()[:3], ["a", None, "3"])
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_encode_pool_can_yield_batches_out_of_order(self):
+        pool = ingestr_data._EncodePool(2, ordered=False)
+        try:
+            batches = pool.batches(({"id": i} for i in range(100)), pa=pa, batch_size=10)
+            ids = pa.Table.from_batches(list(batches)).column("id").to_pylist()
+        finally:
+            pool.close()
+
+        self.assertEqual(sorted(ids), list(range(100)))
+        self.assertEqual(ids[:10], list(range(10)))
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_encode_pool_passes_worker_messages_through(self):
+        pool = ingestr_data._EncodePool(2, messages=True)
+        self.assertIsNone(pool._executor)
+        try:
+            with patch("pyarrow.ipc.read_record_batch", side_effect=AssertionError("decoded in the parent")):
+                batches = list(pool.batches(({"id": i} for i in range(25)), pa=pa, batch_size=10))
+            self.assertNotEqual(pool._executor._mp_context.get_start_method(), "fork")
+        finally:
+            pool.close()
+
+        self.assertTrue(all(isinstance(batch, ingestr_data._EncodedBatch) for batch in batches))
+        self.assertEqual([batch.num_rows for batch in batches], [10, 10, 5])
+
+        sink = io.BytesIO()
+        with ingestr_data._MessageStreamWriter(sink, batches[0].schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+        table = pa.ipc.open_stream(pa.BufferReader(sink.getvalue())).read_all()
+        self.assertEqual(table.column("id").to_pylist(), list(range(25)))
+
+    def test_ingest_rejects_non_positive_encode_workers(self):
+        with self.assertRaisesRegex(ValueError, "encode_workers"):
+            ingestr.IngestSession(dest_uri="sqlite:///tmp/out.db", dest_table="main.rows", encode_workers=0)
+
     @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
     def test_ingest_rejects_async_generator_function(self):
         async def fetch_pages():
@@ -513,6 +1428,186 @@ class IngestrPackageTest(unittest.TestCase):
         table = pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())).read_all()
         self.assertEqual(table.to_pylist(), [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}])
 
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_context_manager_background_writer_streams_batches(self):
+        fake = None
+
+        def popen(*args, **kwargs):
+            nonlocal fake
+            fake = FakePopen(*args, **kwargs)
+            return fake
+
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=popen):
+                with ingestr.ingest(
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.rows",
+                    batch_size=1,
+                    write_queue_size=2,
+                    write_queue_bytes=1,
+                ) as send:
+                    send([{"id": 1}, {"id": 2}, {"id": 3}])
+                    send({"id": 4})
+
+        self.assertEqual(send.result.returncode, 0)
+        batches = list(pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())))
+        self.assertEqual([row["id"] for batch in batches for row in batch.to_pylist()], [1, 2, 3, 4])
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_background_writer_error_is_raised_on_next_call(self):
+        class FailingStdin(NonClosingBytesIO):
+            def write(self, data):
+                if self.tell() > 0:
+                    raise OSError("disk full")
+                return super().write(data)
+
+        fake = None
+
+        def popen(*args, **kwargs):
+            nonlocal fake
+            fake = FakePopen(*args, **kwargs)
+            fake.stdin = fake.stdin_buffer = FailingStdin()
+            return fake
+
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=popen):
+                session = ingestr.ingest(dest_uri="sqlite:///tmp/out.db", dest_table="main.rows", write_queue_size=4)
+                with self.assertRaisesRegex(OSError, "disk full"):
+                    with session as send:
+                        send({"id": 1})
+                        send._background_writer.join()
+                        send({"id": 2})
+
+        self.assertTrue(send._closed)
+        self.assertIsNone(send._background_writer)
+
+    @unittest.skipIf(pa is None or os.name == "nt", "pyarrow and a POSIX shebang executable are required")
+    def test_aingest_streams_async_generator_to_subprocess(self):
+        async def pages():
+            yield {"id": 1}
+            await asyncio.sleep(0)
+            yield [{"id": 2}, {"id": 3}]
+            yield pa.table({"id": [4]})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            executable, captured = _write_stdin_capturing_executable(Path(tmp))
+            result = asyncio.run(
+                ingestr.aingest(
+                    pages,
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.rows",
+                    executable=executable,
+                    capture_output=True,
+                )
+            )
+            table = pa.ipc.open_stream(pa.BufferReader(captured.read_bytes())).read_all()
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout, b"ok\n")
+        self.assertIn("arrow-stream://-", result.args)
+        self.assertEqual(table.to_pylist(), [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}])
+
+    @unittest.skipIf(pa is None or os.name == "nt", "pyarrow and a POSIX shebang executable are required")
+    def test_aingest_combines_async_pages_to_batch_bytes(self):
+        async def pages():
+            for start in range(0, 2000, 10):
+                yield [{"id": index} for index in range(start, start + 10)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            executable, captured = _write_stdin_capturing_executable(Path(tmp))
+            asyncio.run(
+                ingestr.aingest(
+                    pages,
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.rows",
+                    executable=executable,
+                    batch_bytes=4096,
+                )
+            )
+            batches = list(pa.ipc.open_stream(pa.BufferReader(captured.read_bytes())))
+
+        self.assertEqual([row["id"] for batch in batches for row in batch.to_pylist()], list(range(2000)))
+        self.assertLess(len(batches), 10)
+
+    @unittest.skipIf(pa is None or os.name == "nt", "pyarrow and a POSIX shebang executable are required")
+    def test_aingest_combines_async_list_pages_to_batch_size(self):
+        async def pages():
+            for start in range(0, 2000, 10):
+                yield [{"id": index} for index in range(start, start + 10)]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            executable, captured = _write_stdin_capturing_executable(Path(tmp))
+            asyncio.run(
+                ingestr.aingest(
+                    pages,
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.rows",
+                    executable=executable,
+                    batch_size=500,
+                )
+            )
+            batches = list(pa.ipc.open_stream(pa.BufferReader(captured.read_bytes())))
+
+        self.assertEqual([row["id"] for batch in batches for row in batch.to_pylist()], list(range(2000)))
+        self.assertEqual([batch.num_rows for batch in batches], [500] * 4)
+
+    @unittest.skipIf(pa is None or os.name == "nt", "pyarrow and a POSIX shebang executable are required")
+    def test_async_context_manager_reports_child_failure(self):
+        async def run():
+            with tempfile.TemporaryDirectory() as tmp:
+                executable, _ = _write_stdin_capturing_executable(Path(tmp), exit_code=3)
+                async with ingestr.aingest(
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.rows",
+                    executable=executable,
+                ) as send:
+                    await send({"id": 1})
+            return send
+
+        with self.assertRaises(subprocess.CalledProcessError) as raised:
+            asyncio.run(run())
+
+        self.assertEqual(raised.exception.returncode, 3)
+
+    def test_aingest_rejects_mmap_transport(self):
+        with self.assertRaisesRegex(ValueError, "transport='stream'"):
+            ingestr.aingest(dest_uri="sqlite:///tmp/out.db", dest_table="main.rows", transport="mmap")
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_unchecked_session_stops_after_child_exits_early(self):
+        class ClosedStdin(NonClosingBytesIO):
+            def write(self, data):
+                if self.tell() > 0:
+                    raise BrokenPipeError("child exited")
+                return super().write(data)
+
+        processes = []
+
+        def popen(*args, **kwargs):
+            fake = FakePopen(*args, **kwargs)
+            fake.stdin = fake.stdin_buffer = ClosedStdin()
+            fake.returncode = 2
+            processes.append(fake)
+            return fake
+
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=popen):
+                with ingestr.ingest(
+                    dest_uri="sqlite:///tmp/out.db",
+                    dest_table="main.rows",
+                    write_queue_size=4,
+                    check=False,
+                ) as send:
+                    send({"id": 1})
+                    send._background_writer.join()
+                    send({"id": 2})
+                    with self.assertRaisesRegex(ValueError, "already closed"):
+                        send({"id": 3})
+
+        self.assertEqual(len(processes), 1)
+        self.assertTrue(send._closed)
+        self.assertEqual(send.result.returncode, 2)
+
     @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
     def test_ingest_streams_arrow_table(self):
         fake = None
@@ -535,6 +1630,84 @@ class IngestrPackageTest(unittest.TestCase):
         got = pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())).read_all()
         self.assertEqual(got.to_pylist(), [{"id": 1, "score": 1.5}, {"id": 2, "score": 2.5}])
 
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_ingest_reads_record_batch_reader_lazily(self):
+        schema = pa.schema([("id", pa.int64())])
+        produced = []
+
+        def produce():
+            for start in range(0, 6, 2):
+                produced.append(start)
+                yield pa.RecordBatch.from_pylist([{"id": start}, {"id": start + 1}], schema=schema)
+
+        reader = pa.RecordBatchReader.from_batches(schema, produce())
+        batches, arrow_schema = ingestr_data._batches_from_input(reader, pa=pa, batch_size=1)
+
+        self.assertEqual(arrow_schema, schema)
+        self.assertEqual(next(batches).to_pylist(), [{"id": 0}])
+        self.assertEqual(produced, [0])
+        self.assertEqual([row["id"] for batch in batches for row in batch.to_pylist()], [1, 2, 3, 4, 5])
+        self.assertEqual(produced, [0, 2, 4])
+
+    @unittest.skipIf(
+        pa is None or not hasattr(getattr(pa, "RecordBatchReader", None), "from_stream"),
+        "pyarrow with Arrow PyCapsule support is required",
+    )
+    def test_ingest_streams_arrow_c_stream_producers(self):
+        class StreamProducer:
+            def __init__(self, table):
+                self.table = table
+
+            def __arrow_c_stream__(self, requested_schema=None):
+                return self.table.__arrow_c_stream__(requested_schema)
+
+        fake = None
+
+        def popen(*args, **kwargs):
+            nonlocal fake
+            fake = FakePopen(*args, **kwargs)
+            return fake
+
+        def pages():
+            yield {"id": 1}
+            yield StreamProducer(pa.table({"id": [2, 3]}))
+
+        with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+            with patch("subprocess.Popen", side_effect=popen):
+                ingestr.ingest(pages, dest_uri="sqlite:///tmp/out.db", dest_table="main.rows")
+
+        table = pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())).read_all()
+        self.assertEqual(table.to_pylist(), [{"id": 1}, {"id": 2}, {"id": 3}])
+
+    @unittest.skipIf(pa is None or pd is None, "pyarrow and pandas are required for DataFrame chunking tests")
+    def test_ingest_converts_pandas_dataframe_in_chunks(self):
+        frame = pd.DataFrame({"id": range(5), "note": pd.Series([None, None, None, "x", None], dtype=object)})
+
+        batches, schema = ingestr_data._batches_from_input(frame, pa=pa, batch_size=10, schema=None, chunk_rows=2)
+
+        self.assertEqual(schema.field("note").type, pa.string())
+        self.assertEqual([batch.num_rows for batch in batches], [2, 2, 1])
+
+        mixed = pd.DataFrame({"value": pd.Series([1, 2, "late"], dtype=object)})
+        batches, _ = ingestr_data._batches_from_input(mixed, pa=pa, batch_size=10, schema=None, chunk_rows=2)
+
+        self.assertEqual(next(batches).to_pylist(), [{"value": 1}, {"value": 2}])
+        with self.assertRaises((pa.ArrowInvalid, pa.ArrowTypeError)):
+            next(batches)
+
+    @unittest.skipIf(pa is None or pl is None, "pyarrow and polars are required for DataFrame chunking tests")
+    def test_ingest_converts_polars_dataframe_in_chunks(self):
+        frame = pl.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+
+        batches, schema = ingestr_data._batches_from_input(frame, pa=pa, batch_size=10, schema=None, chunk_rows=2)
+
+        self.assertEqual([batch.num_rows for batch in batches], [2, 1])
+        self.assertEqual(schema, frame.to_arrow().schema)
+
+    def test_ingest_rejects_non_positive_chunk_rows(self):
+        with self.assertRaisesRegex(ValueError, "chunk_rows"):
+            ingestr.ingest(dest_uri="sqlite:///tmp/out.db", dest_table="main.rows", chunk_rows=0)
+
     @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
     def test_stream_transport_skips_empty_record_batches(self):
         fake = None
@@ -589,6 +1762,76 @@ class IngestrPackageTest(unittest.TestCase):
         self.assertEqual(captured["dest_table"], "main.mmap_rows")
         self.assertEqual(captured["rows"], [{"id": 1}, {"id": 2}])
 
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_mmap_transport_publishes_segments_while_ingestr_runs(self):
+        captured = {}
+        test = self
+
+        class RunningPopen(FakePopen):
+            def poll(self):
+                return None
+
+            def wait(self):
+                prefix = "mmap://"
+                manifest_uri = self.args[self.args.index("--source-uri") + 1]
+                test.assertTrue(manifest_uri.startswith(prefix))
+                manifest_path = manifest_uri[len(prefix):]
+                with open(manifest_path, encoding="utf-8") as manifest:
+                    lines = manifest.read().splitlines()
+                captured["manifest"] = lines
+                captured["rows"] = [
+                    pa.ipc.open_file(os.path.join(os.path.dirname(manifest_path), name)).read_all().to_pylist()
+                    for name in lines[:-1]
+                ]
+                return self.returncode
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch("ingestr._data.binary_path", return_value="/tmp/ingestr"):
+                with patch("subprocess.Popen", side_effect=RunningPopen):
+                    result = ingestr.ingest(
+                        [{"id": i} for i in range(5)],
+                        dest_uri="sqlite:///tmp/out.db",
+                        dest_table="main.rows",
+                        transport="mmap",
+                        batch_size=2,
+                        segment_bytes=1,
+                        temp_dir=tmp,
+                    )
+            self.assertEqual(os.listdir(tmp), [])
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(
+            captured["manifest"],
+            ["segment-000000.arrow", "segment-000001.arrow", "segment-000002.arrow", "#end"],
+        )
+        self.assertEqual(captured["rows"], [[{"id": 0}, {"id": 1}], [{"id": 2}, {"id": 3}], [{"id": 4}]])
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_segmented_writer_touches_manifest_until_finished(self):
+        touched = threading.Event()
+        with tempfile.TemporaryDirectory() as tmp:
+            with patch("ingestr._data._MANIFEST_HEARTBEAT_SECONDS", 0.01):
+                with patch("ingestr._data.os.utime", side_effect=lambda path: touched.set()) as utime:
+                    writer = ingestr_data._SegmentedArrowWriter(
+                        tmp,
+                        pa.schema([("id", pa.int64())]),
+                        pa=pa,
+                        segment_bytes=1024,
+                    )
+                    self.assertTrue(touched.wait(5))
+                    writer.close()
+                    calls = utime.call_count
+
+            self.assertFalse(writer._heartbeat.is_alive())
+            self.assertEqual(utime.call_count, calls)
+            utime.assert_called_with(writer.manifest_path)
+            with open(writer.manifest_path, encoding="utf-8") as manifest:
+                self.assertEqual(manifest.read(), "#end\n")
+
+    def test_segment_bytes_requires_mmap_transport(self):
+        with self.assertRaisesRegex(ValueError, "segment_bytes requires transport='mmap'"):
+            ingestr.IngestSession(dest_uri="sqlite:///tmp/out.db", dest_table="main.rows", segment_bytes=1024)
+
     @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
     def test_mmap_transport_skips_empty_record_batches(self):
         captured = {}
@@ -683,6 +1926,92 @@ class IngestrPackageTest(unittest.TestCase):
         table = pa.ipc.open_stream(pa.BufferReader(fake.stdin_buffer.getvalue())).read_all()
         self.assertEqual(table.to_pylist(), [{"id": 1, "created_at": datetime(2026, 1, 2, 3, 4, 5)}])
 
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_iterable_batches_learns_columns_from_first_row(self):
+        rows = [
+            {"id": 1, "name": "Ada"},
+            {"name": "Grace", "extra": True},
+            {1: "ignored", "id": 3},
+        ]
+
+        batches = list(ingestr_data._iterable_batches(rows, pa=pa, batch_size=2))
+
+        self.assertEqual([batch.num_rows for batch in batches], [2, 1])
+        self.assertEqual(batches[0].schema, batches[1].schema)
+        self.assertEqual(
+            pa.Table.from_batches(batches).to_pylist(),
+            [{"id": 1, "name": "Ada"}, {"id": None, "name": "Grace"}, {"id": 3, "name": None}],
+        )
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_iterable_batches_reuses_row_plan_per_type(self):
+        @dataclass
+        class Point:
+            x: int
+            y: float
+
+        @dataclass
+        class Row:
+            id: int
+            point: Point
+            tags: list
+
+        Pair = namedtuple("Pair", ["id", "point"])
+
+        ingestr_data._row_plan.cache_clear()
+        rows = [Row(1, Point(1, 2.5), ["a"]), Row(2, Point(3, 4.0), [])]
+        batches = list(ingestr_data._iterable_batches(rows, pa=pa, batch_size=10))
+        pairs = list(ingestr_data._iterable_batches([Pair(1, None), Pair(2, 4.0)], pa=pa, batch_size=10))
+
+        self.assertEqual(
+            pa.Table.from_batches(batches).to_pylist(),
+            [
+                {"id": 1, "point": {"x": 1, "y": 2.5}, "tags": ["a"]},
+                {"id": 2, "point": {"x": 3, "y": 4.0}, "tags": []},
+            ],
+        )
+        self.assertEqual(pa.Table.from_batches(pairs).to_pylist(), [{"id": 1, "point": None}, {"id": 2, "point": 4.0}])
+        cache = ingestr_data._row_plan.cache_info()
+        self.assertEqual(cache.misses, 2)
+        self.assertGreaterEqual(cache.hits, 4)
+
+    def test_normalize_value_maps_null_sentinels_to_none(self):
+        self.assertIsNone(ingestr_data._normalize_value(None))
+        self.assertIsNone(ingestr_data._normalize_value(float("nan")))
+        self.assertIsNone(ingestr_data._normalize_value(Decimal("NaN")))
+        self.assertEqual(ingestr_data._normalize_value(Decimal("1.5")), Decimal("1.5"))
+        self.assertEqual(ingestr_data._normalize_value("NaN"), "NaN")
+
+        try:
+            import pandas
+        except ImportError:
+            return
+
+        self.assertIsNone(ingestr_data._normalize_value(pandas.NA))
+        self.assertIsNone(ingestr_data._normalize_value(pandas.NaT))
+        self.assertIsNone(ingestr_data._normalize_value(pandas.Series([1.0, None]).iloc[1]))
+        self.assertIsNone(ingestr_data._normalize_value(pandas.Series([1, None], dtype="datetime64[ns]").to_numpy()[1]))
+        self.assertEqual(ingestr_data._normalize_value(pandas.Series([7]).iloc[0]), 7)
+
+    @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
+    def test_column_accumulator_rejects_schema_change_after_rows(self):
+        accumulator = ingestr_data._ColumnAccumulator(pa=pa)
+        accumulator.append({"id": 1})
+
+        with self.assertRaisesRegex(RuntimeError, "holds rows"):
+            accumulator.use_schema(pa.schema([("id", pa.int64())]))
+
+    def test_normalize_value_skips_fallbacks_for_plain_values(self):
+        values = ["text", 1, True, b"bytes", datetime(2026, 1, 1), date(2026, 1, 1), 2.5]
+
+        # Plain values must not reach the pandas/`.item()` fallbacks.
+        with patch("ingestr._data._pandas_null_types", side_effect=AssertionError("pandas fallback")) as fallback:
+            normalized = [ingestr_data._normalize_value(value) for value in values]
+
+        fallback.assert_not_called()
+        for value, result in zip(values, normalized):
+            self.assertIs(result, value)
+
     @unittest.skipIf(pa is None, "pyarrow is required for SDK data ingestion tests")
     def test_stream_transport_rejects_text_mode(self):
         with self.assertRaises(ValueError):
@@ -694,6 +2023,83 @@ class IngestrPackageTest(unittest.TestCase):
             )
 
 
+def _write_stdin_capturing_executable(directory, exit_code=0):
+    captured = directory / "stdin.arrow"
+    executable = directory / "ingestr"
+    executable.write_text(
+        "#!%s\n"
+        "import sys\n"
+        "data = sys.stdin.buffer.read()\n"
+        "open(%r, 'wb').write(data)\n"
+        "sys.stdout.write('ok\\n')\n"
+        "sys.exit(%d)\n" % (sys.executable, str(captured), exit_code),
+        encoding="utf-8",
+    )
+    executable.chmod(0o755)
+    return executable, captured
+
+
+def _write_fake_worker_executable(directory):
+    executable = directory / "ingestr"
+    executable.write_text(
+        "#!%s\n"
+        "import json, os, struct, sys, time\n"
+        "import pyarrow as pa\n"
+        "assert sys.argv[1:] == ['worker']\n"
+        "stdin = sys.stdin.buffer\n"
+        "while True:\n"
+        "    size = stdin.read(4)\n"
+        "    if not size:\n"
+        "        break\n"
+        "    args = json.loads(stdin.read(struct.unpack('<I', size)[0]))['args']\n"
+        "    payload = b''\n"
+        "    while True:\n"
+        "        (length,) = struct.unpack('<I', stdin.read(4))\n"
+        "        if length == 0:\n"
+        "            break\n"
+        "        payload += stdin.read(length)\n"
+        "    rows = pa.ipc.open_stream(pa.BufferReader(payload)).read_all().num_rows\n"
+        "    dest_table = args[args.index('--dest-table') + 1]\n"
+        "    sys.stdout.write('pid %%d loaded %%d rows into %%s\\n' %% (os.getpid(), rows, dest_table))\n"
+        "    result = {'ok': dest_table != 'fail', 'duration_ms': 1}\n"
+        "    sys.stdout.write('\\x1eingestr-worker-result ' + json.dumps(result) + '\\n')\n"
+        "    sys.stdout.flush()\n"
+        "    # Stderr reaching the pool after the result must still count for this request.\n"
+        "    time.sleep(0.05)\n"
+        "    sys.stderr.write('warning for %%s\\n\\x1eingestr-worker-end\\n' %% dest_table)\n"
+        "    sys.stderr.flush()\n" % sys.executable,
+        encoding="utf-8",
+    )
+    executable.chmod(0o755)
+    return executable
+
+
+@contextlib.contextmanager
+def _serve_release_archive(data, delay=0.0):
+    requests = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield "http://127.0.0.1:%d" % server.server_address[1], requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 def _write_tar_binary(path, name, data):
     with tarfile.open(path, "w:gz") as archive:
         info = tarfile.TarInfo(name)